@@ -1,13 +1,61 @@
 from datetime import datetime, timedelta
-from typing import Optional, Union
+import hashlib
+import math
+import time
+import uuid
+from typing import Optional, Tuple, Union
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.hash_pool import HashingPool
+from app.core.signing_keys import ALGORITHM as ES256, key_ring
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Worker pool that keeps bcrypt off the event loop
+hash_pool = HashingPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
+
+# Verified token payloads keyed by SHA-256 of the token; entries never outlive `exp`
+token_cache = TTLCache("tokens", settings.TOKEN_CACHE_MAXSIZE, settings.TOKEN_CACHE_TTL_SECONDS)
+
+
+def calibrate_bcrypt_rounds(target_ms: float, min_rounds: int, max_rounds: int) -> int:
+    """Largest bcrypt cost whose hash time on this machine stays within ``target_ms``."""
+    handler = pwd_context.handler("bcrypt").using(rounds=min_rounds)
+    elapsed_ms = min(_time_hash(handler) for _ in range(3))
+    # Each extra round doubles the work
+    extra_rounds = math.floor(math.log2(target_ms / elapsed_ms)) if elapsed_ms < target_ms else 0
+    return max(min_rounds, min(max_rounds, min_rounds + extra_rounds))
+
+
+def _time_hash(handler) -> float:
+    start = time.perf_counter()
+    handler.hash("calibration-password")
+    return (time.perf_counter() - start) * 1000
+
+
+def configure_password_hashing() -> int:
+    """Apply BCRYPT_ROUNDS (calibrating it first if unset) to the hashing context.
+
+    Hashes with a lower cost are reported by ``needs_update`` and are
+    re-hashed on the next successful login. Higher costs are kept: workers
+    calibrate separately and may settle one cost apart, and flagging both
+    directions would re-hash a user on every login that changes worker.
+    """
+    if settings.BCRYPT_ROUNDS is None:
+        settings.BCRYPT_ROUNDS = calibrate_bcrypt_rounds(
+            settings.PASSWORD_HASH_TARGET_MS, settings.BCRYPT_MIN_ROUNDS, settings.BCRYPT_MAX_ROUNDS
+        )
+    rounds = settings.BCRYPT_ROUNDS
+    pwd_context.update(
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+    )
+    return rounds
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
@@ -19,6 +67,23 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password and return a replacement hash if the stored one is outdated."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """Verify (and possibly re-hash) a password on the hashing pool."""
+    return await hash_pool.run(verify_and_update_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the hashing pool (raises 503 when saturated)."""
+    return await hash_pool.run(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -28,23 +93,57 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({"exp": expire, "type": "access"})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
+    return encode_token(to_encode)
 
 
 def create_refresh_token(data: dict) -> str:
-    """Create a JWT refresh token."""
+    """Create a JWT refresh token with a unique id (jti) for revocation."""
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire, "type": "refresh"})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
+    to_encode.update({"exp": expire, "type": "refresh", "jti": uuid.uuid4().hex})
+    return encode_token(to_encode)
+
+
+def encode_token(claims: dict) -> str:
+    """Sign claims with the active ES256 key (with its kid) or the HS256 secret."""
+    if settings.ALGORITHM == ES256:
+        kid, key = key_ring.signing_key()
+        return jwt.encode(claims, key, algorithm=ES256, headers={"kid": kid})
+    return jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def _verify_signature(token: str) -> dict:
+    if settings.ALGORITHM == ES256:
+        header = jwt.get_unverified_header(token)
+        if header.get("alg") == ES256:
+            key = key_ring.verification_key(header.get("kid"))
+            if key is None:
+                raise JWTError("Unknown signing key")
+            return jwt.decode(token, key, algorithms=[ES256])
+        if not settings.JWT_ACCEPT_HS256:
+            raise JWTError("Unexpected signing algorithm")
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+    return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+
+def decode_token(token: str) -> dict:
+    """Decode a JWT and verify its signature, reusing cached payloads."""
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is None:
+        payload = _verify_signature(token)
+        exp = payload.get("exp")
+        if exp is not None:
+            ttl = min(settings.TOKEN_CACHE_TTL_SECONDS, exp - time.time())
+            if ttl > 0:
+                token_cache.set(key, payload, ttl)
+    return payload
 
 
 def verify_token(token: str, token_type: str = "access") -> dict:
     """Verify and decode a JWT token."""
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = decode_token(token)
         
         # Check token type
         if payload.get("type") != token_type:
@@ -0,0 +1,245 @@
+"""
+Prefix completion for the search box.
+
+Product names, brands and pet/shelter pet breeds are kept in one sorted
+list of ``(key, kind, value)`` entries, where ``key`` is the lowercased
+value from the start of one of its words ("salmon kibble" is found by
+"sal" and by "kib"). A lookup is a ``bisect`` to the first key at or after
+the prefix followed by a short forward walk, so it costs O(log n) however
+many values there are.
+
+The list is loaded from the database at startup. After that, changes
+committed through the app's sessions are applied to it one value at a time
+(``bisect.insort``, or a delete at the bisected position); values that
+several rows share are reference counted. Writes the sessions cannot
+see (other workers, bulk statements) are picked up by a full reload every
+``AUTOCOMPLETE_RELOAD_SECONDS``. Reloads run in a background task and swap
+the new list in whole; lookups keep using the old one until then.
+"""
+
+import asyncio
+import bisect
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm.base import NO_VALUE
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.database import AsyncSessionLocal, PrimarySession
+from app.models.pet import Pet
+from app.models.product import Product
+from app.models.shelter import ShelterPet
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("product", "brand", "breed")
+
+# (model, attribute, kind) for every indexed column
+SOURCES = [
+    (Product, "name", "product"),
+    (Product, "brand", "brand"),
+    (Pet, "breed", "breed"),
+    (ShelterPet, "breed", "breed"),
+]
+
+_WORD_START = re.compile(r"(?:^|(?<=\W))\w", re.UNICODE)
+
+Entry = Tuple[str, str, str]
+
+
+def _keys(value: str) -> List[str]:
+    """Lookup keys for ``value``: its lowercased text from each word start."""
+    text = " ".join(value.split()).lower()
+    return [text[match.start():] for match in _WORD_START.finditer(text)]
+
+
+class CompletionIndex:
+    def __init__(self, reload_seconds: float):
+        self.reload_seconds = reload_seconds
+        self._lock = threading.Lock()
+        self._entries: List[Entry] = []
+        self._counts: Counter = Counter()
+        self._loaded_at: Optional[float] = None
+        # Set when the index may be missing a change; the next lookup reloads
+        self._stale = False
+        self._reload: Optional[asyncio.Task] = None
+        # Bumped by every committed change, so a load that raced one is redone
+        self._generation = 0
+        self.loads = 0
+        self.lookups = 0
+
+    @property
+    def loaded(self) -> bool:
+        return (
+            self._loaded_at is not None
+            and not self._stale
+            and time.monotonic() - self._loaded_at < self.reload_seconds
+        )
+
+    async def ensure_loaded(self):
+        """Start a reload in the background if one is due. Only waits for it
+        when there is no index to serve yet."""
+        if self.loaded:
+            return
+        if self._reload is None or self._reload.done():
+            self._reload = asyncio.create_task(self.reload())
+            self._reload.add_done_callback(self._log_reload_failure)
+        if self._loaded_at is None:
+            await asyncio.shield(self._reload)
+
+    @staticmethod
+    def _log_reload_failure(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Autocomplete reload failed", exc_info=task.exception())
+
+    async def reload(self):
+        """Rebuild the index from the primary, so it starts from the state
+        later commits are applied to."""
+        async with AsyncSessionLocal() as db:
+            await self._load(db)
+
+    async def _load(self, db: AsyncSession):
+        generation = self._generation
+        counts: Counter = Counter()
+        for model, attribute, kind in SOURCES:
+            column = getattr(model, attribute)
+            result = await db.execute(select(column, func.count()).where(column.isnot(None)).group_by(column))
+            for value, count in result.all():
+                if value.strip():
+                    counts[(kind, value)] += count
+        entries = sorted(
+            (key, kind, value)
+            for kind, value in counts
+            for key in _keys(value)
+        )
+        with self._lock:
+            self._entries = entries
+            self._counts = counts
+            self.loads += 1
+            self._loaded_at = time.monotonic()
+            # A commit that landed while loading may or may not be in what was
+            # read; serve this load, but load again on the next lookup
+            self._stale = generation != self._generation
+
+    def _add(self, kind: str, value: str):
+        self._counts[(kind, value)] += 1
+        if self._counts[(kind, value)] == 1:
+            for key in _keys(value):
+                bisect.insort(self._entries, (key, kind, value))
+
+    def _remove(self, kind: str, value: str):
+        if self._counts[(kind, value)] <= 0:
+            return
+        self._counts[(kind, value)] -= 1
+        if self._counts[(kind, value)] == 0:
+            del self._counts[(kind, value)]
+            for key in _keys(value):
+                entry = (key, kind, value)
+                position = bisect.bisect_left(self._entries, entry)
+                if position < len(self._entries) and self._entries[position] == entry:
+                    del self._entries[position]
+
+    def apply(self, changes: Iterable[Tuple[str, Optional[str], Optional[str]]]):
+        """Apply committed ``(kind, old value, new value)`` changes."""
+        with self._lock:
+            self._generation += 1
+            if self._loaded_at is None:
+                return
+            for kind, old, new in changes:
+                if old is not None and old.strip():
+                    self._remove(kind, old)
+                if new is not None and new.strip():
+                    self._add(kind, new)
+
+    def invalidate(self):
+        """Mark the index stale; the next lookup starts a reload."""
+        with self._lock:
+            self._generation += 1
+            self._stale = True
+
+    def clear(self):
+        with self._lock:
+            self._entries = []
+            self._counts = Counter()
+            self._loaded_at = None
+            self._stale = False
+
+    def complete(self, prefix: str, kind: Optional[str] = None, limit: int = 10) -> List[Dict[str, str]]:
+        """Up to ``limit`` distinct values with a word starting with ``prefix``,
+        in alphabetical order of the matched text."""
+        prefix = " ".join(prefix.split()).lower()
+        self.lookups += 1
+        results = []
+        seen = set()
+        with self._lock:
+            entries = self._entries
+            position = bisect.bisect_left(entries, (prefix,))
+            while position < len(entries) and len(results) < limit:
+                key, entry_kind, value = entries[position]
+                if not key.startswith(prefix):
+                    break
+                position += 1
+                if (kind is None or entry_kind == kind) and (entry_kind, value) not in seen:
+                    seen.add((entry_kind, value))
+                    results.append({"kind": entry_kind, "value": value})
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "loaded": self.loaded,
+            "values": len(self._counts),
+            "entries": len(self._entries),
+            "loads": self.loads,
+            "lookups": self.lookups,
+        }
+
+
+completions = CompletionIndex(settings.AUTOCOMPLETE_RELOAD_SECONDS)
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _collect_completion_changes(session, flush_context):
+    # new/dirty/deleted and attribute history still describe the flush here
+    changes = session.info.setdefault("completion_changes", [])
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        for model, attribute, kind in SOURCES:
+            if not isinstance(obj, model):
+                continue
+            state = inspect(obj).attrs[attribute]
+            if obj in session.new:
+                changes.append((kind, None, state.loaded_value if state.loaded_value is not NO_VALUE else None))
+                continue
+            history = state.history
+            if obj in session.deleted:
+                old, new = (history.deleted or history.unchanged or [NO_VALUE])[0], None
+            elif history.has_changes():
+                old = (history.deleted or history.unchanged or [NO_VALUE])[0]
+                new = history.added[0] if history.added else None
+            else:
+                continue
+            if old is NO_VALUE:
+                # The old value was never loaded, so it can't be taken out
+                session.info["completion_stale"] = True
+            else:
+                changes.append((kind, old, new))
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _apply_completion_changes(session):
+    changes = session.info.pop("completion_changes", None)
+    if session.info.pop("completion_stale", False):
+        completions.invalidate()
+    elif changes:
+        completions.apply(changes)
+
+
+@event.listens_for(PrimarySession, "after_rollback")
+def _discard_completion_changes(session):
+    session.info.pop("completion_changes", None)
+    session.info.pop("completion_stale", None)
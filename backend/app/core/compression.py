@@ -0,0 +1,170 @@
+"""
+Response compression.
+
+JSON, MessagePack and text responses of at least
+``COMPRESSION_MINIMUM_SIZE`` bytes are compressed with brotli when the
+client accepts it and the ``brotli`` package is installed, otherwise with
+gzip. Strong ETags get an encoding suffix (``"abc-br"``) so each
+representation has its own validator; the suffix is stripped from
+``If-None-Match`` on the way in, so routes only deal with the plain tag.
+"""
+
+import zlib
+from typing import Optional, Tuple
+
+from app.core.msgpack_middleware import add_vary
+
+try:
+    import brotli
+except ImportError:  # optional; gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = (b"application/json", b"application/msgpack", b"application/x-msgpack", b"text/")
+ENCODINGS = (b"br", b"gzip")
+
+
+def choose_encoding(accept_encoding: bytes) -> Optional[bytes]:
+    """br or gzip (in that order of preference) if the client accepts it."""
+    accepted = {}
+    for part in accept_encoding.lower().split(b","):
+        coding, *params = [piece.strip() for piece in part.split(b";")]
+        q = 1.0
+        for param in params:
+            if param.startswith(b"q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    if brotli is not None and accepted.get(b"br", 0) > 0:
+        return b"br"
+    if accepted.get(b"gzip", 0) > 0:
+        return b"gzip"
+    return None
+
+
+class _Gzip:
+    """zlib's gzip stream behind brotli's ``process``/``finish`` interface."""
+
+    def __init__(self):
+        self._stream = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def process(self, data: bytes) -> bytes:
+        return self._stream.compress(data)
+
+    def finish(self) -> bytes:
+        return self._stream.flush()
+
+
+def _compressor(encoding: bytes):
+    if encoding == b"br":
+        return brotli.Compressor(quality=5)
+    return _Gzip()
+
+
+def _strip_etag_suffixes(value: bytes) -> Tuple[bytes, Optional[bytes]]:
+    """``If-None-Match`` without encoding suffixes, and the encoding of the first one."""
+    found = None
+    for encoding in ENCODINGS:
+        suffix = b"-" + encoding + b'"'
+        if suffix in value:
+            found = found or encoding
+            value = value.replace(suffix, b'"')
+    return value, found
+
+
+class CompressionMiddleware:
+    """Compress eligible responses with the best encoding the client accepts."""
+
+    def __init__(self, app, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        validated_encoding = None
+        if b"if-none-match" in headers:
+            if_none_match, validated_encoding = _strip_etag_suffixes(headers[b"if-none-match"])
+            scope = dict(scope)
+            scope["headers"] = [
+                (name, if_none_match if name == b"if-none-match" else value)
+                for name, value in scope["headers"]
+            ]
+        encoding = choose_encoding(headers.get(b"accept-encoding", b""))
+        await self.app(scope, receive, self._compressing_sender(send, encoding, validated_encoding))
+
+    def _compressing_sender(self, send, encoding: Optional[bytes], validated_encoding: Optional[bytes]):
+        start = None
+        compressor = None
+
+        async def send_compressed(message):
+            nonlocal start, compressor
+            if message["type"] == "http.response.start":
+                if message["status"] == 304:
+                    # Same validator as the representation the client holds
+                    await send(_tag_etag(message, validated_encoding))
+                    return
+                response_headers = dict(message.get("headers", []))
+                compressible = (
+                    response_headers.get(b"content-type", b"").startswith(COMPRESSIBLE_TYPES)
+                    and b"content-encoding" not in response_headers
+                )
+                if not compressible:
+                    await send(message)
+                    return
+                message = {**message, "headers": add_vary(message.get("headers", []), b"Accept-Encoding")}
+                if encoding is None or message["status"] == 204:
+                    await send(message)
+                    return
+                # Wait for the first body chunk to see whether it's worth compressing
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                if not more_body and len(body) < self.minimum_size:
+                    await send(start)
+                    await send(message)
+                    start = None
+                    return
+                compressor = _compressor(encoding)
+                response_headers = [
+                    (name, value) for name, value in start["headers"] if name != b"content-length"
+                ]
+                response_headers.append((b"content-encoding", encoding))
+                if not more_body:
+                    body = compressor.process(body) + compressor.finish()
+                    response_headers.append((b"content-length", str(len(body)).encode()))
+                    await send(_tag_etag({**start, "headers": response_headers}, encoding))
+                    await send({"type": "http.response.body", "body": body})
+                    start = None
+                    return
+                await send(_tag_etag({**start, "headers": response_headers}, encoding))
+
+            chunk = compressor.process(body)
+            if not more_body:
+                chunk += compressor.finish()
+                start = None
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        return send_compressed
+
+
+def _tag_etag(message, encoding: Optional[bytes]):
+    """Add the encoding suffix to a strong ETag in a response start message."""
+    if encoding is None:
+        return message
+    headers = []
+    for name, value in message["headers"]:
+        if name.lower() == b"etag" and not value.startswith(b"W/") and value.endswith(b'"'):
+            value = value[:-1] + b"-" + encoding + b'"'
+        headers.append((name, value))
+    return {**message, "headers": headers}
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 import os
 
 
@@ -10,12 +10,72 @@ class Settings(BaseSettings):
     
     # Security
     SECRET_KEY: str = "your-secret-key-change-this-in-production"
-    ALGORITHM: str = "HS256"
+    ALGORITHM: str = "HS256"  # HS256 (SECRET_KEY) or ES256 (keys in JWT_KEYS_DIR)
+    JWT_KEYS_DIR: str = "keys"
+    JWT_ACTIVE_KID: Optional[str] = None  # Defaults to the newest key in JWT_KEYS_DIR
+    JWT_ACCEPT_HS256: bool = False  # Keep accepting HS256 tokens while migrating to ES256
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
     # Database
     DATABASE_URL: str = "sqlite:///./pawfect_care.db"
+    # Async driver URL; derived from DATABASE_URL when empty
+    # (sqlite -> sqlite+aiosqlite, postgresql -> postgresql+asyncpg)
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # Optional read replica used by public catalog GET endpoints
+    DATABASE_READ_URL: Optional[str] = None
+    ASYNC_DATABASE_READ_URL: Optional[str] = None
+    # Seconds a user keeps reading from the primary after writing
+    READ_YOUR_WRITES_SECONDS: int = 5
+    
+    # Connection pool (applies to both the sync and async engines)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_PRE_PING: bool = False
+    DB_POOL_RECYCLE: int = -1  # Seconds before a connection is replaced; -1 disables
+    DB_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a free connection
+    
+    # SQLite production profile (WAL, pragmas and periodic PRAGMA optimize)
+    SQLITE_PRODUCTION_PROFILE: bool = False
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # 256MB
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024  # 64MB per connection
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_ANALYSIS_LIMIT: int = 1000
+    SQLITE_OPTIMIZE_INTERVAL_SECONDS: int = 3600
+    
+    # bcrypt work factor. When BCRYPT_ROUNDS is unset it is calibrated at startup
+    # to the largest cost whose hash time stays within PASSWORD_HASH_TARGET_MS.
+    BCRYPT_ROUNDS: Optional[int] = None
+    BCRYPT_MIN_ROUNDS: int = 10
+    BCRYPT_MAX_ROUNDS: int = 16
+    PASSWORD_HASH_TARGET_MS: int = 250
+    
+    # Password hashing worker pool
+    PASSWORD_HASH_WORKERS: int = min(4, os.cpu_count() or 1)
+    PASSWORD_HASH_MAX_PENDING: int = 64  # Queued + running hashes before returning 503
+    
+    # Authenticated-user cache used by get_current_user
+    USER_CACHE_MAXSIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: int = 60
+    
+    # Verified JWT payload cache used by verify_token
+    TOKEN_CACHE_MAXSIZE: int = 50000
+    TOKEN_CACHE_TTL_SECONDS: int = 300
+    
+    # Refresh-token revocation filter
+    REVOCATION_FILTER_CAPACITY: int = 100000  # Revocations before the filter grows
+    REVOCATION_SYNC_SECONDS: int = 5  # How stale other workers' revocations may be
+    
+    # Host-local SQLite file holding state shared by all workers
+    SHARED_STORE_PATH: str = "shared_state.db"
+    
+    # Token-bucket limits for /auth/login, /auth/register and /auth/refresh;
+    # a per-minute rate of 0 disables that bucket
+    AUTH_RATE_LIMIT_ENABLED: bool = True
+    AUTH_RATE_LIMIT_IP_BURST: int = 20
+    AUTH_RATE_LIMIT_IP_PER_MINUTE: int = 30
+    AUTH_RATE_LIMIT_ACCOUNT_BURST: int = 5
+    AUTH_RATE_LIMIT_ACCOUNT_PER_MINUTE: int = 5
     
     # CORS
     ALLOWED_ORIGINS: List[str] = [
@@ -43,6 +103,30 @@ class Settings(BaseSettings):
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
     
+    # Total counts for list endpoints (include_total=true)
+    COUNT_EXACT_THRESHOLD: int = 1000  # Larger counts are estimated
+    COUNT_CACHE_MAXSIZE: int = 10000
+    COUNT_CACHE_TTL_SECONDS: int = 60  # Exact counts; also dropped on writes
+    COUNT_ESTIMATE_TTL_SECONDS: int = 300
+    
+    # Cached catalog responses: "memory" (per worker), "shared" (all workers
+    # on the host, via SHARED_STORE_PATH) or "none"
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    RESPONSE_CACHE_MAXSIZE: int = 2000
+    RESPONSE_CACHE_TTL_SECONDS: int = 60
+    
+    # Shelter pet facet index; rebuilt on writes by this worker, or after this long
+    FACET_CACHE_TTL_SECONDS: int = 60
+    
+    # Species/breed vocabulary for filters; reloaded on writes by this worker, or after this long
+    VOCABULARY_CACHE_TTL_SECONDS: int = 300
+    
+    # Autocomplete index; updated on writes by this worker, reloaded after this long
+    AUTOCOMPLETE_RELOAD_SECONDS: int = 300
+    
+    # Responses smaller than this are sent uncompressed
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
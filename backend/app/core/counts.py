@@ -0,0 +1,103 @@
+"""
+Cached total counts for the list endpoints (opt-in ``include_total``).
+
+A count is first tried with ``LIMIT COUNT_EXACT_THRESHOLD + 1``, which is
+cheap however large the table is. Counts at or below the threshold are exact;
+they are cached per filter combination and invalidated when the tables the
+query reads are written. Larger counts are never counted in full: PostgreSQL
+reports the planner's row estimate, cached for
+``COUNT_ESTIMATE_TTL_SECONDS`` regardless of writes; other databases, which
+have no per-query estimate, report the threshold as a lower bound
+(``1000+``), cached like exact counts.
+
+The count goes in the ``X-Total-Count`` header. Estimates and lower bounds
+also set ``X-Total-Count-Estimated: true``.
+"""
+
+import json
+from typing import Any, Hashable, Tuple
+
+from fastapi import Response
+from sqlalchemy import Select, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from sqlalchemy.sql.util import find_tables
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.invalidation import table_versions
+
+TOTAL_COUNT_HEADER = "X-Total-Count"
+ESTIMATED_HEADER = "X-Total-Count-Estimated"
+
+# How a count from get_total_count was obtained
+EXACT = "exact"
+ESTIMATE = "estimate"
+AT_LEAST = "at_least"
+
+count_cache = TTLCache("counts", settings.COUNT_CACHE_MAXSIZE, settings.COUNT_CACHE_TTL_SECONDS)
+
+
+class Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` of a statement, keeping its bound parameters."""
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def _hashable(value: Any) -> Hashable:
+    """``value`` usable in a cache key; IN-list parameters are bound as lists."""
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_hashable(item) for item in value)
+    return value
+
+
+async def get_total_count(db: AsyncSession, query: Select) -> Tuple[int, str]:
+    """(number of rows ``query`` matches, and whether that number is
+    ``EXACT``, an ``ESTIMATE`` or a lower bound, ``AT_LEAST``)."""
+    compiled = query.compile()
+    filter_key = (str(compiled), tuple(sorted((name, _hashable(value)) for name, value in compiled.params.items())))
+
+    estimate = count_cache.get(("estimate", filter_key))
+    if estimate is not None:
+        return estimate, ESTIMATE
+
+    tables = {table.name for table in find_tables(query, check_columns=True)}
+    bounded_key = ("bounded", filter_key, table_versions.versions(tables))
+    cached = count_cache.get(bounded_key)
+    if cached is not None:
+        return cached
+
+    rows = query.with_only_columns(literal_column("1"), maintain_column_froms=True).order_by(None)
+    threshold = settings.COUNT_EXACT_THRESHOLD
+    bounded = await db.scalar(select(func.count()).select_from(rows.limit(threshold + 1).subquery()))
+    if bounded <= threshold:
+        count_cache.set(bounded_key, (bounded, EXACT))
+        return bounded, EXACT
+
+    if db.bind.dialect.name != "postgresql":
+        count_cache.set(bounded_key, (threshold, AT_LEAST))
+        return threshold, AT_LEAST
+
+    plan = await db.scalar(Explain(rows))
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    estimate = max(int(plan[0]["Plan"]["Plan Rows"]), bounded)
+    count_cache.set(("estimate", filter_key), estimate, settings.COUNT_ESTIMATE_TTL_SECONDS)
+    return estimate, ESTIMATE
+
+
+async def set_total_count(db: AsyncSession, query: Select, response: Response):
+    """Put the total for ``query`` (filters only, no ordering/paging) in the headers."""
+    total, accuracy = await get_total_count(db, query)
+    response.headers[TOTAL_COUNT_HEADER] = f"{total}+" if accuracy == AT_LEAST else str(total)
+    if accuracy != EXACT:
+        response.headers[ESTIMATED_HEADER] = "true"
@@ -0,0 +1,209 @@
+"""
+Facet counts for the shelter pet search.
+
+Every facet value (each species, breed, gender, age group and shelter, and
+each adoption status) gets a bitmap over all shelter pets: bit ``i`` is set
+when the ``i``-th pet has that value. The bitmaps are Python ints, so
+narrowing to a filter is an ``&`` and counting is ``int.bit_count()``; any
+combination of filters is answered from memory without a query.
+
+The index is built from one ``GROUP BY`` over the facet columns (pets
+that agree on all of them share a run of bits) and rebuilt after
+``shelter_pets`` is written by this worker, or after
+``FACET_CACHE_TTL_SECONDS`` (for other workers' writes).
+
+Counts are disjunctive: each facet is counted with every selected filter
+applied except its own, so picking ``species=dog`` still reports how many
+cats there are, while the other facets only count dogs.
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Collection, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.invalidation import table_versions
+from app.models.pet import Breed, Species
+from app.models.shelter import ShelterPet
+
+# (label, minimum age, maximum age) in years; the last group is open-ended
+AGE_GROUPS: List[Tuple[str, int, Optional[int]]] = [
+    ("baby", 0, 0),
+    ("young", 1, 2),
+    ("adult", 3, 7),
+    ("senior", 8, None),
+]
+
+AGE_GROUP_DESCRIPTION = "baby (under 1), young (1-2), adult (3-7) or senior (8+ years)"
+
+FACETS = ("species", "breed", "gender", "age_group", "shelter_id")
+
+age_group_column = case(
+    *[(ShelterPet.age <= maximum, label) for label, _, maximum in AGE_GROUPS if maximum is not None],
+    else_=AGE_GROUPS[-1][0],
+).label("age_group")
+
+# The indexed columns: the facets in FACETS order, then the adoption status.
+# Species and breeds are counted under their vocabulary names.
+INDEX_COLUMNS = [
+    Species.name.label("species"), Breed.name.label("breed"), ShelterPet.gender, age_group_column,
+    ShelterPet.shelter_id, ShelterPet.adoption_status,
+]
+
+
+def parse_age_group(label: str):
+    """SQL condition for pets in the age group ``label``; 400 if there is no such group."""
+    for name, minimum, maximum in AGE_GROUPS:
+        if name == label:
+            condition = ShelterPet.age >= minimum
+            return condition if maximum is None else condition & (ShelterPet.age <= maximum)
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Unknown age group: {label}"
+    )
+
+
+def facet_matchers(
+    species: Optional[Collection[str]] = None,
+    breed: Optional[Collection[str]] = None,
+    gender: Optional[str] = None,
+    age_group: Optional[str] = None,
+    shelter_id: Optional[int] = None,
+) -> Dict[str, Callable[[Any], bool]]:
+    """Python equivalents of the list endpoint's facet filters, keyed by facet.
+
+    ``species`` and ``breed`` are the vocabulary names the user's input
+    matched (see app/core/vocabulary.py); empty matches no pets.
+    """
+    matchers = {}
+    if species is not None:
+        matchers["species"] = lambda value: value in species
+    if breed is not None:
+        matchers["breed"] = lambda value: value in breed
+    if gender:
+        matchers["gender"] = lambda value: value == gender
+    if age_group:
+        matchers["age_group"] = lambda value: value == age_group
+    if shelter_id:
+        matchers["shelter_id"] = lambda value: value == shelter_id
+    return matchers
+
+
+def _bitmap(runs: List[Tuple[int, int]], size: int) -> int:
+    """An int with the bits of each (start, length) run set."""
+    bits = bytearray((size + 7) // 8)
+    for start, length in runs:
+        for position in range(start, start + length):
+            bits[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(bits, "little")
+
+
+class FacetIndex:
+    """Bitmaps of shelter pets per facet value.
+
+    Built from ``(*INDEX_COLUMNS, count)`` groups: pets with the same values
+    everywhere are interchangeable, so each group takes ``count``
+    consecutive bits rather than one bit per pet id.
+    """
+
+    def __init__(self, groups: Iterable[Sequence]):
+        runs: Dict[str, Dict[Any, List[Tuple[int, int]]]] = {facet: {} for facet in (*FACETS, "adoption_status")}
+        size = 0
+        for *values, count in groups:
+            for facet_runs, value in zip(runs.values(), values):
+                if value is not None:
+                    facet_runs.setdefault(value, []).append((size, count))
+            size += count
+        self.size = size
+        self.all = (1 << size) - 1
+        self.bitmaps = {
+            facet: {value: _bitmap(value_runs, size) for value, value_runs in facet_runs.items()}
+            for facet, facet_runs in runs.items()
+        }
+
+    def _union(self, facet: str, matcher: Callable[[Any], bool]) -> int:
+        mask = 0
+        for value, bitmap in self.bitmaps[facet].items():
+            if matcher(value):
+                mask |= bitmap
+        return mask
+
+    def count(self, adoption_status: Optional[str], matchers: Dict[str, Callable[[Any], bool]]) -> Dict[str, Any]:
+        """Facet counts for the pets with ``adoption_status`` (all if None)
+        that pass ``matchers``."""
+        base = self.all
+        if adoption_status:
+            base = self._union("adoption_status", lambda value: value == adoption_status)
+        selected = {facet: self._union(facet, matcher) for facet, matcher in matchers.items()}
+
+        matching = base
+        for mask in selected.values():
+            matching &= mask
+        facets: Dict[str, Any] = {"total": matching.bit_count()}
+        for facet in FACETS:
+            # Every filter except this facet's own
+            mask = base
+            for other, other_mask in selected.items():
+                if other != facet:
+                    mask &= other_mask
+            counts = [(value, (mask & bitmap).bit_count()) for value, bitmap in self.bitmaps[facet].items()]
+            counts = [(value, count) for value, count in counts if count]
+            if facet == "age_group":
+                order = [label for label, _, _ in AGE_GROUPS]
+                counts.sort(key=lambda item: order.index(item[0]))
+            else:
+                counts.sort(key=lambda item: (-item[1], str(item[0])))
+            facets[facet] = [{"value": value, "count": count} for value, count in counts]
+        return facets
+
+
+class FacetIndexCache:
+    """The current FacetIndex; rebuilt after writes to shelter_pets or the TTL."""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._index: Optional[FacetIndex] = None
+        self._version = None
+        self._built_at = 0.0
+        self._lock = asyncio.Lock()
+        self.builds = 0
+
+    def _current(self) -> Optional[FacetIndex]:
+        if self._index is None or time.monotonic() - self._built_at >= self.ttl_seconds:
+            return None
+        if self._version != table_versions.version(ShelterPet.__tablename__):
+            return None
+        return self._index
+
+    async def get(self, db: AsyncSession) -> FacetIndex:
+        index = self._current()
+        if index is not None:
+            return index
+        async with self._lock:
+            # Built by another request while this one waited
+            index = self._current()
+            if index is not None:
+                return index
+            version = table_versions.version(ShelterPet.__tablename__)
+            result = await db.execute(
+                select(*INDEX_COLUMNS, func.count())
+                .select_from(ShelterPet)
+                .outerjoin(Species, Species.id == ShelterPet.species_id)
+                .outerjoin(Breed, Breed.id == ShelterPet.breed_id)
+                .group_by(*INDEX_COLUMNS)
+            )
+            self._index = FacetIndex(result.all())
+            self._version = version
+            self._built_at = time.monotonic()
+            self.builds += 1
+            return self._index
+
+    def clear(self):
+        self._index = None
+
+
+facet_index = FacetIndexCache(settings.FACET_CACHE_TTL_SECONDS)
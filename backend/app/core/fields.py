@@ -0,0 +1,65 @@
+"""
+Sparse fieldsets: ``fields=id,name,price`` on list and detail endpoints.
+
+The requested fields narrow both the SELECT (every other column is
+deferred with ``load_only``) and the response (a partial copy of the
+response schema validates and serializes just those fields). Without
+``fields`` the full schema is rendered through the same fast path
+(see ``app.core.serialization``).
+"""
+
+from typing import Any, FrozenSet, Optional, Sequence, Type
+
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel
+from sqlalchemy import Select
+from sqlalchemy.orm import QueryableAttribute, load_only
+
+from app.core.serialization import render
+
+FIELDS_DESCRIPTION = "Comma-separated fields to return, e.g. id,name,price"
+
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel]) -> Optional[FrozenSet[str]]:
+    """Validate a ``fields`` parameter against ``schema``; None means all fields."""
+    if not fields:
+        return None
+    names = frozenset(name.strip() for name in fields.split(",") if name.strip())
+    unknown = names - set(schema.model_fields)
+    if unknown or not names:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}. "
+                   f"Available: {', '.join(schema.model_fields)}"
+        )
+    return names
+
+
+def select_fields(query: Select, model, names: Optional[FrozenSet[str]], required: Sequence = ()) -> Select:
+    """Load only the columns for ``names`` (plus ``required`` ones, e.g. sort keys)."""
+    if names is None:
+        return query
+    columns = model.__table__.columns
+    if any(name not in columns for name in names):
+        # A computed field may need any column; load the whole row
+        return query
+    attributes = [getattr(model, name) for name in sorted(names)]
+    attributes += [
+        column for column in required
+        if isinstance(column, QueryableAttribute) and column.key not in names
+    ]
+    return query.options(load_only(*attributes))
+
+
+def render_fields(
+    data: Any,
+    schema: Type[BaseModel],
+    names: Optional[FrozenSet[str]],
+    response: Optional[Response] = None,
+) -> Response:
+    """Serialize ``data`` (a row or list of rows) restricted to ``names``,
+    or with every field of ``schema`` when ``names`` is None.
+
+    Headers already set on ``response`` are kept.
+    """
+    return render(data, schema, names, response)
@@ -0,0 +1,90 @@
+"""
+Bounded worker pool for password hashing.
+
+bcrypt deliberately burns ~250 ms of CPU per call. Running it inline in an
+``async def`` handler stalls every other request on the worker, so hashing
+is sent to a dedicated thread pool (bcrypt releases the GIL while hashing).
+When more than ``max_pending`` calls are queued or running, new calls are
+rejected with 503 instead of piling up behind a login burst.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict
+
+from fastapi import HTTPException, status
+
+from app.core.pool_metrics import LATENCY_WINDOW, percentile
+
+
+class HashPoolSaturated(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+
+class HashingPool:
+    """Thread pool with a cap on queued + running calls and latency metrics."""
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        # Only touched from the event loop thread
+        self.pending = 0
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.rejected = 0
+        self._queue_wait_ms: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._hash_ms: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """Run ``func(*args)`` on the pool, or raise 503 if the queue is full."""
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HashPoolSaturated()
+
+        self.pending += 1
+        submitted = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._timed, func, submitted, *args)
+        finally:
+            self.pending -= 1
+
+    def _timed(self, func: Callable[..., Any], submitted: float, *args) -> Any:
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self.completed += 1
+                self._queue_wait_ms.append((started - submitted) * 1000)
+                self._hash_ms.append((finished - started) * 1000)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            queue_wait = sorted(self._queue_wait_ms)
+            hash_ms = sorted(self._hash_ms)
+            completed = self.completed
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "completed": completed,
+            "rejected": self.rejected,
+            "queue_wait_ms_p50": round(percentile(queue_wait, 0.5), 3),
+            "queue_wait_ms_p95": round(percentile(queue_wait, 0.95), 3),
+            "hash_ms_p50": round(percentile(hash_ms, 0.5), 3),
+            "hash_ms_p95": round(percentile(hash_ms, 0.95), 3),
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
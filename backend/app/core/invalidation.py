@@ -0,0 +1,43 @@
+"""
+Per-table write versions for cache invalidation.
+
+Sessions from ``AsyncSessionLocal`` record which tables they flushed
+changes to (or ran INSERT/UPDATE/DELETE statements against) and bump those
+tables' versions when the transaction commits.
+Caches fold the versions of the tables they read into their keys (so a
+write makes old entries unreachable) or subscribe to be told which tables
+changed. Versions are per process; other workers' writes are only seen
+through the caches' TTLs.
+"""
+
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Tuple
+
+
+class TableVersions:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions: Dict[str, int] = defaultdict(int)
+        self._listeners: List[Callable[[frozenset], None]] = []
+
+    def version(self, table: str) -> int:
+        return self._versions[table]
+
+    def versions(self, tables: Iterable[str]) -> Tuple[Tuple[str, int], ...]:
+        return tuple((table, self._versions[table]) for table in sorted(tables))
+
+    def bump(self, tables: Iterable[str]):
+        tables = frozenset(tables)
+        with self._lock:
+            for table in tables:
+                self._versions[table] += 1
+        for listener in self._listeners:
+            listener(tables)
+
+    def subscribe(self, listener: Callable[[frozenset], None]):
+        """Call ``listener(tables)`` after every commit that wrote to ``tables``."""
+        self._listeners.append(listener)
+
+
+table_versions = TableVersions()
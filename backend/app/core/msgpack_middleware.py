@@ -0,0 +1,165 @@
+"""
+MessagePack content negotiation.
+
+Clients that send ``Accept: application/msgpack`` get MessagePack instead of
+JSON from every endpoint; request bodies sent with
+``Content-Type: application/msgpack`` are accepted on POST/PUT/PATCH. The
+conversion happens at the ASGI layer, so routes only ever see and produce
+JSON, and JSON stays the default for everyone else.
+
+MessagePack has no datetime or enum types of its own; those arrive as the
+same strings the JSON API returns.
+"""
+
+from typing import List, Tuple
+
+import msgpack
+import orjson
+
+MSGPACK_TYPES = (b"application/msgpack", b"application/x-msgpack")
+BODY_METHODS = {"POST", "PUT", "PATCH"}
+
+
+def _media_types(header: bytes) -> List[Tuple[bytes, float]]:
+    """(media type, q) pairs from an Accept header."""
+    accepted = []
+    for part in header.split(b","):
+        media_type, *params = [piece.strip() for piece in part.split(b";")]
+        q = 1.0
+        for param in params:
+            if param.startswith(b"q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        accepted.append((media_type.lower(), q))
+    return accepted
+
+
+def wants_msgpack(accept: bytes) -> bool:
+    """Whether MessagePack is acceptable and preferred at least as much as JSON."""
+    msgpack_q = json_q = 0.0
+    for media_type, q in _media_types(accept):
+        if media_type in MSGPACK_TYPES:
+            msgpack_q = max(msgpack_q, q)
+        elif media_type in (b"application/json", b"application/*", b"*/*"):
+            json_q = max(json_q, q)
+    return msgpack_q > 0 and msgpack_q >= json_q
+
+
+class MessagePackMiddleware:
+    """Translate MessagePack request and response bodies to and from JSON."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        content_type = headers.get(b"content-type", b"").split(b";")[0].strip().lower()
+        if content_type in MSGPACK_TYPES and scope["method"] in BODY_METHODS:
+            body = await self._read_body(receive)
+            try:
+                body = orjson.dumps(msgpack.unpackb(body, raw=False, strict_map_key=False))
+            except (ValueError, TypeError, msgpack.UnpackException, orjson.JSONEncodeError):
+                await self._send_error(send, b'{"detail":"Invalid MessagePack body"}')
+                return
+            scope = dict(scope)
+            scope["headers"] = [
+                (name, value) for name, value in scope["headers"]
+                if name not in (b"content-type", b"content-length")
+            ] + [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+            receive = self._replay(body)
+
+        send = self._negotiating_sender(send, wants_msgpack(headers.get(b"accept", b"")))
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    async def _read_body(receive) -> bytes:
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                break
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
+
+    @staticmethod
+    def _replay(body: bytes):
+        sent = False
+
+        async def receive():
+            nonlocal sent
+            if sent:
+                return {"type": "http.disconnect"}
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        return receive
+
+    @staticmethod
+    async def _send_error(send, body: bytes):
+        await send({
+            "type": "http.response.start",
+            "status": 400,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    def _negotiating_sender(send, to_msgpack: bool):
+        start = None
+        chunks = []
+
+        async def send_negotiated(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                headers = message.get("headers", [])
+                if not dict(headers).get(b"content-type", b"").startswith(b"application/json"):
+                    # Not JSON (e.g. the docs page); pass it through untouched
+                    start = None
+                    await send(message)
+                    return
+                start = {**message, "headers": add_vary(headers, b"Accept")}
+                if not to_msgpack:
+                    await send(start)
+                    start = None
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            body = b"".join(chunks)
+            if body:
+                body = msgpack.packb(orjson.loads(body), use_bin_type=True)
+            headers = [
+                (name, value) for name, value in start["headers"]
+                if name not in (b"content-type", b"content-length")
+            ]
+            headers += [
+                (b"content-type", b"application/msgpack"),
+                (b"content-length", str(len(body)).encode()),
+            ]
+            await send({**start, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+
+        return send_negotiated
+
+
+def add_vary(headers, field: bytes) -> list:
+    """ASGI ``headers`` with ``field`` added to Vary."""
+    headers = list(headers)
+    for index, (name, value) in enumerate(headers):
+        if name.lower() == b"vary":
+            if field.lower() not in [part.strip().lower() for part in value.split(b",")]:
+                headers[index] = (name, value + b", " + field)
+            return headers
+    return headers + [(b"vary", field)]
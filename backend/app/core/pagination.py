@@ -0,0 +1,117 @@
+"""
+Keyset (cursor) pagination for the list endpoints.
+
+``OFFSET n`` makes the database walk and discard ``n`` rows, so deep pages
+get linearly slower. With a cursor, the next page starts with a
+``WHERE (sort key) > (last row's sort key)`` seek on the index that already
+serves the ORDER BY, so every page costs the same.
+
+Cursors are opaque URL-safe tokens holding the sort key values of the last
+row of the previous page. List endpoints accept ``cursor`` alongside
+``skip`` and return the cursor for the following page in the
+``X-Next-Cursor`` response header (absent on the last page).
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException, Request, Response, status
+from sqlalchemy import Select, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import QueryableAttribute
+
+from app.core.etag import check_etag
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = [value.isoformat() if isinstance(value, (datetime, date)) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> List[Any]:
+    """Sort key values from a cursor, converted to the columns' Python types."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("wrong number of values")
+        return [_from_json(value, column) for value, column in zip(values, columns)]
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def _from_json(value: Any, column) -> Any:
+    if value is None:
+        raise ValueError("null sort key")
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if isinstance(value, python_type):
+        return value
+    return python_type(value)
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    order_by: Sequence,
+    response: Response,
+    skip: int = 0,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+    request: Optional[Request] = None,
+) -> list:
+    """Run ``query`` ordered by ``order_by`` (ending in a unique column) and
+    return one page, setting ``X-Next-Cursor`` when more rows follow.
+
+    With ``cursor`` the page starts after the row it encodes; otherwise
+    ``skip`` is applied as an offset. Orderings on computed expressions
+    (e.g. search relevance) only support ``skip``. Passing ``request`` makes the page
+    conditional (see ``app.core.etag``).
+    """
+    ordering = [column.desc() if descending else column.asc() for column in order_by]
+    query = query.order_by(*ordering)
+    keyset = all(isinstance(column, QueryableAttribute) for column in order_by)
+    if cursor and not keyset:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursors are not available for this ordering; use skip"
+        )
+    if cursor:
+        values = decode_cursor(cursor, order_by)
+        if len(order_by) == 1:
+            key, bound = order_by[0], values[0]
+        else:
+            key, bound = tuple_(*order_by), tuple_(*values)
+        query = query.where(key < bound if descending else key > bound)
+    elif skip:
+        query = query.offset(skip)
+
+    # One extra row tells whether there is a next page
+    query = query.limit(limit + 1)
+    if request is not None and keyset:
+        await check_etag(db, query, request, response)
+    result = await db.execute(query)
+    rows = result.scalars().all()
+    if request is not None and not keyset and rows:
+        # Fingerprinting the query itself would rank every match a second
+        # time; fingerprint the ids of the rows already loaded instead
+        model = type(rows[0])
+        await check_etag(db, select(model).where(model.id.in_([row.id for row in rows])), request, response)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        if keyset:
+            last = rows[-1]
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+                [getattr(last, column.key) for column in order_by]
+            )
+    return rows
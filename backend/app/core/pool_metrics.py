@@ -0,0 +1,110 @@
+"""
+Connection pool instrumentation.
+
+The pool classes below behave exactly like SQLAlchemy's ``QueuePool`` and
+``AsyncAdaptedQueuePool`` but record how long each checkout took and whether
+it had to wait for a connection to be returned, so burst load can be told
+apart from slow queries.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Number of recent checkout latencies kept for percentile reporting
+LATENCY_WINDOW = 1000
+
+
+class PoolMetrics:
+    """Thread-safe counters for a single connection pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.total_checkout_ms = 0.0
+        self.max_checkout_ms = 0.0
+        self._recent_ms: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def record_checkout(self, elapsed_ms: float, waited: bool):
+        with self._lock:
+            self.checkouts += 1
+            if waited:
+                self.waits += 1
+            self.total_checkout_ms += elapsed_ms
+            self.max_checkout_ms = max(self.max_checkout_ms, elapsed_ms)
+            self._recent_ms.append(elapsed_ms)
+
+    def record_timeout(self):
+        with self._lock:
+            self.waits += 1
+            self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            recent = sorted(self._recent_ms)
+            avg = self.total_checkout_ms / self.checkouts if self.checkouts else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "checkout_ms_avg": round(avg, 3),
+                "checkout_ms_p95": round(percentile(recent, 0.95), 3),
+                "checkout_ms_max": round(self.max_checkout_ms, 3),
+            }
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * fraction))
+    return sorted_values[index]
+
+
+class InstrumentedPoolMixin:
+    """Times ``_do_get`` and counts checkouts that found the pool exhausted."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def recreate(self):
+        # Keep the same counters when the pool is recreated (e.g. on invalidation)
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        waited = self.checkedout() >= self.size() + self._max_overflow
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout((time.perf_counter() - start) * 1000, waited)
+        return connection
+
+    def stats(self) -> Dict[str, float]:
+        """Current pool occupancy together with the accumulated checkout metrics."""
+        return {
+            "pool_size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            **self.metrics.snapshot(),
+        }
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
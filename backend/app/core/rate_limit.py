@@ -0,0 +1,80 @@
+"""
+Token-bucket admission control for the authentication endpoints.
+
+Every login and registration costs a bcrypt hash, so a credential-stuffing
+burst can saturate the API nodes. Requests are charged against two buckets:
+one per client IP (checked as a route dependency, before the body is read)
+and one per account (checked in the handler, before any hashing). Bucket
+state lives in the shared store so all workers on a host enforce the same
+budget.
+"""
+
+import math
+
+from fastapi import HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.shared_store import get_shared_store
+
+# Rejections since startup, per bucket kind
+rejections = {"ip": 0, "account": 0}
+
+
+class RateLimited(HTTPException):
+    def __init__(self, retry_after: float):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many authentication attempts, please retry later",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+
+async def _take(kind: str, key: str, capacity: int, per_minute: int):
+    # A rate of 0 turns this bucket off rather than locking everyone out
+    if not settings.AUTH_RATE_LIMIT_ENABLED or per_minute <= 0:
+        return
+    allowed, retry_after = await run_in_threadpool(
+        get_shared_store().take_token, f"auth:{kind}:{key}", capacity, per_minute / 60
+    )
+    if not allowed:
+        rejections[kind] += 1
+        raise RateLimited(retry_after)
+
+
+async def limit_auth_by_ip(request: Request):
+    """Dependency charging one token to the client IP's bucket."""
+    client_ip = request.client.host if request.client else "unknown"
+    await _take(
+        "ip",
+        client_ip,
+        settings.AUTH_RATE_LIMIT_IP_BURST,
+        settings.AUTH_RATE_LIMIT_IP_PER_MINUTE,
+    )
+
+
+async def limit_auth_by_account(account: str):
+    """Charge one token to an account's bucket (email or user id)."""
+    await _take(
+        "account",
+        account.strip().lower(),
+        settings.AUTH_RATE_LIMIT_ACCOUNT_BURST,
+        settings.AUTH_RATE_LIMIT_ACCOUNT_PER_MINUTE,
+    )
+
+
+def get_rate_limit_stats():
+    return {
+        "enabled": settings.AUTH_RATE_LIMIT_ENABLED,
+        "store": settings.SHARED_STORE_PATH,
+        "ip": {
+            "burst": settings.AUTH_RATE_LIMIT_IP_BURST,
+            "per_minute": settings.AUTH_RATE_LIMIT_IP_PER_MINUTE,
+            "rejected": rejections["ip"],
+        },
+        "account": {
+            "burst": settings.AUTH_RATE_LIMIT_ACCOUNT_BURST,
+            "per_minute": settings.AUTH_RATE_LIMIT_ACCOUNT_PER_MINUTE,
+            "rejected": rejections["account"],
+        },
+    }
@@ -0,0 +1,43 @@
+"""
+Read-your-writes bookkeeping for read-replica routing.
+
+Replicas lag the primary slightly, so a user who just wrote should keep
+reading from the primary for a short window. ``RecentWriters`` keeps the
+last write time per user id in the shared store, so the next request sees
+it whichever worker serves it.
+"""
+
+import time
+from typing import Callable, Optional
+
+from fastapi import HTTPException, Request
+
+from app.auth import get_user_id_from_token
+from app.core.shared_store import SharedStore, get_shared_store
+
+
+class RecentWriters:
+    """Last write time per user, expiring after ``window_seconds``."""
+
+    def __init__(self, window_seconds: float, store: Callable[[], SharedStore] = get_shared_store):
+        self.window_seconds = window_seconds
+        self._store = store
+
+    def mark(self, user_id: int):
+        self._store().mark_written(f"user:{user_id}", self.window_seconds)
+
+    def wrote_recently(self, user_id: int) -> bool:
+        written_at = self._store().written_at(f"user:{user_id}")
+        return written_at is not None and time.time() - written_at < self.window_seconds
+
+
+def get_request_user_id(request: Request) -> Optional[int]:
+    """User id from the request's bearer token, or None if absent or invalid."""
+    authorization = request.headers.get("Authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return get_user_id_from_token(token)
+    except HTTPException:
+        return None
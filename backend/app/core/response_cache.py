@@ -0,0 +1,176 @@
+"""
+Server-side cache for the public catalog endpoints.
+
+``@cached_response(*tables)`` caches a route's rendered response under its
+resolved parameters (defaults filled in, so ``?limit=20`` and no ``limit``
+share an entry) and the ``Accept`` header. Entries are tagged with the
+tables the route reads: committing a write to one of them bumps the tag's
+version, which is part of the key, so stale entries are never hit again
+and simply age out.
+
+Backends (``RESPONSE_CACHE_BACKEND``):
+
+- ``memory``: a per-worker LRU; tags follow this worker's commits only,
+  other workers' writes show up after ``RESPONSE_CACHE_TTL_SECONDS``.
+- ``shared``: entries and tag versions live in the shared store, so every
+  worker on the host sees each write immediately. Store reads and writes
+  run in the threadpool, since SQLite may wait on another worker's lock.
+- ``none``: caching is off.
+
+Concurrent misses for the same key are coalesced: one request renders the
+response and the others wait for it.
+"""
+
+import asyncio
+import functools
+import hashlib
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import msgpack
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.etag import NotModified, etag_matches
+from app.core.invalidation import table_versions
+from app.core.shared_store import get_shared_store
+
+# Route parameters that are not part of what is being asked for
+_NOT_KEY_PARAMS = {"request", "response", "db"}
+
+
+class MemoryBackend:
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.entries = TTLCache("responses", maxsize, ttl_seconds)
+
+    async def versions(self, tags: Iterable[str]) -> Tuple[Tuple[str, int], ...]:
+        return table_versions.versions(tags)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self.entries.get(key)
+
+    async def set(self, key: str, value: bytes):
+        self.entries.set(key, value)
+
+
+class SharedBackend:
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.store = get_shared_store()
+        table_versions.subscribe(self.store.bump_tags)
+
+    async def versions(self, tags: Iterable[str]) -> Tuple[Tuple[str, int], ...]:
+        return await run_in_threadpool(self.store.tag_versions, tags)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await run_in_threadpool(self.store.get, key)
+
+    async def set(self, key: str, value: bytes):
+        await run_in_threadpool(self.store.set, key, value, self.ttl_seconds)
+
+
+class ResponseCache:
+    def __init__(self):
+        self._backend = None
+        self._backend_name: Optional[str] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @property
+    def backend(self):
+        """The configured backend, created on first use."""
+        name = settings.RESPONSE_CACHE_BACKEND
+        if name != self._backend_name:
+            if name == "memory":
+                self._backend = MemoryBackend(settings.RESPONSE_CACHE_MAXSIZE, settings.RESPONSE_CACHE_TTL_SECONDS)
+            elif name == "shared":
+                self._backend = SharedBackend(settings.RESPONSE_CACHE_TTL_SECONDS)
+            else:
+                self._backend = None
+            self._backend_name = name
+        return self._backend
+
+    async def key(self, endpoint, tags: Tuple[str, ...], params: Dict[str, Any], request: Request) -> str:
+        parts = (
+            endpoint.__module__,
+            endpoint.__qualname__,
+            sorted((name, repr(value)) for name, value in params.items() if name not in _NOT_KEY_PARAMS),
+            request.headers.get("accept", ""),
+            await self.backend.versions(tags),
+        )
+        return hashlib.blake2b(repr(parts).encode(), digest_size=20).hexdigest()
+
+    async def fetch(self, key: str, render) -> Tuple[Optional[bytes], Optional[Response]]:
+        """(cached entry, None) on a hit, otherwise (None, the response ``render`` made)."""
+        entry = await self.backend.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry, None
+
+        leader = self._inflight.get(key)
+        if leader is not None:
+            self.coalesced += 1
+            entry = await asyncio.shield(leader)
+            if entry is not None:
+                return entry, None
+            # The leader's response wasn't cacheable (404, 304, ...); render our own
+
+        self.misses += 1
+        future = self._inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            response = await render()
+        except BaseException:
+            future.set_result(None)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        entry = None
+        if isinstance(response, Response) and response.status_code == 200:
+            headers = [(name, value) for name, value in response.headers.items() if name != "content-length"]
+            entry = msgpack.packb([headers, response.body], use_bin_type=True)
+            await self.backend.set(key, entry)
+        future.set_result(entry)
+        return None, response
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "backend": settings.RESPONSE_CACHE_BACKEND,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+        }
+
+
+response_cache = ResponseCache()
+
+
+def cached_response(*tables: str):
+    """Cache the decorated route's response until one of ``tables`` is written.
+
+    The route must take ``request: Request`` and return a rendered Response.
+    """
+    def decorator(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(**params):
+            if response_cache.backend is None:
+                return await endpoint(**params)
+            request: Request = params["request"]
+            key = await response_cache.key(endpoint, tables, params, request)
+            entry, response = await response_cache.fetch(key, lambda: endpoint(**params))
+            if entry is None:
+                return response
+            headers, body = msgpack.unpackb(entry, raw=False)
+            headers = dict(headers)
+            if "etag" in headers and etag_matches(request.headers.get("if-none-match"), headers["etag"]):
+                raise NotModified(headers["etag"])
+            return Response(content=body, headers=headers)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,101 @@
+"""
+Refresh-token revocation index.
+
+Revoked refresh token ids (``jti``) are stored in ``revoked_tokens``; a
+Bloom filter in front of the table answers "definitely not revoked" for
+almost every refresh without a query. The filter is rebuilt from the table
+at startup and picks up revocations made by other workers by syncing rows
+revoked since the last sync, at most every ``REVOCATION_SYNC_SECONDS``.
+"""
+
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+from app.models.user import RevokedToken
+
+# Re-read this much history on every sync so rows committed late by another
+# worker (with an earlier revoked_at) are not missed
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class RevocationIndex:
+    def __init__(self, capacity: int, sync_seconds: float):
+        self.capacity = capacity
+        self.sync_seconds = sync_seconds
+        self.filter = BloomFilter(capacity)
+        self._synced_at = 0.0
+        self._synced_until = datetime(1970, 1, 1)
+        self.lookups = 0
+        self.db_checks = 0
+        self.false_positives = 0
+
+    async def rebuild(self, db: AsyncSession):
+        """Drop expired rows and rebuild the filter from the remaining ones."""
+        now = datetime.utcnow()
+        await db.execute(delete(RevokedToken).where(RevokedToken.expires_at < now))
+        await db.commit()
+        result = await db.execute(select(RevokedToken.jti))
+        jtis = result.scalars().all()
+        bloom = BloomFilter(max(self.capacity, 2 * len(jtis)))
+        for jti in jtis:
+            bloom.add(jti)
+        self.filter = bloom
+        self._synced_until = now
+        self._synced_at = time.monotonic()
+
+    async def sync(self, db: AsyncSession):
+        """Add rows revoked by other workers since the last sync."""
+        if time.monotonic() - self._synced_at < self.sync_seconds:
+            return
+        if len(self.filter) > self.filter.capacity:
+            await self.rebuild(db)
+            return
+        now = datetime.utcnow()
+        result = await db.execute(
+            select(RevokedToken.jti).where(RevokedToken.revoked_at >= self._synced_until - SYNC_OVERLAP)
+        )
+        for jti in result.scalars():
+            self.filter.add(jti)
+        self._synced_until = now
+        self._synced_at = time.monotonic()
+
+    async def is_revoked(self, db: AsyncSession, jti: str) -> bool:
+        self.lookups += 1
+        await self.sync(db)
+        if jti not in self.filter:
+            return False
+        self.db_checks += 1
+        revoked = await db.get(RevokedToken, jti) is not None
+        if not revoked:
+            self.false_positives += 1
+        return revoked
+
+    def revoke(self, db: AsyncSession, jti: str, user_id: int, exp: float):
+        """Stage a revocation; the caller commits. The jti primary key makes
+        a second revocation of the same token fail with IntegrityError."""
+        db.add(RevokedToken(
+            jti=jti,
+            user_id=user_id,
+            expires_at=datetime.utcfromtimestamp(exp),
+            revoked_at=datetime.utcnow(),
+        ))
+        self.filter.add(jti)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self.filter),
+            "capacity": self.filter.capacity,
+            "filter_bytes": (self.filter.num_bits + 7) // 8,
+            "lookups": self.lookups,
+            "db_checks": self.db_checks,
+            "false_positives": self.false_positives,
+        }
+
+
+revocations = RevocationIndex(settings.REVOCATION_FILTER_CAPACITY, settings.REVOCATION_SYNC_SECONDS)
@@ -0,0 +1,79 @@
+"""
+Full-text search with relevance ranking.
+
+``search`` terms are matched as words (the last one as a prefix, for
+search-as-you-type) against the full-text indexes defined next to the
+models (``app.models.product``, ``app.models.blog``):
+
+- SQLite: an FTS5 table per model (``products_fts``, ``blog_posts_fts``),
+  ranked with ``bm25`` (a name/title match counts ten times a
+  description/content match).
+- PostgreSQL: the model's ``search_vector`` tsvector column and its GIN
+  index, ranked with ``ts_rank_cd`` (name/title weighted above the rest).
+
+Other databases fall back to a substring match in the list's usual order.
+"""
+
+import re
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, column, func, literal_column, or_, table
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.blog import BlogPost
+from app.models.product import Product
+
+# The FTS5 tables; the hidden column named after the table is the MATCH/bm25 handle
+products_fts = table("products_fts", column("rowid"), column("products_fts"))
+blog_posts_fts = table("blog_posts_fts", column("rowid"), column("blog_posts_fts"))
+
+# bm25 column weights: name/title, description/content
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+
+def search_terms(text: str) -> List[str]:
+    """The words in ``text``; anything else (quotes, operators) is dropped."""
+    return re.findall(r"\w+", text.lower())
+
+
+def _full_text_search(
+    db: AsyncSession, query: Select, text: str, model, fts, columns: Sequence
+) -> Tuple[Select, Optional[ColumnElement]]:
+    terms = search_terms(text)
+    if not terms:
+        return query, None
+
+    dialect = db.bind.dialect.name
+    if dialect == "sqlite":
+        match = " ".join(f'"{term}"' for term in terms) + "*"
+        handle = fts.c[fts.name]
+        query = (
+            query.join(fts, fts.c.rowid == model.id)
+            .where(handle.op("MATCH")(match))
+        )
+        return query, func.bm25(handle, NAME_WEIGHT, DESCRIPTION_WEIGHT)
+
+    if dialect == "postgresql":
+        tsquery = func.to_tsquery("english", " & ".join(terms) + ":*")
+        vector = literal_column(f"{model.__tablename__}.search_vector")
+        query = query.where(vector.op("@@")(tsquery))
+        return query, -func.ts_rank_cd(vector, tsquery)
+
+    query = query.where(or_(*(column.ilike(f"%{text}%") for column in columns)))
+    return query, None
+
+
+def product_search(db: AsyncSession, query: Select, text: str) -> Tuple[Select, Optional[ColumnElement]]:
+    """Restrict ``query`` to products matching ``text``.
+
+    Returns the query and a relevance expression to sort by (ascending, best
+    match first), or None when there is nothing to rank by.
+    """
+    return _full_text_search(db, query, text, Product, products_fts, [Product.name, Product.description])
+
+
+def blog_search(db: AsyncSession, query: Select, text: str) -> Tuple[Select, Optional[ColumnElement]]:
+    """Restrict ``query`` to blog posts matching ``text``; see ``product_search``."""
+    return _full_text_search(db, query, text, BlogPost, blog_posts_fts, [BlogPost.title, BlogPost.content])
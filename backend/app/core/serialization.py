@@ -0,0 +1,115 @@
+"""
+Fast JSON responses.
+
+For a route with a ``response_model`` FastAPI validates the returned ORM
+rows into schema instances, converts those back to dicts and lists with
+``jsonable_encoder`` and then encodes the result with the stdlib ``json``
+module - several passes in Python over every field of every row.
+
+Routes that return ``render(...)`` instead validate the rows straight
+from their attributes and serialize them in one step in pydantic-core,
+through a ``TypeAdapter`` built once per schema. Lists of rows whose column
+types already match the schema skip validation altogether: the column
+values are read off the rows and encoded by orjson. The resulting
+``Response`` bypasses FastAPI's response_model handling; the route keeps its
+``response_model`` for the OpenAPI docs. Everything else is rendered with
+orjson too (``ORJSONResponse`` is the app's default response class).
+"""
+
+import enum
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, FrozenSet, List, Optional, Sequence, Type, Union, get_args, get_origin
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+from sqlalchemy import JSON
+
+# Values that orjson writes exactly as pydantic's JSON mode does
+_DIRECT_TYPES = (bool, int, float, str, datetime, enum.Enum)
+
+
+@lru_cache(maxsize=256)
+def schema_adapter(schema: Type[BaseModel], many: bool = False, names: Optional[FrozenSet[str]] = None) -> TypeAdapter:
+    """Compiled (de)serializer for ``schema`` or ``List[schema]``, optionally
+    restricted to the fields in ``names``."""
+    if names is not None:
+        definitions = {
+            name: (field.annotation, field)
+            for name, field in schema.model_fields.items()
+            if name in names
+        }
+        schema = create_model(
+            f"{schema.__name__}Fields", __config__=ConfigDict(from_attributes=True), **definitions
+        )
+    return TypeAdapter(List[schema] if many else schema)
+
+
+def _is_direct(annotation, column) -> bool:
+    """Whether values of ``column`` can be emitted as-is for a field typed ``annotation``."""
+    if get_origin(annotation) is Union:
+        arguments = [argument for argument in get_args(annotation) if argument is not type(None)]
+        if len(arguments) != 1:
+            return False
+        annotation = arguments[0]
+    if isinstance(column.type, JSON):
+        return get_origin(annotation) in (list, dict)
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return False
+    if not isinstance(annotation, type) or not issubclass(python_type, _DIRECT_TYPES):
+        return False
+    # An int column behind a float field would lose its ".0"
+    return python_type is annotation or (issubclass(python_type, annotation) and annotation is not float)
+
+
+@lru_cache(maxsize=256)
+def row_encoder(
+    schema: Type[BaseModel], model, names: Optional[FrozenSet[str]] = None
+) -> Optional[Callable[[Sequence[Any]], bytes]]:
+    """Encoder writing rows of ``model`` straight to JSON as ``schema``, or None
+    when a field needs pydantic to convert it (e.g. a "0"/"1" string column
+    behind a bool field, or a field that is not a column)."""
+    columns = model.__table__.columns
+    fields = [name for name in schema.model_fields if names is None or name in names]
+    for name in fields:
+        if name not in columns or not _is_direct(schema.model_fields[name].annotation, columns[name]):
+            return None
+
+    def encode(rows: Sequence[Any]) -> bytes:
+        items = []
+        for row in rows:
+            loaded = row.__dict__
+            items.append({
+                name: loaded[name] if name in loaded else getattr(row, name)
+                for name in fields
+            })
+        return orjson.dumps(items, option=orjson.OPT_UTC_Z)
+
+    return encode
+
+
+def render(
+    data: Any,
+    schema: Type[BaseModel],
+    names: Optional[FrozenSet[str]] = None,
+    response: Optional[Response] = None,
+) -> Response:
+    """Encode ``data`` (an ORM row or list of rows) as ``schema`` restricted to
+    ``names``; all fields when ``names`` is None."""
+    if isinstance(data, list):
+        encoder = row_encoder(schema, type(data[0]), names) if data else None
+        if encoder is not None:
+            return json_response(encoder(data), response)
+    adapter = schema_adapter(schema, isinstance(data, list), names)
+    return json_response(adapter.dump_json(adapter.validate_python(data, from_attributes=True)), response)
+
+
+def json_response(content: bytes, response: Optional[Response] = None) -> Response:
+    """A JSON response carrying over headers already set on ``response`` (cursor, counts)."""
+    headers = dict(response.headers) if response is not None else None
+    if headers:
+        headers.pop("content-length", None)
+    return Response(content=content, media_type="application/json", headers=headers)
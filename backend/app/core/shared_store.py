@@ -0,0 +1,163 @@
+"""
+Host-local store shared by all uvicorn workers.
+
+State that must agree across worker processes on the same machine (rate
+limit buckets, cached responses and their tag versions, user cache versions,
+read-your-writes markers) lives in a small SQLite file next to the app. Each
+thread keeps its own connection; writes use ``BEGIN IMMEDIATE`` so
+read-modify-write updates are atomic across processes. The data is disposable, so durability is traded
+for speed (``synchronous=OFF``).
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional, Tuple
+
+from app.core.config import settings
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS token_buckets (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_token_buckets_updated_at ON token_buckets (updated_at);
+CREATE TABLE IF NOT EXISTS cache_entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_cache_entries_expires_at ON cache_entries (expires_at);
+CREATE TABLE IF NOT EXISTS tag_versions (
+    tag TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS recent_writes (
+    key TEXT PRIMARY KEY,
+    written_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_recent_writes_written_at ON recent_writes (written_at);
+"""
+
+# Buckets untouched for this long are full again and can be dropped
+STALE_BUCKET_SECONDS = 24 * 3600
+PRUNE_INTERVAL_SECONDS = 600
+
+
+class SharedStore:
+    """SQLite-backed state shared between worker processes."""
+
+    def __init__(self, path: str, busy_timeout_ms: int = 2000):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._last_prune = 0.0
+        self._last_cache_prune = 0.0
+        self._last_write_prune = 0.0
+        with self._connect() as connection:
+            connection.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=OFF")
+        return connection
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+        return connection
+
+    def take_token(self, key: str, capacity: float, refill_per_second: float, cost: float = 1.0) -> Tuple[bool, float]:
+        """Take ``cost`` tokens from a bucket; return (allowed, seconds until allowed)."""
+        now = time.time()
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute(
+                "SELECT tokens, updated_at FROM token_buckets WHERE key = ?", (key,)
+            ).fetchone()
+            tokens = capacity if row is None else min(capacity, row[0] + (now - row[1]) * refill_per_second)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            connection.execute(
+                "INSERT INTO token_buckets (key, tokens, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at",
+                (key, tokens, now),
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        if now - self._last_prune > PRUNE_INTERVAL_SECONDS:
+            self._last_prune = now
+            connection.execute(
+                "DELETE FROM token_buckets WHERE updated_at < ?", (now - STALE_BUCKET_SECONDS,)
+            )
+
+        retry_after = 0.0 if allowed else (cost - tokens) / refill_per_second
+        return allowed, retry_after
+
+    def get(self, key: str) -> Optional[bytes]:
+        """A cached value, or None if it is missing or expired."""
+        row = self.connection.execute(
+            "SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def set(self, key: str, value: bytes, ttl_seconds: float):
+        now = time.time()
+        connection = self.connection
+        connection.execute(
+            "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, now + ttl_seconds),
+        )
+        if now - self._last_cache_prune > PRUNE_INTERVAL_SECONDS:
+            self._last_cache_prune = now
+            connection.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+
+    def tag_versions(self, tags: Iterable[str]) -> Tuple[Tuple[str, int], ...]:
+        tags = sorted(tags)
+        rows = dict(self.connection.execute(
+            f"SELECT tag, version FROM tag_versions WHERE tag IN ({', '.join('?' * len(tags))})", tags
+        ).fetchall())
+        return tuple((tag, rows.get(tag, 0)) for tag in tags)
+
+    def bump_tags(self, tags: Iterable[str]):
+        """Invalidate everything cached under ``tags``, for every worker."""
+        self.connection.executemany(
+            "INSERT INTO tag_versions (tag, version) VALUES (?, 1) "
+            "ON CONFLICT(tag) DO UPDATE SET version = version + 1",
+            [(tag,) for tag in tags],
+        )
+
+    def mark_written(self, key: str, keep_seconds: float):
+        """Record that ``key`` (e.g. a user) wrote just now."""
+        now = time.time()
+        connection = self.connection
+        connection.execute(
+            "INSERT OR REPLACE INTO recent_writes (key, written_at) VALUES (?, ?)", (key, now)
+        )
+        if now - self._last_write_prune > PRUNE_INTERVAL_SECONDS:
+            self._last_write_prune = now
+            connection.execute("DELETE FROM recent_writes WHERE written_at < ?", (now - keep_seconds,))
+
+    def written_at(self, key: str) -> Optional[float]:
+        """When ``key`` last wrote (``time.time()``), or None."""
+        row = self.connection.execute("SELECT written_at FROM recent_writes WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+
+_store: Optional[SharedStore] = None
+
+
+def get_shared_store() -> SharedStore:
+    global _store
+    if _store is None:
+        _store = SharedStore(settings.SHARED_STORE_PATH)
+    return _store
@@ -0,0 +1,134 @@
+"""
+ES256 signing keys for JWTs, with rotation and a JWKS export.
+
+Each key is a PEM file in ``JWT_KEYS_DIR`` named ``<kid>.pem``. Tokens are
+signed with the active key (``JWT_ACTIVE_KID``, or the newest kid by name)
+and carry its ``kid`` in the header; any key still in the directory can
+verify. To rotate, generate a new key and restart: tokens signed with the
+old key keep verifying until its file is removed, which is safe once
+``REFRESH_TOKEN_EXPIRE_DAYS`` have passed. Retired keys may be replaced by
+their public half only.
+
+Generate a key with::
+
+    python -m app.core.signing_keys generate
+"""
+
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from jose import jwk
+from jose.backends.base import Key
+
+from app.core.config import settings
+
+ALGORITHM = "ES256"
+
+# Reload the directory at most this often when a token names an unknown kid
+RELOAD_INTERVAL_SECONDS = 30
+
+
+class KeyRing:
+    """Signing and verification keys loaded from a directory."""
+
+    def __init__(self, directory: str, active_kid: Optional[str] = None):
+        self.directory = directory
+        self.configured_kid = active_kid
+        self._lock = threading.Lock()
+        # kid -> public key (verification) and kid -> private key (signing)
+        self._public: Dict[str, Key] = {}
+        self._private: Dict[str, Key] = {}
+        self._loaded_at = 0.0
+
+    def load(self):
+        public: Dict[str, Key] = {}
+        private: Dict[str, Key] = {}
+        if os.path.isdir(self.directory):
+            for filename in sorted(os.listdir(self.directory)):
+                if not filename.endswith(".pem"):
+                    continue
+                kid = filename[:-len(".pem")]
+                with open(os.path.join(self.directory, filename), "rb") as key_file:
+                    key = jwk.construct(key_file.read(), ALGORITHM)
+                if key.is_public():
+                    public[kid] = key
+                else:
+                    private[kid] = key
+                    public[kid] = key.public_key()
+        with self._lock:
+            self._public = public
+            self._private = private
+            self._loaded_at = time.monotonic()
+
+    @property
+    def active_kid(self) -> str:
+        kid = self.configured_kid or max(self._private, default=None)
+        if kid is None or kid not in self._private:
+            raise RuntimeError(
+                f"No ES256 signing key found in {self.directory!r}; "
+                "run `python -m app.core.signing_keys generate`"
+            )
+        return kid
+
+    def signing_key(self):
+        """(kid, private key) used for new tokens."""
+        if not self._loaded_at:
+            self.load()
+        kid = self.active_kid
+        return kid, self._private[kid]
+
+    def verification_key(self, kid: Optional[str]) -> Optional[Key]:
+        """Key for ``kid``, reloading the directory once if it is unknown."""
+        if not self._loaded_at:
+            self.load()
+        key = self._public.get(kid)
+        if key is None and time.monotonic() - self._loaded_at > RELOAD_INTERVAL_SECONDS:
+            self.load()
+            key = self._public.get(kid)
+        return key
+
+    def jwks(self) -> dict:
+        """Public keys in JWK Set format."""
+        if not self._loaded_at:
+            self.load()
+        return {
+            "keys": [
+                {**key.to_dict(), "kid": kid, "use": "sig"}
+                for kid, key in self._public.items()
+            ]
+        }
+
+
+def generate_key(directory: str, kid: Optional[str] = None) -> str:
+    """Write a new P-256 private key to ``directory`` and return its kid.
+
+    The default kid is a UTC timestamp, so the newest key sorts last.
+    """
+    os.makedirs(directory, exist_ok=True)
+    kid = kid or datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    path = os.path.join(directory, f"{kid}.pem")
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as key_file:
+        key_file.write(pem)
+    return kid
+
+
+key_ring = KeyRing(settings.JWT_KEYS_DIR, settings.JWT_ACTIVE_KID)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["generate"]:
+        sys.exit("usage: python -m app.core.signing_keys generate")
+    print(generate_key(settings.JWT_KEYS_DIR))
@@ -0,0 +1,98 @@
+"""
+Normalized blog post tags.
+
+``BlogPost.tags`` stays the comma-separated string the API reads and
+writes; every write of it is mirrored into ``blog_tags`` (one row per
+distinct lowercased tag) and ``blog_post_tags`` (one row per post and tag),
+so filtering by tag is an index lookup and tag counts are one aggregate over
+the link table.
+"""
+
+from typing import List, Optional
+
+from sqlalchemy import Select, delete, false, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.blog import BlogPost, BlogPostTag, BlogTag
+
+MAX_TAG_LENGTH = 50
+
+# INSERT ... ON CONFLICT DO NOTHING, for tags created by a concurrent request
+_UPSERT_INSERTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+
+
+def parse_tags(tags: Optional[str]) -> List[str]:
+    """Distinct lowercased tags from a comma-separated string, in order."""
+    names = []
+    for part in (tags or "").split(","):
+        name = " ".join(part.split()).lower()[:MAX_TAG_LENGTH]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+async def set_post_tags(db: AsyncSession, post_id: int, tags: Optional[str]):
+    """Replace the indexed tags of a post with those in ``tags``."""
+    await db.execute(delete(BlogPostTag).where(BlogPostTag.post_id == post_id))
+    names = parse_tags(tags)
+    if not names:
+        return
+
+    upsert = _UPSERT_INSERTS.get(db.bind.dialect.name)
+    if upsert is not None:
+        await db.execute(
+            upsert(BlogTag).values([{"name": name} for name in names]).on_conflict_do_nothing(index_elements=["name"])
+        )
+    else:
+        existing = set((await db.execute(select(BlogTag.name).where(BlogTag.name.in_(names)))).scalars())
+        missing = [{"name": name} for name in names if name not in existing]
+        if missing:
+            await db.execute(insert(BlogTag), missing)
+
+    tag_ids = (await db.execute(select(BlogTag.id).where(BlogTag.name.in_(names)))).scalars().all()
+    await db.execute(insert(BlogPostTag), [{"post_id": post_id, "tag_id": tag_id} for tag_id in tag_ids])
+
+
+# Tags on at most this many posts are filtered by fetching their posts and
+# sorting them; more popular tags by walking the newest posts and keeping the
+# tagged ones, which finds a page long before it has to sort that many rows
+SORT_TAGGED_POSTS_MAX = 1000
+
+
+async def filter_by_tag(db: AsyncSession, query: Select, tag: str) -> Select:
+    """Restrict a blog post query to posts tagged ``tag``."""
+    names = parse_tags(tag)
+    tag_id = None
+    if names:
+        tag_id = (await db.execute(select(BlogTag.id).where(BlogTag.name == names[0]))).scalar()
+    if tag_id is None:
+        return query.where(false())
+
+    tagged_posts = (await db.execute(
+        select(func.count()).select_from(
+            select(BlogPostTag.post_id).where(BlogPostTag.tag_id == tag_id)
+            .limit(SORT_TAGGED_POSTS_MAX + 1).subquery()
+        )
+    )).scalar()
+    if tagged_posts <= SORT_TAGGED_POSTS_MAX:
+        return query.where(BlogPost.id.in_(select(BlogPostTag.post_id).where(BlogPostTag.tag_id == tag_id)))
+    return query.where(
+        select(BlogPostTag.post_id)
+        .where(BlogPostTag.post_id == BlogPost.id, BlogPostTag.tag_id == tag_id)
+        .exists()
+    )
+
+
+def tag_counts_query(published_only: bool = True) -> Select:
+    """(name, number of posts) for every tag in use, most used first."""
+    links = select(BlogPostTag.tag_id, func.count().label("count"))
+    if published_only:
+        links = links.where(BlogPostTag.post_id.in_(select(BlogPost.id).where(BlogPost.published == "1")))
+    counts = links.group_by(BlogPostTag.tag_id).subquery()
+    return (
+        select(BlogTag.name, counts.c.count)
+        .join(counts, counts.c.tag_id == BlogTag.id)
+        .order_by(counts.c.count.desc(), BlogTag.name)
+    )
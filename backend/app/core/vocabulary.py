@@ -0,0 +1,278 @@
+"""
+Canonical species and breed vocabulary.
+
+Pets and shelter pets keep the species and breed text they were written
+with, and also point at an entry in ``species``/``breeds`` (lowercased,
+whitespace collapsed). A write reuses an existing entry for the same name
+or its singular/plural ("dogs" for "dog"), otherwise it adds one, so
+"Dog", "dog " and "dogs" all land on the same ``species_id``.
+
+Filters go the other way: the user's text is matched against the
+vocabulary, exactly or else by trigram similarity (as ``pg_trgm`` does it:
+the share of three-letter chunks of the padded words the two names have in
+common), and the query becomes an indexed ``species_id``/``breed_id``
+lookup. The vocabulary is small, so it is held in memory and reloaded after
+it is written to by this worker, or after ``VOCABULARY_CACHE_TTL_SECONDS``.
+
+Rows written around the API (bulk loads, other services) have no
+``species_id`` until ``backfill_vocabulary`` runs; it runs at startup, in
+every worker, and adds entries with the same conflict-tolerant insert.
+"""
+
+import asyncio
+import re
+import time
+from collections import Counter
+from typing import Collection, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Connection, bindparam, insert, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.invalidation import table_versions
+from app.models.pet import Breed, Pet, Species
+from app.models.shelter import ShelterPet
+
+MAX_SPECIES_LENGTH = 50
+MAX_BREED_LENGTH = 100
+
+SPECIES_DESCRIPTION = "Species name; misspellings match the closest known species"
+BREED_DESCRIPTION = "Breed name; misspellings match the closest known breed"
+
+# Lowest trigram similarity at which user input is taken to mean a name
+SIMILARITY_THRESHOLD = 0.4
+
+# INSERT ... ON CONFLICT DO NOTHING, for entries added by a concurrent request
+_UPSERT_INSERTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize(name: Optional[str], max_length: int) -> str:
+    """The vocabulary form of a name: lowercased, whitespace collapsed."""
+    return " ".join((name or "").split()).lower()[:max_length]
+
+
+def spelling_variants(name: str) -> List[str]:
+    """``name`` and its likely singular/plural forms, in order of preference."""
+    variants = [name]
+    if name.endswith("es"):
+        variants.append(name[:-2])
+    if name.endswith("s"):
+        variants.append(name[:-1])
+    else:
+        variants.append(name + "s")
+    return variants
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """Trigrams of each word of ``text`` padded with two spaces in front and one behind."""
+    chunks = set()
+    for word in _WORD.findall(text.lower()):
+        padded = f"  {word} "
+        chunks.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(chunks)
+
+
+def similarity(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _closest(text: str, max_length: int, candidates: Iterable[Tuple[str, int, FrozenSet[str]]]) -> List[int]:
+    """Ids of the candidates named ``text``, or else of the most similar name."""
+    name = normalize(text, max_length)
+    if not name:
+        return []
+    query = trigrams(name)
+    exact, best, best_score = [], [], SIMILARITY_THRESHOLD
+    for candidate, entry_id, candidate_trigrams in candidates:
+        if candidate == name:
+            exact.append(entry_id)
+            continue
+        score = similarity(query, candidate_trigrams)
+        if exact or score < best_score:
+            continue
+        if score > best_score:
+            best, best_score = [], score
+        best.append((candidate, entry_id))
+    if exact:
+        return exact
+    # Ties between different names are broken alphabetically; the same
+    # breed name under several species matches all of them
+    names = sorted({candidate for candidate, _ in best})
+    return [entry_id for candidate, entry_id in best if candidate == names[0]] if names else []
+
+
+class Vocabulary:
+    """The species and breed entries, for matching user input."""
+
+    def __init__(self, species: Iterable[Tuple[int, str]], breeds: Iterable[Tuple[int, int, str]]):
+        self.species_names: Dict[int, str] = {}
+        self.breed_names: Dict[int, str] = {}
+        self._species: List[Tuple[str, int, FrozenSet[str]]] = []
+        self._breeds: List[Tuple[str, int, int, FrozenSet[str]]] = []
+        for species_id, name in species:
+            self.species_names[species_id] = name
+            self._species.append((name, species_id, trigrams(name)))
+        for breed_id, species_id, name in breeds:
+            self.breed_names[breed_id] = name
+            self._breeds.append((name, breed_id, species_id, trigrams(name)))
+
+    def species_ids(self, text: str) -> List[int]:
+        """Species entries meant by ``text``; empty if nothing is close."""
+        return _closest(text, MAX_SPECIES_LENGTH, self._species)
+
+    def breed_ids(self, text: str, species_ids: Optional[Collection[int]] = None) -> List[int]:
+        """Breed entries meant by ``text``, among ``species_ids`` if given."""
+        candidates = (
+            (name, breed_id, breed_trigrams)
+            for name, breed_id, species_id, breed_trigrams in self._breeds
+            if species_ids is None or species_id in species_ids
+        )
+        return _closest(text, MAX_BREED_LENGTH, candidates)
+
+    def match(
+        self, species: Optional[str], breed: Optional[str]
+    ) -> Tuple[Optional[List[int]], Optional[List[int]]]:
+        """(species ids, breed ids) for the species and breed filters; None
+        for a filter that was not given."""
+        species_ids = self.species_ids(species) if species else None
+        breed_ids = self.breed_ids(breed, species_ids) if breed else None
+        return species_ids, breed_ids
+
+
+class VocabularyCache:
+    """The current Vocabulary; reloaded after writes to it or the TTL."""
+
+    TABLES = (Species.__tablename__, Breed.__tablename__)
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._vocabulary: Optional[Vocabulary] = None
+        self._versions = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _current(self) -> Optional[Vocabulary]:
+        if self._vocabulary is None or time.monotonic() - self._loaded_at >= self.ttl_seconds:
+            return None
+        if self._versions != table_versions.versions(self.TABLES):
+            return None
+        return self._vocabulary
+
+    async def get(self, db: AsyncSession) -> Vocabulary:
+        vocabulary = self._current()
+        if vocabulary is not None:
+            return vocabulary
+        async with self._lock:
+            # Loaded by another request while this one waited
+            vocabulary = self._current()
+            if vocabulary is not None:
+                return vocabulary
+            versions = table_versions.versions(self.TABLES)
+            species = (await db.execute(select(Species.id, Species.name))).all()
+            breeds = (await db.execute(select(Breed.id, Breed.species_id, Breed.name))).all()
+            self._vocabulary = Vocabulary(species, breeds)
+            self._versions = versions
+            self._loaded_at = time.monotonic()
+            return self._vocabulary
+
+    def clear(self):
+        self._vocabulary = None
+
+
+vocabulary_cache = VocabularyCache(settings.VOCABULARY_CACHE_TTL_SECONDS)
+
+
+def _insert_entry(dialect_name: str, model, name: str, **scope):
+    """INSERT of a vocabulary entry that does nothing if a concurrent writer
+    (another request, or another worker's backfill) added it first."""
+    upsert = _UPSERT_INSERTS.get(dialect_name)
+    if upsert is None:
+        return insert(model).values(name=name, **scope)
+    return upsert(model).values(name=name, **scope).on_conflict_do_nothing(index_elements=[*scope, "name"])
+
+
+async def _entry_id(db: AsyncSession, model, name: str, **scope) -> int:
+    """Id of the entry for ``name`` (or a spelling variant), added if missing."""
+    variants = spelling_variants(name)
+    existing = dict((await db.execute(
+        select(model.name, model.id).filter_by(**scope).where(model.name.in_(variants))
+    )).all())
+    for variant in variants:
+        if variant in existing:
+            return existing[variant]
+
+    await db.execute(_insert_entry(db.bind.dialect.name, model, name, **scope))
+    return (await db.execute(select(model.id).filter_by(name=name, **scope))).scalar_one()
+
+
+async def assign_vocabulary(db: AsyncSession, pet):
+    """Point a Pet or ShelterPet at the entries for its species and breed text."""
+    species = normalize(pet.species, MAX_SPECIES_LENGTH)
+    breed = normalize(pet.breed, MAX_BREED_LENGTH)
+    pet.species_id = await _entry_id(db, Species, species) if species else None
+    pet.breed_id = await _entry_id(db, Breed, breed, species_id=pet.species_id) if breed and species else None
+
+
+def backfill_vocabulary(connection: Connection) -> int:
+    """Fill species_id/breed_id on pets and shelter pets that lack them.
+
+    Takes a sync connection (``AsyncConnection.run_sync`` from async code)
+    and returns the number of rows updated. Names are added most common
+    first, so the usual spelling becomes the entry a variant folds into.
+    """
+    # (species_id or None for species, name) -> id
+    entries = {(None, name): species_id for name, species_id in connection.execute(select(Species.name, Species.id))}
+    entries.update(
+        ((species_id, name), breed_id)
+        for breed_id, species_id, name in connection.execute(select(Breed.id, Breed.species_id, Breed.name))
+    )
+
+    def entry_id(model, name: str, species_id: Optional[int] = None) -> int:
+        for variant in spelling_variants(name):
+            if (species_id, variant) in entries:
+                return entries[(species_id, variant)]
+        scope = {} if model is Species else {"species_id": species_id}
+        connection.execute(_insert_entry(connection.dialect.name, model, name, **scope))
+        entries[(species_id, name)] = connection.execute(
+            select(model.id).filter_by(name=name, **scope)
+        ).scalar_one()
+        return entries[(species_id, name)]
+
+    updated = 0
+    for model in (Pet, ShelterPet):
+        rows = connection.execute(
+            select(model.id, model.species, model.breed, model.species_id, model.breed_id).where(
+                or_(model.species_id.is_(None), model.breed.isnot(None) & model.breed_id.is_(None))
+            )
+        ).all()
+        names = [
+            (row, normalize(row.species, MAX_SPECIES_LENGTH), normalize(row.breed, MAX_BREED_LENGTH))
+            for row in rows
+        ]
+        for species, _ in Counter(species for _, species, _ in names if species).most_common():
+            entry_id(Species, species)
+        pairs = Counter((species, breed) for _, species, breed in names if species and breed)
+        for (species, breed), _ in pairs.most_common():
+            entry_id(Breed, breed, entry_id(Species, species))
+
+        values = []
+        for row, species, breed in names:
+            species_id = entry_id(Species, species) if species else None
+            breed_id = entry_id(Breed, breed, species_id) if species and breed else None
+            # Blank names have no entry and are left as they are
+            if (species_id, breed_id) != (row.species_id, row.breed_id):
+                values.append({"pet_id": row.id, "species_id": species_id, "breed_id": breed_id})
+        if values:
+            connection.execute(
+                update(model).where(model.id == bindparam("pet_id"))
+                .values(species_id=bindparam("species_id"), breed_id=bindparam("breed_id")),
+                values,
+            )
+        updated += len(values)
+    return updated
@@ -1,21 +1,167 @@
-from sqlalchemy import create_engine
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
+from app.core.invalidation import table_versions
+from app.core.pool_metrics import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool
+from app.core.replica import RecentWriters, get_request_user_id
+from app.core.sqlite_profile import install_sqlite_profile
+
+# Async drivers used when ASYNC_DATABASE_URL is not set explicitly
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def get_async_database_url(url: str) -> str:
+    """Derive an async driver URL from a sync DATABASE_URL."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if parsed.get_driver_name() in ("aiosqlite", "asyncpg"):
+        return url
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def get_pool_options() -> dict:
+    """Pool settings shared by the sync and async engines."""
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
 
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
+    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
+    poolclass=InstrumentedQueuePool,
+    **get_pool_options()
+)
+
+# Create async engine used by the API routers. The pool class is set
+# explicitly because aiosqlite would otherwise default to NullPool, which
+# opens a new connection (and worker thread) per request.
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    poolclass=InstrumentedAsyncAdaptedQueuePool,
+    **get_pool_options()
 )
 
+# Optional read replica for read-heavy public endpoints; falls back to the primary
+if settings.DATABASE_READ_URL:
+    ASYNC_DATABASE_READ_URL = (
+        settings.ASYNC_DATABASE_READ_URL or get_async_database_url(settings.DATABASE_READ_URL)
+    )
+    read_async_engine = create_async_engine(
+        ASYNC_DATABASE_READ_URL,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        **get_pool_options()
+    )
+else:
+    read_async_engine = async_engine
+
+if settings.SQLITE_PRODUCTION_PROFILE:
+    install_sqlite_profile(engine)
+    install_sqlite_profile(async_engine.sync_engine)
+    if read_async_engine is not async_engine:
+        install_sqlite_profile(read_async_engine.sync_engine)
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+class PrimarySession(Session):
+    """Session class for the primary; commits are tracked for read-your-writes."""
+
+
+# Users who committed on the primary within the read-your-writes window
+recent_writers = RecentWriters(settings.READ_YOUR_WRITES_SECONDS)
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _record_user_write(session):
+    # Marked by PrimaryAsyncSession.commit: the shared store write blocks
+    if session.info.get("user_id") is not None:
+        session.info["user_wrote"] = True
+
+
+class PrimaryAsyncSession(AsyncSession):
+    """Async session for the primary; marks the request's user as a recent
+    writer, off the event loop, before ``commit`` returns."""
+
+    async def commit(self):
+        await super().commit()
+        if self.info.pop("user_wrote", False):
+            await run_in_threadpool(recent_writers.mark, self.info["user_id"])
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _collect_written_tables(session, flush_context):
+    # new/dirty/deleted still describe the flushed objects at this point
+    tables = session.info.setdefault("written_tables", set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        tables.add(obj.__table__.name)
+
+
+@event.listens_for(PrimarySession, "do_orm_execute")
+def _collect_statement_tables(orm_execute_state):
+    # INSERT/UPDATE/DELETE statements run through the session skip the flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        tables = orm_execute_state.session.info.setdefault("written_tables", set())
+        tables.add(orm_execute_state.statement.table.name)
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _bump_table_versions(session):
+    tables = session.info.pop("written_tables", None)
+    if tables:
+        table_versions.bump(tables)
+
+
+@event.listens_for(PrimarySession, "after_rollback")
+def _discard_written_tables(session):
+    session.info.pop("written_tables", None)
+
+
+# Create AsyncSessionLocal class. Objects stay loaded after commit so that
+# handlers can return them without triggering lazy loads outside the session.
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=PrimaryAsyncSession,
+    sync_session_class=PrimarySession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Create ReadSessionLocal class bound to the replica (or the primary if unset)
+ReadSessionLocal = async_sessionmaker(
+    read_async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 # Create Base class for models
 Base = declarative_base()
 
 
+def get_pool_stats() -> dict:
+    """Live occupancy and checkout metrics for each engine's connection pool."""
+    return {
+        "primary": async_engine.pool.stats(),
+        "primary_sync": engine.pool.stats(),
+        **({"replica": read_async_engine.pool.stats()} if read_async_engine is not async_engine else {}),
+    }
+
+
 # Dependency to get database session
 def get_db():
     db = SessionLocal()
@@ -25,4 +171,24 @@ def get_db():
         db.close()
 
 
+# Dependency to get async database session
+async def get_async_db(request: Request):
+    async with AsyncSessionLocal() as db:
+        if read_async_engine is not async_engine:
+            db.info["user_id"] = get_request_user_id(request)
+        yield db
+
 
+# Dependency to get a read-only async session. Uses the replica unless the
+# caller wrote on the primary within READ_YOUR_WRITES_SECONDS.
+async def get_read_db(request: Request):
+    if read_async_engine is async_engine:
+        session_factory = AsyncSessionLocal
+    else:
+        user_id = get_request_user_id(request)
+        if user_id is not None and await run_in_threadpool(recent_writers.wrote_recently, user_id):
+            session_factory = AsyncSessionLocal
+        else:
+            session_factory = ReadSessionLocal
+    async with session_factory() as db:
+        yield db
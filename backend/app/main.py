@@ -1,29 +1,86 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import uvicorn
+from sqlalchemy import inspect
+from sqlalchemy.exc import OperationalError
 
-from app.database import engine, Base
-from app.routers import auth, users, pets, appointments, products, blog, shelters
+from app.auth import configure_password_hashing, hash_pool
+from app.core.autocomplete import completions
+from app.database import engine, async_engine, read_async_engine, AsyncSessionLocal, Base
 from app.core.config import settings
+from app.core.compression import CompressionMiddleware
+from app.core.counts import ESTIMATED_HEADER, TOTAL_COUNT_HEADER
+from app.core.etag import NotModified
+from app.core.msgpack_middleware import MessagePackMiddleware
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.revocation import revocations
+from app.core.signing_keys import key_ring
+from app.core.sqlite_profile import optimize_periodically
+from app.core.vocabulary import backfill_vocabulary
 
 # Import all models to ensure they are registered with SQLAlchemy
 from app.models import user, pet, appointment, product, blog, shelter
 
+# Routers are imported after the models so `blog` refers to the router module
+from app.routers import auth, users, pets, appointments, products, blog, shelters, search, admin
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     print("Starting up PawfectCare API...")
-    # Create database tables
-    Base.metadata.create_all(bind=engine)
-    print("Database tables created successfully")
+    # Create database tables, unless Alembic manages the schema: tables made
+    # here would make later migrations that create them fail
+    if inspect(engine).has_table("alembic_version"):
+        print("Database schema is managed by Alembic; not creating tables")
+    else:
+        Base.metadata.create_all(bind=engine)
+        print("Database tables created successfully")
+    rounds = configure_password_hashing()
+    print(f"Password hashing uses bcrypt cost {rounds}")
+    if settings.ALGORITHM == "ES256":
+        # Fail at startup rather than on the first login if no key is present
+        kid, _ = key_ring.signing_key()
+        print(f"Signing tokens with ES256 key {kid}")
+    async with AsyncSessionLocal() as db:
+        await revocations.rebuild(db)
+    print(f"Loaded {len(revocations.filter)} revoked refresh tokens")
+    try:
+        async with async_engine.begin() as connection:
+            backfilled = await connection.run_sync(backfill_vocabulary)
+    except OperationalError as exc:
+        # SQLite has one writer: a worker that started the backfill first
+        # holds the lock and matches the same rows
+        if async_engine.dialect.name != "sqlite" or "locked" not in str(exc.orig):
+            raise
+        print("Species/breed backfill is running in another worker")
+        backfilled = 0
+    if backfilled:
+        print(f"Matched {backfilled} pets to the species/breed vocabulary")
+    # Built before serving, so no search request waits for it
+    await completions.reload()
+    print(f"Loaded {completions.stats()['values']} autocomplete values")
+    
+    optimize_task = None
+    if settings.SQLITE_PRODUCTION_PROFILE and async_engine.dialect.name == "sqlite":
+        optimize_task = asyncio.create_task(
+            optimize_periodically(async_engine, settings.SQLITE_OPTIMIZE_INTERVAL_SECONDS)
+        )
     
     yield
     
     # Shutdown
     print("Shutting down PawfectCare API...")
+    if optimize_task:
+        optimize_task.cancel()
+    hash_pool.shutdown()
+    await async_engine.dispose()
+    if read_async_engine is not async_engine:
+        await read_async_engine.dispose()
 
 
 # Create FastAPI app
@@ -33,9 +90,17 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
+# Serve MessagePack to clients that ask for it (innermost, so CORS and
+# host checks see the translated request)
+app.add_middleware(MessagePackMiddleware)
+
+# Compress large responses (after MessagePack encoding)
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -43,6 +108,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, ESTIMATED_HEADER, "ETag"],
 )
 
 # Add trusted host middleware for security
@@ -51,6 +117,11 @@ app.add_middleware(
     allowed_hosts=settings.ALLOWED_HOSTS
 )
 
+@app.exception_handler(NotModified)
+async def not_modified_handler(request: Request, exc: NotModified):
+    return Response(status_code=304, headers={"ETag": exc.etag})
+
+
 # Include routers
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
 app.include_router(users.router, prefix="/api/v1/users", tags=["Users"])
@@ -59,6 +130,8 @@ app.include_router(appointments.router, prefix="/api/v1/appointments", tags=["Ap
 app.include_router(products.router, prefix="/api/v1/products", tags=["Products"])
 app.include_router(blog.router, prefix="/api/v1/blog", tags=["Blog"])
 app.include_router(shelters.router, prefix="/api/v1/shelters", tags=["Shelters"])
+app.include_router(search.router, prefix="/api/v1/search", tags=["Search"])
+app.include_router(admin.router, prefix="/api/v1/admin", tags=["Admin"])
 
 
 @app.get("/")
@@ -71,6 +144,14 @@ async def root():
     }
 
 
+@app.get("/.well-known/jwks.json")
+async def jwks():
+    """Public keys for verifying ES256 access tokens locally."""
+    if settings.ALGORITHM != "ES256":
+        raise HTTPException(status_code=404, detail="Tokens are not signed with public keys")
+    return JSONResponse(key_ring.jwks(), headers={"Cache-Control": "public, max-age=300"})
+
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "service": "PawfectCare API"}
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -15,6 +15,12 @@ class AppointmentStatus(str, enum.Enum):
 
 class Appointment(Base):
     __tablename__ = "appointments"
+    __table_args__ = (
+        # Every list index ends in id so ORDER BY id (keyset pagination) needs no sort
+        Index("ix_appointments_veterinarian_id_id", "veterinarian_id", "id"),
+        Index("ix_appointments_veterinarian_id_status_id", "veterinarian_id", "status", "id"),
+        Index("ix_appointments_pet_id_id", "pet_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     pet_id = Column(Integer, ForeignKey("pets.id"), nullable=False)
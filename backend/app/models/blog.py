@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum
+from sqlalchemy import DDL, Column, Integer, String, DateTime, ForeignKey, Enum, Index, event
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -16,13 +16,16 @@ class BlogCategory(str, enum.Enum):
 
 class BlogPost(Base):
     __tablename__ = "blog_posts"
+    __table_args__ = (
+        Index("ix_blog_posts_published_created_at_id", "published", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     title = Column(String(200), nullable=False)
     content = Column(String(10000), nullable=False)
     category = Column(Enum(BlogCategory), nullable=False, default=BlogCategory.GENERAL)
-    tags = Column(String(500), nullable=True)  # Comma-separated tags
+    tags = Column(String(500), nullable=True)  # Comma-separated tags, indexed in blog_post_tags
     image_url = Column(String(500), nullable=True)
     published = Column(String(1), default="0")  # SQLite boolean workaround
     likes_count = Column(Integer, default=0)
@@ -42,4 +45,58 @@ class BlogPost(Base):
         self.published = "1" if value else "0"
 
 
+class BlogTag(Base):
+    __tablename__ = "blog_tags"
 
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=False, unique=True)  # Lowercased
+
+
+class BlogPostTag(Base):
+    """One row per (post, tag), written from ``BlogPost.tags`` (see app/core/tags.py)."""
+    __tablename__ = "blog_post_tags"
+    __table_args__ = (
+        # Posts with a tag; the primary key serves a post's tags
+        Index("ix_blog_post_tags_tag_id_post_id", "tag_id", "post_id"),
+    )
+
+    post_id = Column(Integer, ForeignKey("blog_posts.id", ondelete="CASCADE"), primary_key=True)
+    tag_id = Column(Integer, ForeignKey("blog_tags.id", ondelete="CASCADE"), primary_key=True)
+
+
+# Full-text index over title and content (see app/core/search.py).
+# SQLite: an external-content FTS5 table kept in sync by triggers.
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS blog_posts_fts USING fts5("
+    "title, content, content='blog_posts', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS blog_posts_fts_insert AFTER INSERT ON blog_posts BEGIN "
+    "INSERT INTO blog_posts_fts (rowid, title, content) VALUES (new.id, new.title, new.content); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS blog_posts_fts_delete AFTER DELETE ON blog_posts BEGIN "
+    "INSERT INTO blog_posts_fts (blog_posts_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS blog_posts_fts_update AFTER UPDATE OF title, content ON blog_posts BEGIN "
+    "INSERT INTO blog_posts_fts (blog_posts_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); "
+    "INSERT INTO blog_posts_fts (rowid, title, content) VALUES (new.id, new.title, new.content); "
+    "END",
+    "INSERT INTO blog_posts_fts (blog_posts_fts) VALUES ('rebuild')",
+]
+
+# PostgreSQL: a generated tsvector column (title weighs more) with a GIN index
+POSTGRES_SEARCH_DDL = [
+    "ALTER TABLE blog_posts ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(content, '')), 'B')) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_blog_posts_search_vector ON blog_posts USING GIN (search_vector)",
+]
+
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(BlogPost.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+for _statement in POSTGRES_SEARCH_DDL:
+    event.listen(BlogPost.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+event.listen(
+    BlogPost.__table__, "before_drop", DDL("DROP TABLE IF EXISTS blog_posts_fts").execute_if(dialect="sqlite")
+)
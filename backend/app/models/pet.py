@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -18,14 +18,42 @@ class HealthRecordType(str, enum.Enum):
     DEWORMING = "deworming"
 
 
+# Canonical species and breed names (see app/core/vocabulary.py). Pets and
+# shelter pets keep the text they were given and point at these entries.
+class Species(Base):
+    __tablename__ = "species"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=False, unique=True)
+
+
+class Breed(Base):
+    __tablename__ = "breeds"
+    __table_args__ = (
+        UniqueConstraint("species_id", "name"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    species_id = Column(Integer, ForeignKey("species.id"), nullable=False)
+    name = Column(String(100), nullable=False)
+
+
 class Pet(Base):
     __tablename__ = "pets"
+    __table_args__ = (
+        Index("ix_pets_user_id_id", "user_id", "id"),
+        Index("ix_pets_species_id_id", "species_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     name = Column(String(100), nullable=False)
     species = Column(String(50), nullable=False)
     breed = Column(String(100), nullable=True)
+    # Filled from species/breed on write, and by the backfill for rows written
+    # around the API
+    species_id = Column(Integer, ForeignKey("species.id"), nullable=True)
+    breed_id = Column(Integer, ForeignKey("breeds.id"), nullable=True)
     age = Column(Integer, nullable=False, default=0)
     gender = Column(Enum(PetGender), nullable=False, default=PetGender.OTHER)
     photo = Column(String(500), nullable=True)
@@ -41,6 +69,9 @@ class Pet(Base):
 
 class PetHealthRecord(Base):
     __tablename__ = "pet_health_records"
+    __table_args__ = (
+        Index("ix_pet_health_records_pet_id", "pet_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     pet_id = Column(Integer, ForeignKey("pets.id"), nullable=False)
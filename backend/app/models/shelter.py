@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -25,12 +25,22 @@ class RequestStatus(str, enum.Enum):
 
 class ShelterPet(Base):
     __tablename__ = "shelter_pets"
+    __table_args__ = (
+        Index("ix_shelter_pets_adoption_status_species_id_id", "adoption_status", "species_id", "id"),
+        Index("ix_shelter_pets_species_id_id", "species_id", "id"),
+        Index("ix_shelter_pets_breed_id_id", "breed_id", "id"),
+        Index("ix_shelter_pets_adoption_status_id", "adoption_status", "id"),
+        Index("ix_shelter_pets_shelter_id_id", "shelter_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     shelter_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     name = Column(String(100), nullable=False)
     species = Column(String(50), nullable=False)
     breed = Column(String(100), nullable=True)
+    # See Pet.species_id
+    species_id = Column(Integer, ForeignKey("species.id"), nullable=True)
+    breed_id = Column(Integer, ForeignKey("breeds.id"), nullable=True)
     age = Column(Integer, nullable=False, default=0)
     gender = Column(Enum(PetGender), nullable=False, default=PetGender.OTHER)
     photo = Column(String(500), nullable=True)
@@ -47,6 +57,12 @@ class ShelterPet(Base):
 
 class AdoptionRequest(Base):
     __tablename__ = "adoption_requests"
+    __table_args__ = (
+        Index("ix_adoption_requests_requester_id_id", "requester_id", "id"),
+        Index("ix_adoption_requests_requester_id_status_id", "requester_id", "status", "id"),
+        Index("ix_adoption_requests_shelter_pet_id_id", "shelter_pet_id", "id"),
+        Index("ix_adoption_requests_shelter_pet_id_status_id", "shelter_pet_id", "status", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     shelter_pet_id = Column(Integer, ForeignKey("shelter_pets.id"), nullable=False)
@@ -0,0 +1,65 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.auth import hash_pool
+from app.core.autocomplete import completions
+from app.core.cache import get_cache_stats
+from app.core.rate_limit import get_rate_limit_stats
+from app.core.response_cache import response_cache
+from app.core.revocation import revocations
+from app.database import get_pool_stats
+from app.models.user import User
+from app.routers.auth import get_current_user
+
+router = APIRouter()
+
+
+async def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+    """Require the current user to be an admin."""
+    if current_user.role != "shelter_admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can access this resource"
+        )
+    return current_user
+
+
+@router.get("/db-pool")
+async def get_db_pool_stats(current_admin: User = Depends(get_current_admin)):
+    """Get connection pool occupancy, wait counts and checkout latency."""
+    return get_pool_stats()
+
+
+@router.get("/autocomplete")
+async def get_autocomplete_stats(current_admin: User = Depends(get_current_admin)):
+    """Get autocomplete index size, load and lookup counts."""
+    return completions.stats()
+
+
+@router.get("/caches")
+async def get_caches_stats(current_admin: User = Depends(get_current_admin)):
+    """Get size and hit/miss counters for the in-process caches."""
+    return get_cache_stats()
+
+
+@router.get("/password-hashing")
+async def get_password_hashing_stats(current_admin: User = Depends(get_current_admin)):
+    """Get password hashing pool queue depth, rejections and latency."""
+    return hash_pool.stats()
+
+
+@router.get("/rate-limits")
+async def get_rate_limits(current_admin: User = Depends(get_current_admin)):
+    """Get auth rate limit settings and rejection counts."""
+    return get_rate_limit_stats()
+
+
+@router.get("/response-cache")
+async def get_response_cache_stats(current_admin: User = Depends(get_current_admin)):
+    """Get catalog response cache hit, miss and coalescing counters."""
+    return response_cache.stats()
+
+
+@router.get("/token-revocations")
+async def get_token_revocation_stats(current_admin: User = Depends(get_current_admin)):
+    """Get revocation filter size and how often it sent lookups to the database."""
+    return revocations.stats()
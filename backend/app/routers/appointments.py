@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from typing import List, Optional
 from datetime import datetime
 
-from app.database import get_db
+from app.core.counts import set_total_count
+from app.core.fields import FIELDS_DESCRIPTION, parse_fields, render_fields, select_fields
+from app.core.pagination import paginate
+from app.database import get_async_db
 from app.models.appointment import Appointment
+from app.models.pet import Pet
 from app.models.user import User
 from app.schemas.appointment import (
     Appointment as AppointmentSchema,
@@ -18,47 +24,66 @@ router = APIRouter()
 
 @router.get("/", response_model=List[AppointmentSchema])
 async def get_appointments(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces skip"),
+    include_total: bool = Query(False, description="Return the number of matching items in X-Total-Count"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     pet_id: Optional[int] = None,
     veterinarian_id: Optional[int] = None,
     status: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get list of appointments with optional filtering."""
-    query = db.query(Appointment)
+    selected = parse_fields(fields, AppointmentSchema)
+    
+    query = select(Appointment)
     
     # Filter based on user role
     if current_user.role == "pet_owner":
         # Pet owners can only see appointments for their pets
-        query = query.join(Appointment.pet).filter(Appointment.pet.has(user_id=current_user.id))
+        query = query.where(
+            Appointment.pet_id.in_(select(Pet.id).where(Pet.user_id == current_user.id))
+        )
     elif current_user.role == "veterinarian":
         # Veterinarians can see their own appointments
-        query = query.filter(Appointment.veterinarian_id == current_user.id)
+        query = query.where(Appointment.veterinarian_id == current_user.id)
     elif current_user.role == "shelter_admin":
         # Shelter admins can see all appointments
         pass
     
     if pet_id:
-        query = query.filter(Appointment.pet_id == pet_id)
+        query = query.where(Appointment.pet_id == pet_id)
     if veterinarian_id:
-        query = query.filter(Appointment.veterinarian_id == veterinarian_id)
+        query = query.where(Appointment.veterinarian_id == veterinarian_id)
     if status:
-        query = query.filter(Appointment.status == status)
+        query = query.where(Appointment.status == status)
+    
+    if include_total:
+        await set_total_count(db, query, response)
     
-    appointments = query.offset(skip).limit(limit).all()
-    return appointments
+    # Owners' appointments are reached through their pets, so walk them pet by pet
+    order_by = [Appointment.pet_id, Appointment.id] if current_user.role == "pet_owner" else [Appointment.id]
+    query = select_fields(query, Appointment, selected, order_by)
+    items = await paginate(db, query, order_by, response, skip, limit, cursor)
+    return render_fields(items, AppointmentSchema, selected, response)
 
 
 @router.get("/{appointment_id}", response_model=AppointmentSchema)
 async def get_appointment(
     appointment_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get appointment by ID."""
-    appointment = db.query(Appointment).filter(Appointment.id == appointment_id).first()
+    result = await db.execute(
+        select(Appointment)
+        .options(selectinload(Appointment.pet))
+        .where(Appointment.id == appointment_id)
+    )
+    appointment = result.scalars().first()
     if not appointment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -85,14 +110,14 @@ async def get_appointment(
 @router.post("/", response_model=AppointmentSchema)
 async def create_appointment(
     appointment_data: AppointmentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new appointment."""
     # Pet owners can create appointments for their pets
     if current_user.role == "pet_owner":
-        from app.models.pet import Pet
-        pet = db.query(Pet).filter(Pet.id == appointment_data.pet_id).first()
+        result = await db.execute(select(Pet).where(Pet.id == appointment_data.pet_id))
+        pet = result.scalars().first()
         if not pet or pet.user_id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -102,8 +127,8 @@ async def create_appointment(
     db_appointment = Appointment(**appointment_data.dict())
     
     db.add(db_appointment)
-    db.commit()
-    db.refresh(db_appointment)
+    await db.commit()
+    await db.refresh(db_appointment)
     
     return db_appointment
 
@@ -112,11 +137,16 @@ async def create_appointment(
 async def update_appointment(
     appointment_id: int,
     appointment_update: AppointmentUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Update appointment."""
-    appointment = db.query(Appointment).filter(Appointment.id == appointment_id).first()
+    result = await db.execute(
+        select(Appointment)
+        .options(selectinload(Appointment.pet))
+        .where(Appointment.id == appointment_id)
+    )
+    appointment = result.scalars().first()
     if not appointment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -143,19 +173,24 @@ async def update_appointment(
     for field, value in update_data.items():
         setattr(appointment, field, value)
     
-    db.commit()
-    db.refresh(appointment)
+    await db.commit()
+    await db.refresh(appointment)
     return appointment
 
 
 @router.delete("/{appointment_id}")
 async def delete_appointment(
     appointment_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Delete appointment."""
-    appointment = db.query(Appointment).filter(Appointment.id == appointment_id).first()
+    result = await db.execute(
+        select(Appointment)
+        .options(selectinload(Appointment.pet))
+        .where(Appointment.id == appointment_id)
+    )
+    appointment = result.scalars().first()
     if not appointment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -177,8 +212,8 @@ async def delete_appointment(
             detail="Not enough permissions"
         )
     
-    db.delete(appointment)
-    db.commit()
+    await db.delete(appointment)
+    await db.commit()
     
     return {"message": "Appointment deleted successfully"}
 
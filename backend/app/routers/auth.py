@@ -1,34 +1,63 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models.user import User
-from app.schemas.user import UserCreate, UserLogin, Token, User as UserSchema
+from app.schemas.user import UserCreate, UserLogin, LogoutRequest, Token, User as UserSchema
 from app.auth import (
-    verify_password, 
-    get_password_hash, 
+    verify_and_update_password_async,
+    get_password_hash_async,
     create_access_token, 
     create_refresh_token,
     verify_token,
     get_user_id_from_token
 )
+from app.core.cache import TTLCache
+from app.core.rate_limit import limit_auth_by_account, limit_auth_by_ip
+from app.core.revocation import revocations
+from app.core.shared_store import get_shared_store
 from app.core.config import settings
 
 router = APIRouter()
 security = HTTPBearer()
 
+# Detached User rows keyed by (id, version). The version is a shared-store
+# tag bumped whenever the user is updated or deactivated, so every worker
+# stops serving the old row at once; superseded entries age out.
+user_cache = TTLCache("users", settings.USER_CACHE_MAXSIZE, settings.USER_CACHE_TTL_SECONDS)
 
-def get_current_user(
+
+def _user_tag(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def invalidate_cached_user(user_id: int):
+    """Stop every worker serving its cached copy of ``user_id`` (blocking)."""
+    get_shared_store().bump_tags([_user_tag(user_id)])
+
+
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     """Get current authenticated user."""
     token = credentials.credentials
     user_id = get_user_id_from_token(token)
     
-    user = db.query(User).filter(User.id == user_id).first()
+    ((_, version),) = await run_in_threadpool(get_shared_store().tag_versions, [_user_tag(user_id)])
+    user = user_cache.get((user_id, version))
+    if user is None:
+        result = await db.execute(select(User).where(User.id == user_id))
+        user = result.scalars().first()
+        if user is not None:
+            # Detach so the cached row can be shared across sessions
+            db.expunge(user)
+            user_cache.set((user_id, version), user)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -45,11 +74,14 @@ def get_current_user(
     return user
 
 
-@router.post("/register", response_model=UserSchema)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+@router.post("/register", response_model=UserSchema, dependencies=[Depends(limit_auth_by_ip)])
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new user."""
+    await limit_auth_by_account(user_data.email)
+    
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    result = await db.execute(select(User).where(User.email == user_data.email))
+    existing_user = result.scalars().first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -57,7 +89,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     db_user = User(
         name=user_data.name,
         email=user_data.email,
@@ -67,19 +99,33 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     return db_user
 
 
-@router.post("/login", response_model=Token)
-async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+@router.post("/login", response_model=Token, dependencies=[Depends(limit_auth_by_ip)])
+async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """Login user and return access token."""
+    # Charge the account before any bcrypt work is done for it
+    await limit_auth_by_account(user_credentials.email)
+    
     # Authenticate user
-    user = db.query(User).filter(User.email == user_credentials.email).first()
+    result = await db.execute(select(User).where(User.email == user_credentials.email))
+    user = result.scalars().first()
     
-    if not user or not verify_password(user_credentials.password, user.hashed_password):
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    valid, new_hash = await verify_and_update_password_async(
+        user_credentials.password, user.hashed_password
+    )
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -92,6 +138,12 @@ async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
             detail="Inactive user"
         )
     
+    # Transparently upgrade hashes made with an outdated work factor
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+        await run_in_threadpool(invalidate_cached_user, user.id)
+    
     # Create tokens
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -106,29 +158,54 @@ async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
     }
 
 
-@router.post("/refresh", response_model=Token)
+@router.post("/refresh", response_model=Token, dependencies=[Depends(limit_auth_by_ip)])
 async def refresh_token(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Refresh access token using refresh token."""
+    """Refresh access token using refresh token.
+    
+    Refresh tokens are single use: the presented token is revoked and a new
+    one is issued.
+    """
     token = credentials.credentials
     payload = verify_token(token, "refresh")
     user_id = payload.get("sub")
+    jti = payload.get("jti")
     
-    if user_id is None:
+    if user_id is None or jti is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid refresh token"
         )
     
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    await limit_auth_by_account(f"user:{user_id}")
+    
+    if await revocations.is_revoked(db, jti):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token has been revoked"
+        )
+    
+    result = await db.execute(select(User).where(User.id == int(user_id)))
+    user = result.scalars().first()
     if not user or not user.is_active_bool:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found or inactive"
         )
     
+    # Concurrent refreshes with the same token race on the jti primary key
+    revocations.revoke(db, jti, user.id, payload["exp"])
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token has been revoked"
+        )
+    
     # Create new tokens
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -150,8 +227,23 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
 
 
 @router.post("/logout")
-async def logout():
-    """Logout user (client should discard tokens)."""
+async def logout(body: LogoutRequest, db: AsyncSession = Depends(get_async_db)):
+    """Logout user by revoking their refresh token (client should discard both tokens)."""
+    payload = verify_token(body.refresh_token, "refresh")
+    jti = payload.get("jti")
+    if jti is None or payload.get("sub") is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token"
+        )
+    
+    revocations.revoke(db, jti, int(payload["sub"]), payload["exp"])
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Already revoked
+        await db.rollback()
+    
     return {"message": "Successfully logged out"}
 
 
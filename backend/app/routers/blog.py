@@ -1,14 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
-from app.database import get_db
+from app.core.counts import set_total_count
+from app.core.etag import check_etag
+from app.core.fields import FIELDS_DESCRIPTION, parse_fields, render_fields, select_fields
+from app.core.pagination import paginate
+from app.core.response_cache import cached_response
+from app.core.search import blog_search
+from app.core.tags import filter_by_tag, set_post_tags, tag_counts_query
+from app.database import get_async_db, get_read_db
 from app.models.blog import BlogPost
 from app.models.user import User
 from app.schemas.blog import (
     BlogPost as BlogPostSchema,
     BlogPostCreate,
-    BlogPostUpdate
+    BlogPostUpdate,
+    BlogTagCount
 )
 from app.routers.auth import get_current_user
 
@@ -16,50 +26,92 @@ router = APIRouter()
 
 
 @router.get("/", response_model=List[BlogPostSchema])
+@cached_response("blog_posts")
 async def get_blog_posts(
+    response: Response,
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces skip"),
+    include_total: bool = Query(False, description="Return the number of matching items in X-Total-Count"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     category: Optional[str] = None,
     published_only: bool = True,
     search: Optional[str] = None,
-    db: Session = Depends(get_db)
+    tag: Optional[str] = Query(None, description="Only posts with this tag"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get list of blog posts with optional filtering."""
-    query = db.query(BlogPost)
+    selected = parse_fields(fields, BlogPostSchema)
+    
+    query = select(BlogPost)
     
     if published_only:
-        query = query.filter(BlogPost.published == "1")
+        query = query.where(BlogPost.published == "1")
     if category:
-        query = query.filter(BlogPost.category == category)
+        query = query.where(BlogPost.category == category)
+    if tag:
+        query = await filter_by_tag(db, query, tag)
+    relevance = None
     if search:
-        query = query.filter(
-            BlogPost.title.ilike(f"%{search}%") | 
-            BlogPost.content.ilike(f"%{search}%")
-        )
+        query, relevance = blog_search(db, query, search)
+    
+    if include_total:
+        await set_total_count(db, query, response)
     
-    blog_posts = query.order_by(BlogPost.created_at.desc()).offset(skip).limit(limit).all()
-    return blog_posts
+    if relevance is not None:
+        # Best matches first; relevance isn't a column, so these pages use skip
+        order_by = [relevance, BlogPost.id]
+        descending = False
+    else:
+        # Newest first; id breaks ties between posts created in the same instant
+        order_by = [BlogPost.created_at, BlogPost.id]
+        descending = True
+    query = select_fields(query, BlogPost, selected, order_by)
+    items = await paginate(db, query, order_by, response, skip, limit, cursor, descending, request=request)
+    return render_fields(items, BlogPostSchema, selected, response)
+
+
+@router.get("/tags", response_model=List[BlogTagCount])
+@cached_response("blog_posts")
+async def get_blog_tags(
+    request: Request,
+    limit: int = Query(50, ge=1, le=500),
+    published_only: bool = True,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get tags in use with the number of posts carrying each, most used first."""
+    result = await db.execute(tag_counts_query(published_only).limit(limit))
+    return ORJSONResponse([{"name": name, "count": count} for name, count in result.all()])
 
 
 @router.get("/{post_id}", response_model=BlogPostSchema)
+@cached_response("blog_posts")
 async def get_blog_post(
     post_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get blog post by ID."""
-    blog_post = db.query(BlogPost).filter(BlogPost.id == post_id).first()
+    selected = parse_fields(fields, BlogPostSchema)
+    query = select_fields(select(BlogPost).where(BlogPost.id == post_id), BlogPost, selected)
+    await check_etag(db, query, request, response)
+    result = await db.execute(query)
+    blog_post = result.scalars().first()
     if not blog_post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Blog post not found"
         )
-    return blog_post
+    return render_fields(blog_post, BlogPostSchema, selected, response)
 
 
 @router.post("/", response_model=BlogPostSchema)
 async def create_blog_post(
     blog_post_data: BlogPostCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new blog post."""
@@ -76,8 +128,10 @@ async def create_blog_post(
     )
     
     db.add(db_blog_post)
-    db.commit()
-    db.refresh(db_blog_post)
+    await db.flush()
+    await set_post_tags(db, db_blog_post.id, db_blog_post.tags)
+    await db.commit()
+    await db.refresh(db_blog_post)
     
     return db_blog_post
 
@@ -86,11 +140,12 @@ async def create_blog_post(
 async def update_blog_post(
     post_id: int,
     blog_post_update: BlogPostUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Update blog post."""
-    blog_post = db.query(BlogPost).filter(BlogPost.id == post_id).first()
+    result = await db.execute(select(BlogPost).where(BlogPost.id == post_id))
+    blog_post = result.scalars().first()
     if not blog_post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -108,20 +163,23 @@ async def update_blog_post(
     update_data = blog_post_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(blog_post, field, value)
+    if "tags" in update_data:
+        await set_post_tags(db, blog_post.id, blog_post.tags)
     
-    db.commit()
-    db.refresh(blog_post)
+    await db.commit()
+    await db.refresh(blog_post)
     return blog_post
 
 
 @router.delete("/{post_id}")
 async def delete_blog_post(
     post_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Delete blog post."""
-    blog_post = db.query(BlogPost).filter(BlogPost.id == post_id).first()
+    result = await db.execute(select(BlogPost).where(BlogPost.id == post_id))
+    blog_post = result.scalars().first()
     if not blog_post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -135,8 +193,9 @@ async def delete_blog_post(
             detail="Not enough permissions"
         )
     
-    db.delete(blog_post)
-    db.commit()
+    await set_post_tags(db, blog_post.id, None)
+    await db.delete(blog_post)
+    await db.commit()
     
     return {"message": "Blog post deleted successfully"}
 
@@ -144,11 +203,12 @@ async def delete_blog_post(
 @router.post("/{post_id}/like")
 async def like_blog_post(
     post_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Like a blog post."""
-    blog_post = db.query(BlogPost).filter(BlogPost.id == post_id).first()
+    result = await db.execute(select(BlogPost).where(BlogPost.id == post_id))
+    blog_post = result.scalars().first()
     if not blog_post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -156,7 +216,7 @@ async def like_blog_post(
         )
     
     blog_post.likes_count += 1
-    db.commit()
+    await db.commit()
     
     return {"message": "Blog post liked successfully", "likes_count": blog_post.likes_count}
 
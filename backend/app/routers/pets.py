@@ -1,8 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
-from app.database import get_db
+from app.core.counts import set_total_count
+from app.core.fields import FIELDS_DESCRIPTION, parse_fields, render_fields, select_fields
+from app.core.pagination import paginate
+from app.core.serialization import render
+from app.core.vocabulary import SPECIES_DESCRIPTION, assign_vocabulary, vocabulary_cache
+from app.database import get_async_db
 from app.models.pet import Pet, PetHealthRecord
 from app.models.user import User
 from app.schemas.pet import (
@@ -20,33 +26,46 @@ router = APIRouter()
 
 @router.get("/", response_model=List[PetSchema])
 async def get_pets(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces skip"),
+    include_total: bool = Query(False, description="Return the number of matching items in X-Total-Count"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     user_id: Optional[int] = None,
-    species: Optional[str] = None,
-    db: Session = Depends(get_db),
+    species: Optional[str] = Query(None, description=SPECIES_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get list of pets with optional filtering."""
-    query = db.query(Pet)
+    selected = parse_fields(fields, PetSchema)
+    
+    query = select(Pet)
     
     if user_id:
-        query = query.filter(Pet.user_id == user_id)
+        query = query.where(Pet.user_id == user_id)
     if species:
-        query = query.filter(Pet.species.ilike(f"%{species}%"))
+        vocabulary = await vocabulary_cache.get(db)
+        query = query.where(Pet.species_id.in_(vocabulary.species_ids(species)))
+    
+    if include_total:
+        await set_total_count(db, query, response)
     
-    pets = query.offset(skip).limit(limit).all()
-    return pets
+    order_by = [Pet.id]
+    query = select_fields(query, Pet, selected, order_by)
+    items = await paginate(db, query, order_by, response, skip, limit, cursor)
+    return render_fields(items, PetSchema, selected, response)
 
 
 @router.get("/{pet_id}", response_model=PetSchema)
 async def get_pet(
     pet_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get pet by ID."""
-    pet = db.query(Pet).filter(Pet.id == pet_id).first()
+    result = await db.execute(select(Pet).where(Pet.id == pet_id))
+    pet = result.scalars().first()
     if not pet:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -58,7 +77,7 @@ async def get_pet(
 @router.post("/", response_model=PetSchema)
 async def create_pet(
     pet_data: PetCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new pet."""
@@ -66,10 +85,11 @@ async def create_pet(
         user_id=current_user.id,
         **pet_data.dict()
     )
+    await assign_vocabulary(db, db_pet)
     
     db.add(db_pet)
-    db.commit()
-    db.refresh(db_pet)
+    await db.commit()
+    await db.refresh(db_pet)
     
     return db_pet
 
@@ -78,11 +98,12 @@ async def create_pet(
 async def update_pet(
     pet_id: int,
     pet_update: PetUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Update pet information."""
-    pet = db.query(Pet).filter(Pet.id == pet_id).first()
+    result = await db.execute(select(Pet).where(Pet.id == pet_id))
+    pet = result.scalars().first()
     if not pet:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -100,20 +121,23 @@ async def update_pet(
     update_data = pet_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(pet, field, value)
+    if "species" in update_data or "breed" in update_data:
+        await assign_vocabulary(db, pet)
     
-    db.commit()
-    db.refresh(pet)
+    await db.commit()
+    await db.refresh(pet)
     return pet
 
 
 @router.delete("/{pet_id}")
 async def delete_pet(
     pet_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Delete pet."""
-    pet = db.query(Pet).filter(Pet.id == pet_id).first()
+    result = await db.execute(select(Pet).where(Pet.id == pet_id))
+    pet = result.scalars().first()
     if not pet:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -127,8 +151,8 @@ async def delete_pet(
             detail="Not enough permissions"
         )
     
-    db.delete(pet)
-    db.commit()
+    await db.delete(pet)
+    await db.commit()
     
     return {"message": "Pet deleted successfully"}
 
@@ -137,11 +161,12 @@ async def delete_pet(
 @router.get("/{pet_id}/health-records", response_model=List[PetHealthRecordSchema])
 async def get_pet_health_records(
     pet_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get health records for a pet."""
-    pet = db.query(Pet).filter(Pet.id == pet_id).first()
+    result = await db.execute(select(Pet).where(Pet.id == pet_id))
+    pet = result.scalars().first()
     if not pet:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -155,19 +180,21 @@ async def get_pet_health_records(
             detail="Not enough permissions"
         )
     
-    health_records = db.query(PetHealthRecord).filter(PetHealthRecord.pet_id == pet_id).all()
-    return health_records
+    result = await db.execute(select(PetHealthRecord).where(PetHealthRecord.pet_id == pet_id))
+    health_records = result.scalars().all()
+    return render(list(health_records), PetHealthRecordSchema)
 
 
 @router.post("/{pet_id}/health-records", response_model=PetHealthRecordSchema)
 async def create_pet_health_record(
     pet_id: int,
     health_record_data: PetHealthRecordCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new health record for a pet."""
-    pet = db.query(Pet).filter(Pet.id == pet_id).first()
+    result = await db.execute(select(Pet).where(Pet.id == pet_id))
+    pet = result.scalars().first()
     if not pet:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -188,8 +215,8 @@ async def create_pet_health_record(
     )
     
     db.add(db_health_record)
-    db.commit()
-    db.refresh(db_health_record)
+    await db.commit()
+    await db.refresh(db_health_record)
     
     return db_health_record
 
@@ -1,8 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
-from app.database import get_db
+from app.core.counts import set_total_count
+from app.core.etag import check_etag
+from app.core.fields import FIELDS_DESCRIPTION, parse_fields, render_fields, select_fields
+from app.core.pagination import paginate
+from app.core.response_cache import cached_response
+from app.core.search import product_search
+from app.database import get_async_db, get_read_db
 from app.models.product import Product
 from app.models.user import User
 from app.schemas.product import (
@@ -16,53 +23,79 @@ router = APIRouter()
 
 
 @router.get("/", response_model=List[ProductSchema])
+@cached_response("products")
 async def get_products(
+    response: Response,
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces skip"),
+    include_total: bool = Query(False, description="Return the number of matching items in X-Total-Count"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     category: Optional[str] = None,
     search: Optional[str] = None,
     min_price: Optional[float] = None,
     max_price: Optional[float] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get list of products with optional filtering."""
-    query = db.query(Product)
+    selected = parse_fields(fields, ProductSchema)
+    
+    query = select(Product)
     
     if category:
-        query = query.filter(Product.category == category)
+        query = query.where(Product.category == category)
+    relevance = None
     if search:
-        query = query.filter(
-            Product.name.ilike(f"%{search}%") | 
-            Product.description.ilike(f"%{search}%")
-        )
+        query, relevance = product_search(db, query, search)
     if min_price is not None:
-        query = query.filter(Product.price >= min_price)
+        query = query.where(Product.price >= min_price)
     if max_price is not None:
-        query = query.filter(Product.price <= max_price)
+        query = query.where(Product.price <= max_price)
     
-    products = query.offset(skip).limit(limit).all()
-    return products
+    if include_total:
+        await set_total_count(db, query, response)
+    
+    if relevance is not None:
+        # Best matches first; relevance isn't a column, so these pages use skip
+        order_by = [relevance, Product.id]
+    # A price range is served by the price indexes, so page through it in price order
+    elif min_price is not None or max_price is not None:
+        order_by = [Product.price, Product.id]
+    else:
+        order_by = [Product.id]
+    query = select_fields(query, Product, selected, order_by)
+    items = await paginate(db, query, order_by, response, skip, limit, cursor, request=request)
+    return render_fields(items, ProductSchema, selected, response)
 
 
 @router.get("/{product_id}", response_model=ProductSchema)
+@cached_response("products")
 async def get_product(
     product_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get product by ID."""
-    product = db.query(Product).filter(Product.id == product_id).first()
+    selected = parse_fields(fields, ProductSchema)
+    query = select_fields(select(Product).where(Product.id == product_id), Product, selected)
+    await check_etag(db, query, request, response)
+    result = await db.execute(query)
+    product = result.scalars().first()
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found"
         )
-    return product
+    return render_fields(product, ProductSchema, selected, response)
 
 
 @router.post("/", response_model=ProductSchema)
 async def create_product(
     product_data: ProductCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new product (admin only)."""
@@ -75,8 +108,8 @@ async def create_product(
     db_product = Product(**product_data.dict())
     
     db.add(db_product)
-    db.commit()
-    db.refresh(db_product)
+    await db.commit()
+    await db.refresh(db_product)
     
     return db_product
 
@@ -85,7 +118,7 @@ async def create_product(
 async def update_product(
     product_id: int,
     product_update: ProductUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Update product (admin only)."""
@@ -95,7 +128,8 @@ async def update_product(
             detail="Only admins can update products"
         )
     
-    product = db.query(Product).filter(Product.id == product_id).first()
+    result = await db.execute(select(Product).where(Product.id == product_id))
+    product = result.scalars().first()
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -107,15 +141,15 @@ async def update_product(
     for field, value in update_data.items():
         setattr(product, field, value)
     
-    db.commit()
-    db.refresh(product)
+    await db.commit()
+    await db.refresh(product)
     return product
 
 
 @router.delete("/{product_id}")
 async def delete_product(
     product_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Delete product (admin only)."""
@@ -125,15 +159,16 @@ async def delete_product(
             detail="Only admins can delete products"
         )
     
-    product = db.query(Product).filter(Product.id == product_id).first()
+    result = await db.execute(select(Product).where(Product.id == product_id))
+    product = result.scalars().first()
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found"
         )
     
-    db.delete(product)
-    db.commit()
+    await db.delete(product)
+    await db.commit()
     
     return {"message": "Product deleted successfully"}
 
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
+from typing import List, Optional
+
+from app.core.autocomplete import KINDS, completions
+from app.schemas.search import Completion
+
+router = APIRouter()
+
+
+@router.get("/autocomplete", response_model=List[Completion])
+async def autocomplete(
+    q: str = Query(..., min_length=1, max_length=100, description="Prefix of a word in the value"),
+    kind: Optional[str] = Query(None, description="Only complete product, brand or breed"),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """Suggest product names, brands and breeds with a word starting with q."""
+    if kind is not None and kind not in KINDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown kind: {kind}"
+        )
+    q = q.strip()
+    if not q:
+        # Every key starts with the empty prefix
+        return ORJSONResponse([])
+    await completions.ensure_loaded()
+    return ORJSONResponse(completions.complete(q, kind, limit))
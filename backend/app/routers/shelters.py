@@ -1,9 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from typing import List, Optional
 
-from app.database import get_db
-from app.models.shelter import ShelterPet, AdoptionRequest
+from app.core.counts import set_total_count
+from app.core.etag import check_etag
+from app.core.facets import AGE_GROUP_DESCRIPTION, facet_index, facet_matchers, parse_age_group
+from app.core.fields import FIELDS_DESCRIPTION, parse_fields, render_fields, select_fields
+from app.core.pagination import paginate
+from app.core.response_cache import cached_response
+from app.core.vocabulary import BREED_DESCRIPTION, SPECIES_DESCRIPTION, assign_vocabulary, vocabulary_cache
+from app.database import get_async_db, get_read_db
+from app.models.shelter import ShelterPet, AdoptionRequest, PetGender
 from app.models.user import User
 from app.schemas.shelter import (
     ShelterPet as ShelterPetSchema,
@@ -11,7 +21,8 @@ from app.schemas.shelter import (
     ShelterPetUpdate,
     AdoptionRequest as AdoptionRequestSchema,
     AdoptionRequestCreate,
-    AdoptionRequestUpdate
+    AdoptionRequestUpdate,
+    ShelterPetFacets
 )
 from app.routers.auth import get_current_user
 
@@ -19,47 +30,112 @@ router = APIRouter()
 
 
 @router.get("/pets", response_model=List[ShelterPetSchema])
+@cached_response("shelter_pets")
 async def get_shelter_pets(
+    response: Response,
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces skip"),
+    include_total: bool = Query(False, description="Return the number of matching items in X-Total-Count"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     shelter_id: Optional[int] = None,
-    species: Optional[str] = None,
+    species: Optional[str] = Query(None, description=SPECIES_DESCRIPTION),
+    breed: Optional[str] = Query(None, description=BREED_DESCRIPTION),
+    gender: Optional[PetGender] = None,
+    age_group: Optional[str] = Query(None, description=AGE_GROUP_DESCRIPTION),
     adoption_status: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get list of shelter pets with optional filtering."""
-    query = db.query(ShelterPet)
+    selected = parse_fields(fields, ShelterPetSchema)
+    
+    query = select(ShelterPet)
     
     if shelter_id:
-        query = query.filter(ShelterPet.shelter_id == shelter_id)
-    if species:
-        query = query.filter(ShelterPet.species.ilike(f"%{species}%"))
+        query = query.where(ShelterPet.shelter_id == shelter_id)
+    if species or breed:
+        vocabulary = await vocabulary_cache.get(db)
+        species_ids, breed_ids = vocabulary.match(species, breed)
+        if species_ids is not None:
+            query = query.where(ShelterPet.species_id.in_(species_ids))
+        if breed_ids is not None:
+            query = query.where(ShelterPet.breed_id.in_(breed_ids))
+    if gender:
+        query = query.where(ShelterPet.gender == gender)
+    if age_group:
+        query = query.where(parse_age_group(age_group))
     if adoption_status:
-        query = query.filter(ShelterPet.adoption_status == adoption_status)
+        query = query.where(ShelterPet.adoption_status == adoption_status)
+    
+    if include_total:
+        await set_total_count(db, query, response)
     
-    shelter_pets = query.offset(skip).limit(limit).all()
-    return shelter_pets
+    order_by = [ShelterPet.id]
+    query = select_fields(query, ShelterPet, selected, order_by)
+    items = await paginate(db, query, order_by, response, skip, limit, cursor, request=request)
+    return render_fields(items, ShelterPetSchema, selected, response)
+
+
+@router.get("/pets/facets", response_model=ShelterPetFacets)
+@cached_response("shelter_pets")
+async def get_shelter_pet_facets(
+    request: Request,
+    shelter_id: Optional[int] = None,
+    species: Optional[str] = Query(None, description=SPECIES_DESCRIPTION),
+    breed: Optional[str] = Query(None, description=BREED_DESCRIPTION),
+    gender: Optional[PetGender] = None,
+    age_group: Optional[str] = Query(None, description=AGE_GROUP_DESCRIPTION),
+    adoption_status: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Count shelter pets per species, breed, gender, age group and shelter.
+
+    Takes the list endpoint's filters; each facet is counted with all of
+    them applied except its own.
+    """
+    if age_group:
+        parse_age_group(age_group)
+    species_names = breed_names = None
+    if species or breed:
+        vocabulary = await vocabulary_cache.get(db)
+        species_ids, breed_ids = vocabulary.match(species, breed)
+        if species_ids is not None:
+            species_names = {vocabulary.species_names[species_id] for species_id in species_ids}
+        if breed_ids is not None:
+            breed_names = {vocabulary.breed_names[breed_id] for breed_id in breed_ids}
+    matchers = facet_matchers(species_names, breed_names, gender, age_group, shelter_id)
+    index = await facet_index.get(db)
+    return ORJSONResponse(index.count(adoption_status, matchers))
 
 
 @router.get("/pets/{pet_id}", response_model=ShelterPetSchema)
+@cached_response("shelter_pets")
 async def get_shelter_pet(
     pet_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get shelter pet by ID."""
-    shelter_pet = db.query(ShelterPet).filter(ShelterPet.id == pet_id).first()
+    selected = parse_fields(fields, ShelterPetSchema)
+    query = select_fields(select(ShelterPet).where(ShelterPet.id == pet_id), ShelterPet, selected)
+    await check_etag(db, query, request, response)
+    result = await db.execute(query)
+    shelter_pet = result.scalars().first()
     if not shelter_pet:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Shelter pet not found"
         )
-    return shelter_pet
+    return render_fields(shelter_pet, ShelterPetSchema, selected, response)
 
 
 @router.post("/pets", response_model=ShelterPetSchema)
 async def create_shelter_pet(
     pet_data: ShelterPetCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new shelter pet (shelter admin only)."""
@@ -73,10 +149,11 @@ async def create_shelter_pet(
         shelter_id=current_user.id,
         **pet_data.dict()
     )
+    await assign_vocabulary(db, db_shelter_pet)
     
     db.add(db_shelter_pet)
-    db.commit()
-    db.refresh(db_shelter_pet)
+    await db.commit()
+    await db.refresh(db_shelter_pet)
     
     return db_shelter_pet
 
@@ -85,11 +162,12 @@ async def create_shelter_pet(
 async def update_shelter_pet(
     pet_id: int,
     pet_update: ShelterPetUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Update shelter pet."""
-    shelter_pet = db.query(ShelterPet).filter(ShelterPet.id == pet_id).first()
+    result = await db.execute(select(ShelterPet).where(ShelterPet.id == pet_id))
+    shelter_pet = result.scalars().first()
     if not shelter_pet:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -107,20 +185,23 @@ async def update_shelter_pet(
     update_data = pet_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(shelter_pet, field, value)
+    if "species" in update_data or "breed" in update_data:
+        await assign_vocabulary(db, shelter_pet)
     
-    db.commit()
-    db.refresh(shelter_pet)
+    await db.commit()
+    await db.refresh(shelter_pet)
     return shelter_pet
 
 
 @router.delete("/pets/{pet_id}")
 async def delete_shelter_pet(
     pet_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Delete shelter pet."""
-    shelter_pet = db.query(ShelterPet).filter(ShelterPet.id == pet_id).first()
+    result = await db.execute(select(ShelterPet).where(ShelterPet.id == pet_id))
+    shelter_pet = result.scalars().first()
     if not shelter_pet:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -134,8 +215,8 @@ async def delete_shelter_pet(
             detail="Not enough permissions"
         )
     
-    db.delete(shelter_pet)
-    db.commit()
+    await db.delete(shelter_pet)
+    await db.commit()
     
     return {"message": "Shelter pet deleted successfully"}
 
@@ -143,48 +224,68 @@ async def delete_shelter_pet(
 # Adoption Requests endpoints
 @router.get("/adoption-requests", response_model=List[AdoptionRequestSchema])
 async def get_adoption_requests(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces skip"),
+    include_total: bool = Query(False, description="Return the number of matching items in X-Total-Count"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     requester_id: Optional[int] = None,
     shelter_id: Optional[int] = None,
     status: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get list of adoption requests with optional filtering."""
-    query = db.query(AdoptionRequest)
+    selected = parse_fields(fields, AdoptionRequestSchema)
+    
+    query = select(AdoptionRequest)
     
     # Filter based on user role
     if current_user.role == "pet_owner":
         # Pet owners can only see their own requests
-        query = query.filter(AdoptionRequest.requester_id == current_user.id)
+        query = query.where(AdoptionRequest.requester_id == current_user.id)
     elif current_user.role == "shelter_admin":
         # Shelter admins can see requests for their pets
-        query = query.join(AdoptionRequest.shelter_pet).filter(
-            ShelterPet.shelter_id == current_user.id
-        )
+        query = query.where(AdoptionRequest.shelter_pet_id.in_(
+            select(ShelterPet.id).where(ShelterPet.shelter_id == current_user.id)
+        ))
     
     if requester_id:
-        query = query.filter(AdoptionRequest.requester_id == requester_id)
+        query = query.where(AdoptionRequest.requester_id == requester_id)
     if shelter_id:
-        query = query.join(AdoptionRequest.shelter_pet).filter(
-            ShelterPet.shelter_id == shelter_id
-        )
+        query = query.where(AdoptionRequest.shelter_pet_id.in_(
+            select(ShelterPet.id).where(ShelterPet.shelter_id == shelter_id)
+        ))
     if status:
-        query = query.filter(AdoptionRequest.status == status)
+        query = query.where(AdoptionRequest.status == status)
     
-    adoption_requests = query.offset(skip).limit(limit).all()
-    return adoption_requests
+    if include_total:
+        await set_total_count(db, query, response)
+    
+    # Requests reached through a shelter's pets are walked pet by pet
+    if current_user.role == "shelter_admin" or shelter_id:
+        order_by = [AdoptionRequest.shelter_pet_id, AdoptionRequest.id]
+    else:
+        order_by = [AdoptionRequest.id]
+    query = select_fields(query, AdoptionRequest, selected, order_by)
+    items = await paginate(db, query, order_by, response, skip, limit, cursor)
+    return render_fields(items, AdoptionRequestSchema, selected, response)
 
 
 @router.get("/adoption-requests/{request_id}", response_model=AdoptionRequestSchema)
 async def get_adoption_request(
     request_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get adoption request by ID."""
-    adoption_request = db.query(AdoptionRequest).filter(AdoptionRequest.id == request_id).first()
+    result = await db.execute(
+        select(AdoptionRequest)
+        .options(selectinload(AdoptionRequest.shelter_pet))
+        .where(AdoptionRequest.id == request_id)
+    )
+    adoption_request = result.scalars().first()
     if not adoption_request:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -211,12 +312,13 @@ async def get_adoption_request(
 @router.post("/adoption-requests", response_model=AdoptionRequestSchema)
 async def create_adoption_request(
     request_data: AdoptionRequestCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new adoption request."""
     # Check if the shelter pet exists
-    shelter_pet = db.query(ShelterPet).filter(ShelterPet.id == request_data.shelter_pet_id).first()
+    result = await db.execute(select(ShelterPet).where(ShelterPet.id == request_data.shelter_pet_id))
+    shelter_pet = result.scalars().first()
     if not shelter_pet:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -236,8 +338,8 @@ async def create_adoption_request(
     )
     
     db.add(db_adoption_request)
-    db.commit()
-    db.refresh(db_adoption_request)
+    await db.commit()
+    await db.refresh(db_adoption_request)
     
     return db_adoption_request
 
@@ -246,11 +348,16 @@ async def create_adoption_request(
 async def update_adoption_request(
     request_id: int,
     request_update: AdoptionRequestUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Update adoption request."""
-    adoption_request = db.query(AdoptionRequest).filter(AdoptionRequest.id == request_id).first()
+    result = await db.execute(
+        select(AdoptionRequest)
+        .options(selectinload(AdoptionRequest.shelter_pet))
+        .where(AdoptionRequest.id == request_id)
+    )
+    adoption_request = result.scalars().first()
     if not adoption_request:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -279,8 +386,8 @@ async def update_adoption_request(
     if request_update.status == "approved":
         adoption_request.shelter_pet.adoption_status = "adopted"
     
-    db.commit()
-    db.refresh(adoption_request)
+    await db.commit()
+    await db.refresh(adoption_request)
     return adoption_request
 
 
@@ -42,4 +42,6 @@ class BlogPost(BlogPostInDB):
     pass
 
 
-
+class BlogTagCount(BaseModel):
+    name: str
+    count: int
@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+class Completion(BaseModel):
+    kind: str
+    value: str
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional, Union
 from datetime import datetime
 from app.models.shelter import PetGender, AdoptionStatus, RequestStatus
 
@@ -46,6 +46,20 @@ class ShelterPet(ShelterPetInDB):
     pass
 
 
+class FacetCount(BaseModel):
+    value: Union[str, int]
+    count: int
+
+
+class ShelterPetFacets(BaseModel):
+    total: int
+    species: List[FacetCount]
+    breed: List[FacetCount]
+    gender: List[FacetCount]
+    age_group: List[FacetCount]
+    shelter_id: List[FacetCount]
+
+
 class AdoptionRequestBase(BaseModel):
     request_date: datetime
     notes: Optional[str] = None
@@ -47,5 +47,9 @@ class Token(BaseModel):
     token_type: str = "bearer"
 
 
+class LogoutRequest(BaseModel):
+    refresh_token: str
+
+
 class TokenData(BaseModel):
     user_id: Optional[int] = None
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Latency of deep pages on GET /api/v1/products/ with skip (OFFSET) vs cursor.
+
+Seeds a throwaway SQLite database with --rows products and requests the
+page at each depth both ways through the ASGI app in-process.
+
+Usage:
+    python benchmarks/bench_deep_pagination.py [--rows 200000] [--repeat 20]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+DB_PATH = Path(tempfile.gettempdir()) / "pawfect_bench_pagination.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+import httpx  # noqa: E402
+
+PAGE_SIZE = 20
+DEPTHS = [1, 100, 500, 2000, 5000]
+
+
+def seed_database(rows: int):
+    from sqlalchemy import insert, text
+
+    from app.database import Base, engine
+    from app.models import user, pet, appointment, product, blog, shelter  # noqa: F401
+    from app.models.product import Product, ProductCategory
+
+    if DB_PATH.exists():
+        DB_PATH.unlink()
+    Base.metadata.create_all(bind=engine)
+    categories = list(ProductCategory)
+    with engine.begin() as connection:
+        connection.execute(insert(Product), [{
+            "name": f"Product {i}",
+            "price": float(i % 100),
+            "category": categories[i % len(categories)],
+            "stock": 10,
+        } for i in range(rows)])
+        connection.execute(text("ANALYZE"))
+
+
+async def time_page(client, url, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = await client.get(url)
+        samples.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+    return statistics.median(samples)
+
+
+async def run(rows, repeat):
+    from app.core.pagination import encode_cursor
+    from app.database import async_engine
+    from app.main import app
+
+    max_page = rows // PAGE_SIZE - 1
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://localhost"
+    ) as client:
+        print(f"{'page':>6} {'skip (ms)':>10} {'cursor (ms)':>12}")
+        for page in DEPTHS:
+            if page > max_page:
+                break
+            offset = (page - 1) * PAGE_SIZE
+            skip_ms = await time_page(client, f"/api/v1/products/?limit={PAGE_SIZE}&skip={offset}", repeat)
+            # Product ids are 1..rows, so the row before the page has id == offset
+            cursor = encode_cursor([offset]) if offset else ""
+            cursor_ms = await time_page(
+                client, f"/api/v1/products/?limit={PAGE_SIZE}&cursor={cursor}", repeat
+            )
+            print(f"{page:>6} {skip_ms:>10.2f} {cursor_ms:>12.2f}")
+    await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    seed_database(args.rows)
+    asyncio.run(run(args.rows, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Serialization cost of a 100-item page of products and appointments.
+
+Compares FastAPI's response_model path (validate, jsonable_encoder, stdlib
+json) with the two paths of ``app.core.serialization.render``: one
+validate-and-dump pass in pydantic-core, and direct row-to-JSON encoding
+with orjson, on the same in-memory ORM rows. No database or
+server is involved; only the step from ORM rows to response body is timed.
+
+Usage:
+    python benchmarks/bench_json_responses.py [--items 100] [--repeat 500]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+def make_products(count: int):
+    from app.models.product import Product, ProductCategory
+
+    categories = list(ProductCategory)
+    now = datetime.utcnow()
+    return [Product(
+        id=i,
+        name=f"Product {i}",
+        description="Grain-free salmon recipe for adult cats. " * 4,
+        price=9.99 + i,
+        rating=4.5,
+        image_urls=[f"https://cdn.example.com/products/{i}/{n}.jpg" for n in range(3)],
+        category=categories[i % len(categories)],
+        stock=10,
+        brand="Pawfect",
+        weight=1.5,
+        external_url=f"https://shop.example.com/p/{i}",
+        created_at=now,
+        updated_at=now,
+    ) for i in range(1, count + 1)]
+
+
+def make_appointments(count: int):
+    from app.models.appointment import Appointment, AppointmentStatus
+
+    now = datetime.utcnow()
+    return [Appointment(
+        id=i,
+        pet_id=i,
+        veterinarian_id=1,
+        shelter_id=None,
+        appointment_date=now + timedelta(days=i),
+        appointment_time="10:00",
+        status=AppointmentStatus.SCHEDULED,
+        reason="Annual check-up",
+        notes="Bring vaccination card",
+        created_at=now,
+        updated_at=None,
+    ) for i in range(1, count + 1)]
+
+
+def time_it(render, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run(items: int, repeat: int):
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_response_field
+
+    from app.core.serialization import json_response, row_encoder, schema_adapter
+    from app.schemas.appointment import Appointment as AppointmentSchema
+    from app.schemas.product import Product as ProductSchema
+
+    cases = [
+        ("products", ProductSchema, make_products(items)),
+        ("appointments", AppointmentSchema, make_appointments(items)),
+    ]
+    loop = asyncio.new_event_loop()
+    print(f"{'page':>14} {'response_model (ms)':>20} {'validated (ms)':>15} {'direct (ms)':>12}")
+    for name, schema, rows in cases:
+        field = create_response_field(name=f"Response_{name}", type_=List[schema], mode="serialization")
+        adapter = schema_adapter(schema, many=True)
+        encoder = row_encoder(schema, type(rows[0]))
+
+        def default_path():
+            content = loop.run_until_complete(serialize_response(field=field, response_content=rows))
+            return JSONResponse(content).body
+
+        def validated_path():
+            return json_response(adapter.dump_json(adapter.validate_python(rows, from_attributes=True))).body
+
+        def direct_path():
+            return json_response(encoder(rows)).body
+
+        # Same document every way
+        expected = json.loads(default_path())
+        assert json.loads(validated_path()) == expected == json.loads(direct_path())
+        default_ms = time_it(default_path, repeat)
+        validated_ms = time_it(validated_path, repeat)
+        direct_ms = time_it(direct_path, repeat)
+        print(f"{name:>14} {default_ms:>20.3f} {validated_ms:>15.3f} {direct_ms:>12.3f}")
+    loop.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    from app.models import user, pet, appointment, product, blog, shelter  # noqa: F401
+    run(args.items, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the pets and appointments list endpoints.
+
+Seeds a throwaway SQLite database, starts uvicorn with a single worker
+against it and fires concurrent authenticated requests at
+``GET /api/v1/pets/`` and ``GET /api/v1/appointments/``.
+
+Usage:
+    python benchmarks/bench_list_endpoints.py [--requests 2000] [--concurrency 50]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+DB_PATH = Path(tempfile.gettempdir()) / "pawfect_bench_list.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+import httpx  # noqa: E402
+
+PORT = 8765
+BASE_URL = f"http://127.0.0.1:{PORT}"
+
+
+def seed_database(num_owners: int = 50, pets_per_owner: int = 20):
+    """Create tables and fill them with synthetic owners, pets and appointments."""
+    from app.database import Base, SessionLocal, engine
+    from app.models import user, pet, appointment, product, blog, shelter  # noqa: F401
+    from app.models.user import User, UserRole
+    from app.models.pet import Pet, PetGender
+    from app.models.appointment import Appointment
+
+    if DB_PATH.exists():
+        DB_PATH.unlink()
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    vet = User(name="Vet", email="vet@bench.local", role=UserRole.VETERINARIAN, hashed_password="x")
+    db.add(vet)
+    owners = [
+        User(name=f"Owner {i}", email=f"owner{i}@bench.local", role=UserRole.PET_OWNER, hashed_password="x")
+        for i in range(num_owners)
+    ]
+    db.add_all(owners)
+    db.flush()
+
+    now = datetime.utcnow()
+    for owner in owners:
+        for j in range(pets_per_owner):
+            pet = Pet(
+                user_id=owner.id,
+                name=f"Pet {owner.id}-{j}",
+                species=random.choice(["dog", "cat", "bird"]),
+                age=random.randint(0, 15),
+                gender=PetGender.OTHER,
+            )
+            db.add(pet)
+            db.flush()
+            db.add(Appointment(
+                pet_id=pet.id,
+                veterinarian_id=vet.id,
+                appointment_date=now + timedelta(days=j),
+                appointment_time="10:00",
+            ))
+    db.commit()
+    owner_id = owners[0].id
+    vet_id = vet.id
+    db.close()
+    return owner_id, vet_id
+
+
+def make_token(user_id: int) -> str:
+    from app.auth import create_access_token
+    return create_access_token({"sub": str(user_id)}, expires_delta=timedelta(hours=1))
+
+
+async def hammer(path: str, token: str, total: int, concurrency: int) -> float:
+    """Issue ``total`` GET requests with ``concurrency`` in flight; return req/s."""
+    headers = {"Authorization": f"Bearer {token}"}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    remaining = total
+
+    async with httpx.AsyncClient(base_url=BASE_URL, headers=headers, limits=limits, timeout=60) as client:
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                response = await client.get(path)
+                response.raise_for_status()
+
+        # Warm up connections and caches
+        await client.get(path)
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - start)
+
+
+def wait_for_server(timeout: float = 15.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            httpx.get(f"{BASE_URL}/health", timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError("Server did not start in time")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    owner_id, vet_id = seed_database()
+    owner_token = make_token(owner_id)
+    vet_token = make_token(vet_id)
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(PORT),
+         "--workers", "1", "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=os.environ.copy(),
+    )
+    try:
+        wait_for_server()
+        cases = [
+            ("pets (owner)", "/api/v1/pets/?limit=50", owner_token),
+            ("appointments (owner)", "/api/v1/appointments/?limit=20", owner_token),
+            ("appointments (vet)", "/api/v1/appointments/?limit=50", vet_token),
+        ]
+        print(f"{args.requests} requests, concurrency {args.concurrency}")
+        for label, path, token in cases:
+            rps = asyncio.run(hammer(path, token, args.requests, args.concurrency))
+            print(f"  {label:<24} {rps:8.1f} req/s")
+    finally:
+        server.terminate()
+        server.wait()
+        if DB_PATH.exists():
+            DB_PATH.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Mixed read/write throughput on SQLite with and without the production profile.
+
+Reader threads page through ``pets`` while writer threads insert pets, each
+on its own pooled connection, for a fixed duration. The run is repeated with
+the default rollback journal and with the WAL profile from
+``app.core.sqlite_profile``.
+
+Usage:
+    python benchmarks/bench_sqlite_profile.py [--readers 8] [--writers 2] [--seconds 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+DB_PATH = Path(tempfile.gettempdir()) / "pawfect_bench_sqlite.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from app.database import Base  # noqa: E402
+from app.core.sqlite_profile import install_sqlite_profile  # noqa: E402
+from app.models import user, pet, appointment, product, blog, shelter  # noqa: E402,F401
+from app.models.pet import Pet  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+
+def reset_database(num_pets: int):
+    for suffix in ("", "-wal", "-shm"):
+        path = Path(f"{DB_PATH}{suffix}")
+        if path.exists():
+            path.unlink()
+    engine = create_engine(f"sqlite:///{DB_PATH}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(insert(User), [{"name": "Owner", "email": "owner@bench.local", "hashed_password": "x"}])
+        connection.execute(insert(Pet), [
+            {"user_id": 1, "name": f"Pet {i}", "species": random.choice(["dog", "cat"]), "age": i % 15}
+            for i in range(num_pets)
+        ])
+    engine.dispose()
+
+
+def run_workload(profile: bool, readers: int, writers: int, seconds: float):
+    engine = create_engine(
+        f"sqlite:///{DB_PATH}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+        pool_size=readers + writers,
+    )
+    if profile:
+        install_sqlite_profile(engine)
+
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+    stop = time.perf_counter() + seconds
+
+    def reader():
+        done = 0
+        while time.perf_counter() < stop:
+            offset = random.randint(0, 9000)
+            try:
+                with engine.connect() as connection:
+                    connection.execute(select(Pet).where(Pet.user_id == 1).offset(offset).limit(20)).all()
+                done += 1
+            except OperationalError:
+                with lock:
+                    counts["errors"] += 1
+        with lock:
+            counts["reads"] += done
+
+    def writer():
+        done = 0
+        while time.perf_counter() < stop:
+            try:
+                with engine.begin() as connection:
+                    connection.execute(insert(Pet).values(user_id=1, name="New", species="dog", age=1))
+                done += 1
+            except OperationalError:
+                with lock:
+                    counts["errors"] += 1
+        with lock:
+            counts["writes"] += done
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    return {key: value / seconds if key != "errors" else value for key, value in counts.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--pets", type=int, default=10000)
+    args = parser.parse_args()
+
+    print(f"{args.readers} readers, {args.writers} writers, {args.seconds:.0f}s per run")
+    for label, profile in (("default", False), ("production profile", True)):
+        reset_database(args.pets)
+        result = run_workload(profile, args.readers, args.writers, args.seconds)
+        print(
+            f"  {label:<20} reads {result['reads']:9.1f}/s  "
+            f"writes {result['writes']:8.1f}/s  errors {result['errors']}"
+        )
+
+    for suffix in ("", "-wal", "-shm"):
+        path = Path(f"{DB_PATH}{suffix}")
+        if path.exists():
+            path.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""initial schema
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 09:33:03.939229
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('products',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('description', sa.String(length=2000), nullable=True),
+    sa.Column('price', sa.Float(), nullable=False),
+    sa.Column('rating', sa.Float(), nullable=True),
+    sa.Column('image_urls', sa.JSON(), nullable=True),
+    sa.Column('category', sa.Enum('FOOD', 'GROOMING', 'TOYS', 'HEALTH', 'ACCESSORIES', 'OTHER', name='productcategory'), nullable=False),
+    sa.Column('stock', sa.Integer(), nullable=True),
+    sa.Column('brand', sa.String(length=100), nullable=True),
+    sa.Column('weight', sa.Float(), nullable=True),
+    sa.Column('external_url', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_products_id'), ['id'], unique=False)
+
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('phone', sa.String(length=20), nullable=True),
+    sa.Column('role', sa.Enum('PET_OWNER', 'VETERINARIAN', 'SHELTER_ADMIN', name='userrole'), nullable=False),
+    sa.Column('hashed_password', sa.String(length=255), nullable=False),
+    sa.Column('is_active', sa.String(length=1), nullable=True),
+    sa.Column('is_verified', sa.String(length=1), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_users_email'), ['email'], unique=True)
+        batch_op.create_index(batch_op.f('ix_users_id'), ['id'], unique=False)
+
+    op.create_table('blog_posts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('author_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('content', sa.String(length=10000), nullable=False),
+    sa.Column('category', sa.Enum('HEALTH', 'NUTRITION', 'TRAINING', 'GROOMING', 'BEHAVIOR', 'GENERAL', name='blogcategory'), nullable=False),
+    sa.Column('tags', sa.String(length=500), nullable=True),
+    sa.Column('image_url', sa.String(length=500), nullable=True),
+    sa.Column('published', sa.String(length=1), nullable=True),
+    sa.Column('likes_count', sa.Integer(), nullable=True),
+    sa.Column('comments_count', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['author_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('blog_posts', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_blog_posts_id'), ['id'], unique=False)
+
+    op.create_table('pets',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('species', sa.String(length=50), nullable=False),
+    sa.Column('breed', sa.String(length=100), nullable=True),
+    sa.Column('age', sa.Integer(), nullable=False),
+    sa.Column('gender', sa.Enum('MALE', 'FEMALE', 'OTHER', name='petgender'), nullable=False),
+    sa.Column('photo', sa.String(length=500), nullable=True),
+    sa.Column('description', sa.String(length=1000), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('pets', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_pets_id'), ['id'], unique=False)
+
+    op.create_table('shelter_pets',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('shelter_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('species', sa.String(length=50), nullable=False),
+    sa.Column('breed', sa.String(length=100), nullable=True),
+    sa.Column('age', sa.Integer(), nullable=False),
+    sa.Column('gender', sa.Enum('MALE', 'FEMALE', 'OTHER', name='petgender'), nullable=False),
+    sa.Column('photo', sa.String(length=500), nullable=True),
+    sa.Column('description', sa.String(length=1000), nullable=True),
+    sa.Column('health_status', sa.String(length=200), nullable=True),
+    sa.Column('adoption_status', sa.Enum('AVAILABLE', 'PENDING', 'ADOPTED', name='adoptionstatus'), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['shelter_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('shelter_pets', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_shelter_pets_id'), ['id'], unique=False)
+
+    op.create_table('adoption_requests',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('shelter_pet_id', sa.Integer(), nullable=False),
+    sa.Column('requester_id', sa.Integer(), nullable=False),
+    sa.Column('request_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'APPROVED', 'REJECTED', name='requeststatus'), nullable=False),
+    sa.Column('notes', sa.String(length=1000), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['requester_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['shelter_pet_id'], ['shelter_pets.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('adoption_requests', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_adoption_requests_id'), ['id'], unique=False)
+
+    op.create_table('appointments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('pet_id', sa.Integer(), nullable=False),
+    sa.Column('veterinarian_id', sa.Integer(), nullable=True),
+    sa.Column('shelter_id', sa.Integer(), nullable=True),
+    sa.Column('appointment_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('appointment_time', sa.String(length=10), nullable=False),
+    sa.Column('status', sa.Enum('SCHEDULED', 'CONFIRMED', 'COMPLETED', 'CANCELLED', 'RESCHEDULED', name='appointmentstatus'), nullable=False),
+    sa.Column('reason', sa.String(length=500), nullable=True),
+    sa.Column('notes', sa.String(length=1000), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['pet_id'], ['pets.id'], ),
+    sa.ForeignKeyConstraint(['shelter_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['veterinarian_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_appointments_id'), ['id'], unique=False)
+
+    op.create_table('pet_health_records',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('pet_id', sa.Integer(), nullable=False),
+    sa.Column('veterinarian_id', sa.Integer(), nullable=True),
+    sa.Column('visit_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('diagnosis', sa.String(length=500), nullable=True),
+    sa.Column('prescription', sa.String(length=1000), nullable=True),
+    sa.Column('treatment_notes', sa.String(length=2000), nullable=True),
+    sa.Column('next_due_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('record_type', sa.Enum('VACCINATION', 'CHECKUP', 'TREATMENT', 'DEWORMING', name='healthrecordtype'), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['pet_id'], ['pets.id'], ),
+    sa.ForeignKeyConstraint(['veterinarian_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('pet_health_records', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_pet_health_records_id'), ['id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('pet_health_records', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_pet_health_records_id'))
+
+    op.drop_table('pet_health_records')
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_appointments_id'))
+
+    op.drop_table('appointments')
+    with op.batch_alter_table('adoption_requests', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_adoption_requests_id'))
+
+    op.drop_table('adoption_requests')
+    with op.batch_alter_table('shelter_pets', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_shelter_pets_id'))
+
+    op.drop_table('shelter_pets')
+    with op.batch_alter_table('pets', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_pets_id'))
+
+    op.drop_table('pets')
+    with op.batch_alter_table('blog_posts', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_blog_posts_id'))
+
+    op.drop_table('blog_posts')
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_id'))
+        batch_op.drop_index(batch_op.f('ix_users_email'))
+
+    op.drop_table('users')
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_products_id'))
+
+    op.drop_table('products')
@@ -0,0 +1,47 @@
+"""list query indexes
+
+Composite indexes matching the filters used by the list endpoints.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:33:17.146648
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns)
+INDEXES = [
+    ('ix_appointments_veterinarian_id_status', 'appointments', ['veterinarian_id', 'status']),
+    ('ix_appointments_pet_id', 'appointments', ['pet_id']),
+    ('ix_pets_user_id', 'pets', ['user_id']),
+    ('ix_shelter_pets_adoption_status_species', 'shelter_pets', ['adoption_status', 'species']),
+    ('ix_shelter_pets_shelter_id', 'shelter_pets', ['shelter_id']),
+    ('ix_adoption_requests_requester_id_status', 'adoption_requests', ['requester_id', 'status']),
+    ('ix_adoption_requests_shelter_pet_id_status', 'adoption_requests', ['shelter_pet_id', 'status']),
+    ('ix_pet_health_records_pet_id', 'pet_health_records', ['pet_id']),
+    ('ix_blog_posts_published_created_at', 'blog_posts', ['published', 'created_at']),
+]
+
+
+def upgrade() -> None:
+    # On PostgreSQL build the indexes without blocking writes; CREATE INDEX
+    # CONCURRENTLY cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,72 @@
+"""keyset pagination indexes
+
+List endpoints now page with ORDER BY ... id and a cursor seek. Each list
+index gets id as its last column so the index delivers rows in page order
+(SQLite appends the rowid implicitly; PostgreSQL needs it spelled out).
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 11:48:36.720193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns)
+NEW_INDEXES = [
+    ('ix_appointments_veterinarian_id_id', 'appointments', ['veterinarian_id', 'id']),
+    ('ix_appointments_veterinarian_id_status_id', 'appointments', ['veterinarian_id', 'status', 'id']),
+    ('ix_appointments_pet_id_id', 'appointments', ['pet_id', 'id']),
+    ('ix_pets_user_id_id', 'pets', ['user_id', 'id']),
+    ('ix_shelter_pets_adoption_status_id', 'shelter_pets', ['adoption_status', 'id']),
+    ('ix_shelter_pets_shelter_id_id', 'shelter_pets', ['shelter_id', 'id']),
+    ('ix_adoption_requests_requester_id_id', 'adoption_requests', ['requester_id', 'id']),
+    ('ix_adoption_requests_requester_id_status_id', 'adoption_requests', ['requester_id', 'status', 'id']),
+    ('ix_adoption_requests_shelter_pet_id_id', 'adoption_requests', ['shelter_pet_id', 'id']),
+    ('ix_adoption_requests_shelter_pet_id_status_id', 'adoption_requests', ['shelter_pet_id', 'status', 'id']),
+    ('ix_blog_posts_published_created_at_id', 'blog_posts', ['published', 'created_at', 'id']),
+    ('ix_products_category_price_id', 'products', ['category', 'price', 'id']),
+    ('ix_products_category_id', 'products', ['category', 'id']),
+    ('ix_products_price_id', 'products', ['price', 'id']),
+    ('ix_users_role_id', 'users', ['role', 'id']),
+]
+
+# Superseded by the indexes above
+OLD_INDEXES = [
+    ('ix_appointments_veterinarian_id_status', 'appointments', ['veterinarian_id', 'status']),
+    ('ix_appointments_pet_id', 'appointments', ['pet_id']),
+    ('ix_pets_user_id', 'pets', ['user_id']),
+    ('ix_shelter_pets_shelter_id', 'shelter_pets', ['shelter_id']),
+    ('ix_adoption_requests_requester_id_status', 'adoption_requests', ['requester_id', 'status']),
+    ('ix_adoption_requests_shelter_pet_id_status', 'adoption_requests', ['shelter_pet_id', 'status']),
+    ('ix_blog_posts_published_created_at', 'blog_posts', ['published', 'created_at']),
+    ('ix_products_category_price', 'products', ['category', 'price']),
+    ('ix_users_role', 'users', ['role']),
+]
+
+
+def upgrade() -> None:
+    # Build the replacements before dropping the old indexes so the list
+    # queries always have an index to use
+    with op.get_context().autocommit_block():
+        for name, table, columns in NEW_INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+        for name, table, columns in OLD_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in OLD_INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+        for name, table, columns in reversed(NEW_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,135 @@
+"""blog tags and search
+
+Normalized blog tags (blog_tags, blog_post_tags) filled from the existing
+comma-separated BlogPost.tags, for ?tag= and /blog/tags; and a full-text
+index over post title and content for ?search= (FTS5 table kept in sync by
+triggers on SQLite, generated tsvector column with a GIN index on
+PostgreSQL).
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 10:26:15.439115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SQLITE_UPGRADE = [
+    "CREATE VIRTUAL TABLE blog_posts_fts USING fts5("
+    "title, content, content='blog_posts', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER blog_posts_fts_insert AFTER INSERT ON blog_posts BEGIN "
+    "INSERT INTO blog_posts_fts (rowid, title, content) VALUES (new.id, new.title, new.content); "
+    "END",
+    "CREATE TRIGGER blog_posts_fts_delete AFTER DELETE ON blog_posts BEGIN "
+    "INSERT INTO blog_posts_fts (blog_posts_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); "
+    "END",
+    "CREATE TRIGGER blog_posts_fts_update AFTER UPDATE OF title, content ON blog_posts BEGIN "
+    "INSERT INTO blog_posts_fts (blog_posts_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); "
+    "INSERT INTO blog_posts_fts (rowid, title, content) VALUES (new.id, new.title, new.content); "
+    "END",
+    "INSERT INTO blog_posts_fts (blog_posts_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER blog_posts_fts_update",
+    "DROP TRIGGER blog_posts_fts_delete",
+    "DROP TRIGGER blog_posts_fts_insert",
+    "DROP TABLE blog_posts_fts",
+]
+
+blog_posts = sa.table('blog_posts', sa.column('id', sa.Integer), sa.column('tags', sa.String))
+blog_tags = sa.table('blog_tags', sa.column('id', sa.Integer), sa.column('name', sa.String))
+blog_post_tags = sa.table('blog_post_tags', sa.column('post_id', sa.Integer), sa.column('tag_id', sa.Integer))
+
+
+def parse_tags(tags):
+    """Same normalization as app.core.tags.parse_tags at the time of writing."""
+    names = []
+    for part in (tags or "").split(","):
+        name = " ".join(part.split()).lower()[:50]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def backfill_tags() -> None:
+    connection = op.get_bind()
+    posts = connection.execute(
+        sa.select(blog_posts.c.id, blog_posts.c.tags).where(blog_posts.c.tags.isnot(None))
+    ).all()
+    post_tags = [(post_id, parse_tags(tags)) for post_id, tags in posts]
+    names = sorted({name for _, tags in post_tags for name in tags})
+    if not names:
+        return
+    op.bulk_insert(blog_tags, [{'name': name} for name in names])
+    tag_ids = dict(connection.execute(sa.select(blog_tags.c.name, blog_tags.c.id)).all())
+    op.bulk_insert(blog_post_tags, [
+        {'post_id': post_id, 'tag_id': tag_ids[name]}
+        for post_id, tags in post_tags
+        for name in tags
+    ])
+
+
+def upgrade() -> None:
+    op.create_table('blog_tags',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_table('blog_post_tags',
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('tag_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['blog_posts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['tag_id'], ['blog_tags.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('post_id', 'tag_id')
+    )
+    backfill_tags()
+    # Built after the backfill, in one pass
+    with op.batch_alter_table('blog_post_tags', schema=None) as batch_op:
+        batch_op.create_index('ix_blog_post_tags_tag_id_post_id', ['tag_id', 'post_id'], unique=False)
+
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for statement in SQLITE_UPGRADE:
+            op.execute(statement)
+    elif dialect == 'postgresql':
+        op.execute(
+            "ALTER TABLE blog_posts ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(content, '')), 'B')) STORED"
+        )
+        with op.get_context().autocommit_block():
+            op.create_index(
+                'ix_blog_posts_search_vector', 'blog_posts', ['search_vector'],
+                unique=False, postgresql_using='gin', postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for statement in SQLITE_DOWNGRADE:
+            op.execute(statement)
+    elif dialect == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index('ix_blog_posts_search_vector', table_name='blog_posts', postgresql_concurrently=True)
+        op.drop_column('blog_posts', 'search_vector')
+
+    with op.batch_alter_table('blog_post_tags', schema=None) as batch_op:
+        batch_op.drop_index('ix_blog_post_tags_tag_id_post_id')
+
+    op.drop_table('blog_post_tags')
+    op.drop_table('blog_tags')
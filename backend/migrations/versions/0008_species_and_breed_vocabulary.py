@@ -0,0 +1,157 @@
+"""species and breed vocabulary
+
+Canonical species and breed entries (species, breeds) and species_id /
+breed_id on pets and shelter pets, so ?species= and ?breed= are indexed
+lookups. Existing rows are matched to entries built from their species and
+breed text, most common spelling first.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 11:19:10.518226
+
+"""
+from collections import Counter
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PET_TABLES = ('pets', 'shelter_pets')
+
+# Tables rather than lightweight table() so inserts report the new ids
+metadata = sa.MetaData()
+species_table = sa.Table(
+    'species', metadata, sa.Column('id', sa.Integer, primary_key=True), sa.Column('name', sa.String)
+)
+breeds_table = sa.Table(
+    'breeds', metadata, sa.Column('id', sa.Integer, primary_key=True), sa.Column('species_id', sa.Integer),
+    sa.Column('name', sa.String)
+)
+
+
+def normalize(name, max_length):
+    """Same normalization as app.core.vocabulary.normalize at the time of writing."""
+    return " ".join((name or "").split()).lower()[:max_length]
+
+
+def spelling_variants(name):
+    """Same as app.core.vocabulary.spelling_variants at the time of writing."""
+    variants = [name]
+    if name.endswith("es"):
+        variants.append(name[:-2])
+    if name.endswith("s"):
+        variants.append(name[:-1])
+    else:
+        variants.append(name + "s")
+    return variants
+
+
+def backfill_vocabulary() -> None:
+    connection = op.get_bind()
+    # (species_id or None for species, name) -> id
+    entries = {}
+
+    def entry_id(name, species_id=None):
+        for variant in spelling_variants(name):
+            if (species_id, variant) in entries:
+                return entries[(species_id, variant)]
+        if species_id is None:
+            statement = sa.insert(species_table).values(name=name)
+        else:
+            statement = sa.insert(breeds_table).values(species_id=species_id, name=name)
+        entries[(species_id, name)] = connection.execute(statement).inserted_primary_key[0]
+        return entries[(species_id, name)]
+
+    pets = {}
+    for table_name in PET_TABLES:
+        table = sa.table(table_name, sa.column('id', sa.Integer), sa.column('species', sa.String),
+                         sa.column('breed', sa.String))
+        pets[table_name] = [
+            (pet_id, normalize(species, 50), normalize(breed, 100))
+            for pet_id, species, breed in connection.execute(sa.select(table.c.id, table.c.species, table.c.breed))
+        ]
+    rows = [row for table_rows in pets.values() for row in table_rows]
+    # Most common first, so the usual spelling is the one variants fold into
+    for species, _ in Counter(species for _, species, _ in rows if species).most_common():
+        entry_id(species)
+    for (species, breed), _ in Counter((species, breed) for _, species, breed in rows if species and breed).most_common():
+        entry_id(breed, entry_id(species))
+
+    for table_name, table_rows in pets.items():
+        if not table_rows:
+            continue
+        table = sa.table(table_name, sa.column('id', sa.Integer), sa.column('species_id', sa.Integer),
+                         sa.column('breed_id', sa.Integer))
+        connection.execute(
+            table.update().where(table.c.id == sa.bindparam('pet_id'))
+            .values(species_id=sa.bindparam('new_species_id'), breed_id=sa.bindparam('new_breed_id')),
+            [{
+                'pet_id': pet_id,
+                'new_species_id': entry_id(species) if species else None,
+                'new_breed_id': entry_id(breed, entry_id(species)) if species and breed else None,
+            } for pet_id, species, breed in table_rows],
+        )
+
+
+def upgrade() -> None:
+    op.create_table('species',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_table('breeds',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('species_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.ForeignKeyConstraint(['species_id'], ['species.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('species_id', 'name')
+    )
+    for table_name in PET_TABLES:
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('species_id', sa.Integer(), nullable=True))
+            batch_op.add_column(sa.Column('breed_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key(f'fk_{table_name}_species_id_species', 'species', ['species_id'], ['id'])
+            batch_op.create_foreign_key(f'fk_{table_name}_breed_id_breeds', 'breeds', ['breed_id'], ['id'])
+
+    backfill_vocabulary()
+
+    # Built after the backfill, in one pass
+    with op.batch_alter_table('pets', schema=None) as batch_op:
+        batch_op.create_index('ix_pets_species_id_id', ['species_id', 'id'], unique=False)
+
+    with op.batch_alter_table('shelter_pets', schema=None) as batch_op:
+        batch_op.drop_index('ix_shelter_pets_adoption_status_species')
+        batch_op.create_index('ix_shelter_pets_adoption_status_species_id_id', ['adoption_status', 'species_id', 'id'], unique=False)
+        batch_op.create_index('ix_shelter_pets_breed_id_id', ['breed_id', 'id'], unique=False)
+        batch_op.create_index('ix_shelter_pets_species_id_id', ['species_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('shelter_pets', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_shelter_pets_breed_id_breeds', type_='foreignkey')
+        batch_op.drop_constraint('fk_shelter_pets_species_id_species', type_='foreignkey')
+        batch_op.drop_index('ix_shelter_pets_species_id_id')
+        batch_op.drop_index('ix_shelter_pets_breed_id_id')
+        batch_op.drop_index('ix_shelter_pets_adoption_status_species_id_id')
+        batch_op.create_index('ix_shelter_pets_adoption_status_species', ['adoption_status', 'species'], unique=False)
+        batch_op.drop_column('breed_id')
+        batch_op.drop_column('species_id')
+
+    with op.batch_alter_table('pets', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_pets_breed_id_breeds', type_='foreignkey')
+        batch_op.drop_constraint('fk_pets_species_id_species', type_='foreignkey')
+        batch_op.drop_index('ix_pets_species_id_id')
+        batch_op.drop_column('breed_id')
+        batch_op.drop_column('species_id')
+
+    op.drop_table('breeds')
+    op.drop_table('species')
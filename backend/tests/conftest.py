@@ -0,0 +1,90 @@
+import asyncio
+import os
+import tempfile
+
+import pytest
+import pytest_asyncio
+
+# Point the app at a throwaway database before app.database creates its engines.
+# Set DATABASE_URL explicitly (e.g. to a PostgreSQL scratch database) to run
+# the suite against another backend.
+_scratch_dir = tempfile.mkdtemp()
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{os.path.join(_scratch_dir, 'pawfect_test.db')}"
+)
+os.environ.setdefault("SHARED_STORE_PATH", os.path.join(_scratch_dir, "shared_state.db"))
+# Tests hit the auth endpoints repeatedly; test_rate_limit.py turns limits back on
+os.environ.setdefault("AUTH_RATE_LIMIT_ENABLED", "false")
+# Fixtures write rows outside the app's sessions, which caches can't see;
+# test_response_cache.py turns the response cache back on
+os.environ.setdefault("RESPONSE_CACHE_BACKEND", "none")
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """One event loop for the whole session so pooled async connections stay valid."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    # Close pooled aiosqlite connections; their worker threads keep the process alive
+    from app.database import async_engine
+    loop.run_until_complete(async_engine.dispose())
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def create_user():
+    """Factory adding a user by email, or resetting the existing one; returns its id."""
+    from sqlalchemy import insert, select, update
+
+    from app.database import Base, engine
+    from app.models import appointment, blog, pet, product, shelter  # noqa: F401 (mapper registry)
+    from app.models.user import User, UserRole
+    from app.routers.auth import invalidate_cached_user
+
+    def create(email: str, role: UserRole = UserRole.PET_OWNER, name: str = "User") -> int:
+        Base.metadata.create_all(bind=engine)
+        values = {"name": name, "role": role, "hashed_password": "x", "is_active": "1"}
+        with engine.begin() as connection:
+            user_id = connection.scalar(select(User.id).where(User.email == email))
+            if user_id is None:
+                user_id = connection.execute(insert(User).values(email=email, **values)).inserted_primary_key[0]
+            else:
+                connection.execute(update(User).where(User.id == user_id).values(**values))
+        # Written around the API, so a cached copy of the row may be stale
+        invalidate_cached_user(user_id)
+        return user_id
+
+    return create
+
+
+@pytest.fixture(scope="session")
+def auth_headers():
+    """Factory for a bearer access token header for a user id."""
+    from app.auth import create_access_token
+
+    def headers(user_id: int) -> dict:
+        return {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+
+    return headers
+
+
+@pytest.fixture
+def admin(create_user) -> int:
+    from app.models.user import UserRole
+    return create_user("admin@tests.local", UserRole.SHELTER_ADMIN, "Admin")
+
+
+@pytest.fixture
+def admin_headers(admin, auth_headers) -> dict:
+    return auth_headers(admin)
+
+
+@pytest_asyncio.fixture
+async def client():
+    """HTTP client calling the app in-process."""
+    import httpx
+
+    from app.main import app
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://localhost") as http:
+        yield http
@@ -0,0 +1,91 @@
+"""The user and verified-token caches behind get_current_user."""
+
+import hashlib
+import time
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import update
+
+from app.auth import create_access_token, create_refresh_token, decode_token, token_cache
+from app.core.config import settings
+from app.core.shared_store import SharedStore
+from app.database import engine
+from app.models.user import User, UserRole
+
+ME = "/api/v1/auth/me"
+
+
+@pytest.fixture
+def owner(create_user):
+    return create_user("owner@caches.local", UserRole.PET_OWNER, "Owner")
+
+
+@pytest.fixture
+def owner_headers(owner, auth_headers):
+    return auth_headers(owner)
+
+
+@pytest.mark.asyncio
+async def test_updated_user_is_not_served_from_cache(client, owner, owner_headers):
+    before = await client.get(ME, headers=owner_headers)
+    updated = await client.put(f"/api/v1/users/{owner}", headers=owner_headers, json={"name": "Renamed"})
+    after = await client.get(ME, headers=owner_headers)
+
+    assert before.json()["name"] == "Owner"
+    assert updated.status_code == 200, updated.text
+    assert after.json()["name"] == "Renamed"
+
+
+@pytest.mark.asyncio
+async def test_another_workers_update_is_seen_at_once(client, owner, owner_headers):
+    before = await client.get(ME, headers=owner_headers)
+    # Another worker updates the row and bumps the user's version through its
+    # own connection to the shared store
+    with engine.begin() as connection:
+        connection.execute(update(User).where(User.id == owner).values(name="Elsewhere"))
+    cached = await client.get(ME, headers=owner_headers)
+    SharedStore(settings.SHARED_STORE_PATH).bump_tags([f"user:{owner}"])
+    after = await client.get(ME, headers=owner_headers)
+
+    assert before.json()["name"] == "Owner"
+    assert cached.json()["name"] == "Owner"
+    assert after.json()["name"] == "Elsewhere"
+
+
+@pytest.mark.asyncio
+async def test_deactivated_user_is_not_served_from_cache(client, owner, owner_headers, admin_headers):
+    before = await client.get(ME, headers=owner_headers)
+    deactivated = await client.delete(f"/api/v1/users/{owner}", headers=admin_headers)
+    after = await client.get(ME, headers=owner_headers)
+
+    assert before.status_code == 200
+    assert deactivated.status_code == 200, deactivated.text
+    assert after.status_code == 400
+    assert after.json()["detail"] == "Inactive user"
+
+
+@pytest.mark.asyncio
+async def test_cached_token_stops_working_at_exp(client, owner):
+    token = create_access_token({"sub": str(owner)}, expires_delta=timedelta(seconds=2))
+    headers = {"Authorization": f"Bearer {token}"}
+    fresh = await client.get(ME, headers=headers)
+    assert token_cache.get(hashlib.sha256(token.encode()).digest()) is not None
+
+    exp = decode_token(token)["exp"]
+    time.sleep(max(0.0, exp - time.time()) + 0.1)
+    expired = await client.get(ME, headers=headers)
+
+    assert fresh.status_code == 200
+    assert expired.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_refresh_token_is_not_an_access_token(client, owner):
+    token = create_refresh_token({"sub": str(owner)})
+    # Cached like any verified token; the type is still checked on every use
+    decode_token(token)
+    response = await client.get(ME, headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Invalid token type. Expected access"
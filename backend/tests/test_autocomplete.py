@@ -0,0 +1,101 @@
+"""Autocomplete: word-start prefix matches and updates on committed writes."""
+
+import pytest
+from sqlalchemy import delete, insert
+
+from app.core.autocomplete import CompletionIndex, completions
+from app.database import Base, engine
+from app.models.pet import Pet
+from app.models.product import Product, ProductCategory
+from app.models.shelter import AdoptionRequest, ShelterPet
+
+AUTOCOMPLETE_URL = "/api/v1/search/autocomplete"
+
+
+@pytest.fixture
+def kibble(admin):
+    Base.metadata.create_all(bind=engine)
+    completions.clear()
+    with engine.begin() as connection:
+        connection.execute(delete(AdoptionRequest))
+        connection.execute(delete(ShelterPet))
+        connection.execute(delete(Product))
+        connection.execute(delete(Pet).where(Pet.user_id == admin))
+        connection.execute(insert(Product), [
+            {"name": "Salmon Kibble", "brand": "Acana", "price": 20, "category": ProductCategory.FOOD},
+            {"name": "Kitten Kibble", "brand": "Acana", "price": 18, "category": ProductCategory.FOOD},
+        ])
+
+
+def values(response):
+    assert response.status_code == 200, response.text
+    return [(item["kind"], item["value"]) for item in response.json()]
+
+
+def test_matches_any_word_start_once():
+    index = CompletionIndex(reload_seconds=60)
+    index._loaded_at = float("inf")
+    index.apply([("product", None, "Kibble Kibble"), ("breed", None, "Border Collie"), ("breed", None, "Border Collie")])
+
+    assert index.complete("KIB") == [{"kind": "product", "value": "Kibble Kibble"}]
+    assert index.complete("coll", kind="product") == []
+
+    # Still held by the second pet with the breed
+    index.apply([("breed", "Border Collie", None)])
+    assert index.complete("bor") == [{"kind": "breed", "value": "Border Collie"}]
+    index.apply([("breed", "Border Collie", None)])
+    assert index.complete("bor") == []
+
+
+@pytest.mark.asyncio
+async def test_suggestions_follow_writes(client, kibble, admin_headers):
+    kibble = values(await client.get(AUTOCOMPLETE_URL, params={"q": "kib"}))
+    assert kibble == [("product", "Kitten Kibble"), ("product", "Salmon Kibble")]
+    assert values(await client.get(AUTOCOMPLETE_URL, params={"q": "ac"})) == [("brand", "Acana")]
+
+    created = await client.post("/api/v1/pets/", headers=admin_headers, json={
+        "name": "Rex", "species": "dog", "breed": "Beagle", "gender": "male",
+    })
+    pet_id = created.json()["id"]
+    assert values(await client.get(AUTOCOMPLETE_URL, params={"q": "bea", "kind": "breed"})) == [("breed", "Beagle")]
+
+    await client.put(f"/api/v1/pets/{pet_id}", headers=admin_headers, json={"breed": "Basset Hound"})
+    assert values(await client.get(AUTOCOMPLETE_URL, params={"q": "b", "kind": "breed"})) == [("breed", "Basset Hound")]
+
+    await client.delete(f"/api/v1/pets/{pet_id}", headers=admin_headers)
+    assert values(await client.get(AUTOCOMPLETE_URL, params={"q": "hou"})) == []
+
+    unknown = await client.get(AUTOCOMPLETE_URL, params={"q": "a", "kind": "colour"})
+    assert unknown.status_code == 400
+    assert completions.loads == 1
+
+
+@pytest.mark.asyncio
+async def test_reload_runs_in_the_background(client, kibble):
+    assert values(await client.get(AUTOCOMPLETE_URL, params={"q": "kib"})) == [
+        ("product", "Kitten Kibble"), ("product", "Salmon Kibble"),
+    ]
+    # Written around the app's sessions, like another worker would
+    with engine.begin() as connection:
+        connection.execute(insert(Product), [
+            {"name": "Puppy Kibble", "price": 15, "category": ProductCategory.FOOD},
+        ])
+    completions.invalidate()
+    loads = completions.loads
+
+    # Served from the old index while the new one is built
+    stale = values(await client.get(AUTOCOMPLETE_URL, params={"q": "kib"}))
+    await completions._reload
+    fresh = values(await client.get(AUTOCOMPLETE_URL, params={"q": "kib"}))
+
+    assert stale == [("product", "Kitten Kibble"), ("product", "Salmon Kibble")]
+    assert fresh == [("product", "Kitten Kibble"), ("product", "Puppy Kibble"), ("product", "Salmon Kibble")]
+    assert completions.loads == loads + 1
+
+
+@pytest.mark.asyncio
+async def test_blank_prefix_matches_nothing(client, kibble):
+    assert values(await client.get(AUTOCOMPLETE_URL, params={"q": "   "})) == []
+    assert values(await client.get(AUTOCOMPLETE_URL, params={"q": " kib "})) == [
+        ("product", "Kitten Kibble"), ("product", "Salmon Kibble"),
+    ]
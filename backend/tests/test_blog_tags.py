@@ -0,0 +1,67 @@
+"""Normalized blog tags (tag=, /blog/tags) and full-text blog search."""
+
+import pytest
+from sqlalchemy import delete
+
+from app.core.tags import parse_tags
+from app.database import engine
+from app.models.blog import BlogPost, BlogPostTag, BlogTag
+from app.models.user import UserRole
+
+
+@pytest.fixture
+def vet_headers(create_user, auth_headers):
+    vet_id = create_user("vet@tags.local", UserRole.VETERINARIAN, "Vet")
+    with engine.begin() as connection:
+        connection.execute(delete(BlogPostTag))
+        connection.execute(delete(BlogTag))
+        connection.execute(delete(BlogPost))
+    return auth_headers(vet_id)
+
+
+async def create_post(client, headers, title, content, tags):
+    response = await client.post("/api/v1/blog/", headers=headers, json={
+        "title": title, "content": content, "category": "health", "tags": tags, "published": True,
+    })
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def test_parse_tags():
+    assert parse_tags(" Dogs,puppy   Care,, dogs ") == ["dogs", "puppy care"]
+    assert parse_tags(None) == []
+
+
+@pytest.mark.asyncio
+async def test_tag_filter_and_counts_follow_writes(client, vet_headers):
+    vaccines = await create_post(client, vet_headers, "Vaccines", "Core shots", "Dogs, Puppies")
+    diet = await create_post(client, vet_headers, "Diet", "Kibble or raw", "dogs,Nutrition")
+
+    tagged = await client.get("/api/v1/blog/", params={"tag": "DOGS"})
+    counts = await client.get("/api/v1/blog/tags")
+    assert [post["id"] for post in tagged.json()] == [diet, vaccines]
+    assert counts.json() == [
+        {"name": "dogs", "count": 2},
+        {"name": "nutrition", "count": 1},
+        {"name": "puppies", "count": 1},
+    ]
+
+    await client.put(f"/api/v1/blog/{vaccines}", headers=vet_headers, json={"tags": "cats"})
+    await client.delete(f"/api/v1/blog/{diet}", headers=vet_headers)
+
+    dogs = await client.get("/api/v1/blog/", params={"tag": "dogs"})
+    counts = await client.get("/api/v1/blog/tags")
+    assert dogs.json() == []
+    assert counts.json() == [{"name": "cats", "count": 1}]
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_title_matches_first(client, vet_headers):
+    body = await create_post(client, vet_headers, "Spring checklist", "Book the vaccination visit early", None)
+    title = await create_post(client, vet_headers, "Vaccination schedule", "Which shots and when", None)
+    await create_post(client, vet_headers, "Grooming", "Brush weekly", None)
+
+    found = await client.get("/api/v1/blog/", params={"search": "vaccin"})
+    cursor = await client.get("/api/v1/blog/", params={"search": "vaccin", "cursor": "abc"})
+    assert [post["id"] for post in found.json()] == [title, body]
+    assert cursor.status_code == 400
@@ -0,0 +1,104 @@
+"""ETags, 304s and response compression on the catalog endpoints."""
+
+import pytest
+from sqlalchemy import delete, insert
+
+from app.core.compression import choose_encoding
+from app.core.invalidation import table_versions
+from app.database import Base, engine
+from app.models.product import Product, ProductCategory
+
+URL = "/api/v1/products/?category=toys&limit=10"
+
+
+@pytest.fixture
+def toys():
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(delete(Product))
+        connection.execute(insert(Product), [{
+            "name": f"Toy {i}",
+            "description": "Squeaky rubber bone for medium dogs. " * 10,
+            "price": 5.0,
+            "category": ProductCategory.TOYS,
+            "stock": 1,
+        } for i in range(15)])
+
+
+@pytest.mark.asyncio
+async def test_unchanged_list_is_not_resent(client, toys, admin_headers):
+    first = await client.get(URL, headers={"Accept-Encoding": "identity"})
+    etag = first.headers["etag"]
+    cached = await client.get(URL, headers={"Accept-Encoding": "identity", "If-None-Match": etag})
+    other_page = await client.get(URL + "&skip=10", headers={"Accept-Encoding": "identity"})
+
+    product_id = first.json()[0]["id"]
+    updated = await client.put(f"/api/v1/products/{product_id}", headers=admin_headers, json={"stock": 7})
+    assert updated.status_code == 200, updated.text
+    changed = await client.get(URL, headers={"Accept-Encoding": "identity", "If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+    assert other_page.headers["etag"] != etag
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()[0]["stock"] == 7
+
+
+@pytest.mark.asyncio
+async def test_detail_etag_and_missing_rows(client, toys):
+    listing = await client.get(URL)
+    product_id = listing.json()[0]["id"]
+    detail = await client.get(f"/api/v1/products/{product_id}")
+    cached = await client.get(f"/api/v1/products/{product_id}", headers={"If-None-Match": detail.headers["etag"]})
+    missing = await client.get("/api/v1/products/999999", headers={"If-None-Match": "*"})
+
+    assert cached.status_code == 304
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_etag_depends_on_content_only(client, toys):
+    first = await client.get(URL, headers={"Accept-Encoding": "identity"})
+    # What another worker's write counters would look like
+    table_versions.bump(["products"])
+    cached = await client.get(URL, headers={"Accept-Encoding": "identity", "If-None-Match": first.headers["etag"]})
+
+    assert cached.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_large_responses_are_gzipped_with_a_distinct_etag(client, toys):
+    plain = await client.get(URL, headers={"Accept-Encoding": "identity"})
+    gzipped = await client.get(URL, headers={"Accept-Encoding": "gzip"})
+    cached = await client.get(
+        URL, headers={"Accept-Encoding": "gzip", "If-None-Match": gzipped.headers["etag"]}
+    )
+    small = await client.get("/health", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in plain.headers
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert int(gzipped.headers["content-length"]) < len(plain.content)
+    assert gzipped.json() == plain.json()
+    assert gzipped.headers["etag"] == plain.headers["etag"][:-1] + '-gzip"'
+    assert "Accept-Encoding" in gzipped.headers["vary"]
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == gzipped.headers["etag"]
+    assert "content-encoding" not in small.headers
+
+
+def test_encoding_preference():
+    assert choose_encoding(b"gzip, deflate") == b"gzip"
+    assert choose_encoding(b"gzip;q=0, identity") is None
+    assert choose_encoding(b"") is None
+
+
+@pytest.mark.asyncio
+async def test_brotli_when_installed(client, toys):
+    pytest.importorskip("brotli")
+    response = await client.get(URL, headers={"Accept-Encoding": "gzip, br"})
+
+    assert response.headers["content-encoding"] == "br"
+    assert len(response.json()) == 10
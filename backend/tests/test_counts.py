@@ -0,0 +1,56 @@
+"""X-Total-Count: exact cached counts, write invalidation and estimates."""
+
+import pytest
+from sqlalchemy import delete, insert
+
+from app.core.config import settings
+from app.core.counts import ESTIMATED_HEADER, TOTAL_COUNT_HEADER, count_cache
+from app.database import Base, engine
+from app.models.product import Product, ProductCategory
+
+
+@pytest.fixture
+def health_products():
+    Base.metadata.create_all(bind=engine)
+    count_cache.clear()
+    with engine.begin() as connection:
+        connection.execute(delete(Product))
+        connection.execute(insert(Product), [
+            {"name": f"Counted {i}", "price": 1.0, "category": ProductCategory.HEALTH, "stock": 1}
+            for i in range(12)
+        ])
+
+
+@pytest.mark.asyncio
+async def test_exact_count_is_cached_and_invalidated_by_writes(client, health_products, admin_headers):
+    url = "/api/v1/products/?category=health&include_total=true&limit=5"
+    first = await client.get(url)
+    hits = count_cache.hits
+    second = await client.get(url)
+    assert count_cache.hits == hits + 1
+
+    created = await client.post("/api/v1/products/", headers=admin_headers, json={
+        "name": "One more", "price": 2.0, "category": "health", "stock": 1,
+    })
+    assert created.status_code == 200, created.text
+    third = await client.get(url)
+
+    assert len(first.json()) == 5
+    assert first.headers[TOTAL_COUNT_HEADER] == second.headers[TOTAL_COUNT_HEADER] == "12"
+    assert third.headers[TOTAL_COUNT_HEADER] == "13"
+    assert ESTIMATED_HEADER not in first.headers
+
+
+@pytest.mark.asyncio
+async def test_counts_above_threshold_are_estimates(client, health_products, monkeypatch):
+    monkeypatch.setattr(settings, "COUNT_EXACT_THRESHOLD", 10)
+    response = await client.get("/api/v1/products/?include_total=true")
+    plain = await client.get("/api/v1/products/")
+
+    assert response.headers[ESTIMATED_HEADER] == "true"
+    if engine.dialect.name == "postgresql":
+        assert int(response.headers[TOTAL_COUNT_HEADER]) >= 11
+    else:
+        # No planner estimate: the threshold is reported as a lower bound
+        assert response.headers[TOTAL_COUNT_HEADER] == "10+"
+    assert TOTAL_COUNT_HEADER not in plain.headers
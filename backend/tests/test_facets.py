@@ -0,0 +1,81 @@
+"""Shelter pet facets: disjunctive counts, filters and invalidation."""
+
+import pytest
+from sqlalchemy import delete, insert
+
+from app.core.facets import FacetIndex, facet_index, facet_matchers
+from app.core.vocabulary import backfill_vocabulary, vocabulary_cache
+from app.database import Base, engine
+from app.models.shelter import AdoptionRequest, AdoptionStatus, PetGender, ShelterPet
+
+FACETS_URL = "/api/v1/shelters/pets/facets"
+
+
+@pytest.fixture
+def shelter_pets(admin):
+    Base.metadata.create_all(bind=engine)
+    facet_index.clear()
+    vocabulary_cache.clear()
+    with engine.begin() as connection:
+        connection.execute(delete(AdoptionRequest))
+        connection.execute(delete(ShelterPet))
+        connection.execute(insert(ShelterPet), [
+            {"shelter_id": admin, "name": "Rex", "species": "dog", "breed": "Beagle", "age": 0,
+             "gender": PetGender.MALE, "adoption_status": AdoptionStatus.AVAILABLE},
+            {"shelter_id": admin, "name": "Bella", "species": "dog", "breed": "Labrador", "age": 4,
+             "gender": PetGender.FEMALE, "adoption_status": AdoptionStatus.AVAILABLE},
+            {"shelter_id": admin, "name": "Tom", "species": "cat", "breed": None, "age": 9,
+             "gender": PetGender.MALE, "adoption_status": AdoptionStatus.AVAILABLE},
+            {"shelter_id": admin, "name": "Max", "species": "dog", "breed": "Beagle", "age": 2,
+             "gender": PetGender.MALE, "adoption_status": AdoptionStatus.ADOPTED},
+        ])
+        backfill_vocabulary(connection)
+
+
+def counts(facet):
+    return {item["value"]: item["count"] for item in facet}
+
+
+def test_each_facet_ignores_its_own_filter():
+    groups = [
+        ("dog", "Beagle", "male", "baby", 1, "available", 3),
+        ("dog", "Labrador", "female", "adult", 1, "available", 2),
+        ("cat", None, "male", "senior", 2, "available", 4),
+        ("dog", "Beagle", "male", "baby", 1, "adopted", 1),
+    ]
+
+    facets = FacetIndex(groups).count("available", facet_matchers(species={"dog"}, gender="male"))
+
+    assert facets["total"] == 3
+    assert counts(facets["species"]) == {"dog": 3, "cat": 4}
+    assert counts(facets["gender"]) == {"male": 3, "female": 2}
+    assert counts(facets["breed"]) == {"Beagle": 3}
+    assert [item["value"] for item in facets["age_group"]] == ["baby"]
+
+
+@pytest.mark.asyncio
+async def test_facets_match_the_list_filters(client, shelter_pets):
+    facets = (await client.get(FACETS_URL, params={"adoption_status": "available", "species": "dog"})).json()
+    pets = (await client.get("/api/v1/shelters/pets", params={
+        "adoption_status": "available", "species": "dog", "age_group": "adult",
+    })).json()
+    bad_group = await client.get(FACETS_URL, params={"age_group": "ancient"})
+
+    assert facets["total"] == 2
+    assert counts(facets["species"]) == {"dog": 2, "cat": 1}
+    assert counts(facets["age_group"]) == {"baby": 1, "adult": 1}
+    assert [item["value"] for item in facets["age_group"]] == ["baby", "adult"]
+    assert [pet["name"] for pet in pets] == ["Bella"]
+    assert bad_group.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_status_change_updates_counts(client, shelter_pets, admin_headers):
+    before = (await client.get(FACETS_URL, params={"adoption_status": "available"})).json()
+    pets = (await client.get("/api/v1/shelters/pets", params={"species": "cat"})).json()
+    await client.put(f"/api/v1/shelters/pets/{pets[0]['id']}", headers=admin_headers,
+                     json={"adoption_status": "adopted"})
+    after = (await client.get(FACETS_URL, params={"adoption_status": "available"})).json()
+
+    assert counts(before["species"]) == {"dog": 2, "cat": 1}
+    assert counts(after["species"]) == {"dog": 2}
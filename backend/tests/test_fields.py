@@ -0,0 +1,66 @@
+"""Sparse fieldsets: fields= narrows the SELECT and the response body."""
+
+import pytest
+from sqlalchemy import delete, event, insert
+
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.database import async_engine, engine
+from app.models.blog import BlogPost
+from app.models.user import UserRole
+
+
+@pytest.fixture(scope="module")
+def posts(create_user):
+    author_id = create_user("writer@fields.local", UserRole.VETERINARIAN, "Writer")
+    with engine.begin() as connection:
+        connection.execute(delete(BlogPost))
+        post_ids = connection.execute(insert(BlogPost).returning(BlogPost.id), [{
+            "author_id": author_id,
+            "title": f"Post {i}",
+            "content": "long body " * 500,
+            "category": "health",
+            "published": "1",
+        } for i in range(5)]).scalars().all()
+    return post_ids
+
+
+@pytest.fixture
+def selects():
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    yield statements
+    event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+
+@pytest.mark.asyncio
+async def test_list_returns_and_selects_only_requested_fields(client, posts, selects):
+    response = await client.get("/api/v1/blog/?fields=id,title,published&limit=2")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body) == 2
+    assert all(set(item) == {"id", "title", "published"} for item in body)
+    assert body[0]["published"] is True
+    # Pagination headers survive the custom response
+    assert response.headers[NEXT_CURSOR_HEADER]
+    # The ETag fingerprint only aggregates ids and timestamps
+    [statement] = [statement for statement in selects if "count(*)" not in statement]
+    assert "blog_posts.content" not in statement
+    assert "blog_posts.title" in statement
+
+
+@pytest.mark.asyncio
+async def test_detail_and_unknown_fields(client, posts):
+    detail = await client.get(f"/api/v1/blog/{posts[0]}?fields=title")
+    unknown = await client.get("/api/v1/blog/?fields=title,password")
+    full = await client.get(f"/api/v1/blog/{posts[0]}")
+
+    assert detail.json() == {"title": "Post 0"}
+    assert unknown.status_code == 400
+    assert "password" in unknown.json()["detail"]
+    assert "content" in full.json()
@@ -0,0 +1,75 @@
+"""The password hashing pool's 503 when saturated, and its metrics."""
+
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import delete
+
+from app.core.hash_pool import HashingPool, HashPoolSaturated
+from app.database import engine
+from app.models.user import User
+
+
+async def wait_until(condition):
+    for _ in range(200):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+@pytest.mark.asyncio
+async def test_calls_beyond_max_pending_are_rejected():
+    pool = HashingPool(max_workers=1, max_pending=2)
+    release = threading.Event()
+    try:
+        # One call running, one queued behind it
+        calls = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+        await wait_until(lambda: pool.pending == 2)
+
+        with pytest.raises(HashPoolSaturated) as rejected:
+            await pool.run(release.wait)
+
+        release.set()
+        await asyncio.gather(*calls)
+    finally:
+        release.set()
+        pool.shutdown()
+
+    assert rejected.value.status_code == 503
+    assert rejected.value.headers["Retry-After"] == "1"
+    stats = pool.stats()
+    assert (stats["pending"], stats["completed"], stats["rejected"]) == (0, 2, 1)
+    # The queued call waited for the running one
+    assert stats["queue_wait_ms_p95"] > 0
+    assert stats["hash_ms_p50"] > 0
+
+
+@pytest.mark.asyncio
+async def test_saturated_pool_answers_503_with_retry_after(client, admin_headers, monkeypatch):
+    with engine.begin() as connection:
+        connection.execute(delete(User).where(User.email == "new@pool.local"))
+    pool = HashingPool(max_workers=1, max_pending=1)
+    monkeypatch.setattr("app.auth.hash_pool", pool)
+    monkeypatch.setattr("app.routers.admin.hash_pool", pool)
+    release = threading.Event()
+    try:
+        busy = asyncio.ensure_future(pool.run(release.wait))
+        await wait_until(lambda: pool.pending == 1)
+
+        response = await client.post("/api/v1/auth/register", json={
+            "name": "New", "email": "new@pool.local", "role": "pet_owner", "password": "correct horse",
+        })
+        during = (await client.get("/api/v1/admin/password-hashing", headers=admin_headers)).json()
+        release.set()
+        await busy
+        after = (await client.get("/api/v1/admin/password-hashing", headers=admin_headers)).json()
+    finally:
+        release.set()
+        pool.shutdown()
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert (during["pending"], during["rejected"], during["completed"]) == (1, 1, 0)
+    assert (after["pending"], after["rejected"], after["completed"]) == (0, 1, 1)
@@ -0,0 +1,59 @@
+"""MessagePack content negotiation for responses and request bodies."""
+
+import msgpack
+import pytest
+from sqlalchemy import delete
+
+from app.core.msgpack_middleware import wants_msgpack
+from app.database import Base, engine
+from app.models.user import User
+
+MSGPACK = "application/msgpack"
+
+
+def test_accept_header_negotiation():
+    assert wants_msgpack(b"application/msgpack")
+    assert wants_msgpack(b"application/x-msgpack, application/json;q=0.5")
+    assert not wants_msgpack(b"")
+    assert not wants_msgpack(b"application/json")
+    assert not wants_msgpack(b"application/json, application/msgpack;q=0.5")
+    assert not wants_msgpack(b"application/msgpack;q=0")
+
+
+@pytest.mark.asyncio
+async def test_responses_follow_accept(client):
+    Base.metadata.create_all(bind=engine)
+    as_json = await client.get("/api/v1/products/?limit=5")
+    packed = await client.get("/api/v1/products/?limit=5", headers={"Accept": MSGPACK})
+    missing = await client.get("/api/v1/products/999999", headers={"Accept": MSGPACK})
+
+    assert as_json.headers["content-type"] == "application/json"
+    assert packed.headers["content-type"] == MSGPACK
+    assert msgpack.unpackb(packed.content) == as_json.json()
+    assert "Accept" in packed.headers["vary"] and "Accept" in as_json.headers["vary"]
+    # Errors are negotiated too
+    assert missing.status_code == 404
+    assert msgpack.unpackb(missing.content) == {"detail": "Product not found"}
+
+
+@pytest.mark.asyncio
+async def test_msgpack_request_bodies(client):
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(delete(User).where(User.email == "packed@msgpack.local"))
+    body = msgpack.packb({
+        "name": "Packed", "email": "packed@msgpack.local", "role": "pet_owner", "password": "s3cret-pass"
+    })
+    registered = await client.post(
+        "/api/v1/auth/register", content=body,
+        headers={"Content-Type": MSGPACK, "Accept": MSGPACK},
+    )
+    garbage = await client.post(
+        "/api/v1/auth/register", content=b"\xc1", headers={"Content-Type": MSGPACK}
+    )
+
+    assert registered.status_code == 200
+    assert registered.headers["content-type"] == MSGPACK
+    assert msgpack.unpackb(registered.content)["email"] == "packed@msgpack.local"
+    assert garbage.status_code == 400
+    assert garbage.json() == {"detail": "Invalid MessagePack body"}
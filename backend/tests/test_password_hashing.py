@@ -0,0 +1,79 @@
+"""Password re-hashing on login when the bcrypt cost changes."""
+
+import pytest
+from sqlalchemy import delete, insert, select
+
+from app.auth import configure_password_hashing, pwd_context, verify_and_update_password
+from app.core.config import settings
+from app.database import Base, engine
+from app.models.user import User, UserRole
+
+EMAIL = "owner@hashing.local"
+PASSWORD = "correct horse"
+
+
+def hash_with_rounds(password, rounds):
+    return pwd_context.handler("bcrypt").using(rounds=rounds).hash(password)
+
+
+def rounds_of(hashed_password):
+    return int(hashed_password.split("$")[2])
+
+
+@pytest.fixture
+def bcrypt_rounds(monkeypatch):
+    """Configure the hashing context as a worker that settled on the given cost."""
+    original = pwd_context.to_dict()
+
+    def configure(rounds):
+        monkeypatch.setattr(settings, "BCRYPT_ROUNDS", rounds)
+        configure_password_hashing()
+
+    yield configure
+    pwd_context.load(original)
+
+
+@pytest.fixture
+def stored_hash():
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(delete(User).where(User.email == EMAIL))
+        connection.execute(insert(User).values(
+            name="Owner", email=EMAIL, role=UserRole.PET_OWNER, hashed_password=hash_with_rounds(PASSWORD, 4)
+        ))
+
+    def current():
+        with engine.connect() as connection:
+            return connection.execute(select(User.hashed_password).where(User.email == EMAIL)).scalar_one()
+
+    return current
+
+
+def test_only_lower_costs_need_update(bcrypt_rounds):
+    bcrypt_rounds(5)
+
+    valid, new_hash = verify_and_update_password(PASSWORD, hash_with_rounds(PASSWORD, 4))
+    assert valid and rounds_of(new_hash) == 5
+    assert verify_and_update_password(PASSWORD, hash_with_rounds(PASSWORD, 6)) == (True, None)
+    assert verify_and_update_password("wrong", hash_with_rounds(PASSWORD, 4)) == (False, None)
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_once_across_workers(client, bcrypt_rounds, stored_hash):
+    async def login():
+        response = await client.post("/api/v1/auth/login", json={"email": EMAIL, "password": PASSWORD})
+        assert response.status_code == 200, response.text
+
+    bcrypt_rounds(5)
+    await login()
+    upgraded = stored_hash()
+    assert rounds_of(upgraded) == 5
+
+    # A worker that calibrated one cost lower leaves the hash alone
+    bcrypt_rounds(4)
+    await login()
+    assert stored_hash() == upgraded
+
+    bcrypt_rounds(5)
+    await login()
+    assert stored_hash() == upgraded
@@ -0,0 +1,62 @@
+"""Connection pool checkout metrics and the admin endpoint reporting them."""
+
+import sqlite3
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.pool_metrics import InstrumentedQueuePool
+from app.models.user import UserRole
+
+POOL_URL = "/api/v1/admin/db-pool"
+
+
+def test_checkouts_and_timeouts_are_counted():
+    pool = InstrumentedQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=0, timeout=0.05)
+    connection = pool.connect()
+    held = pool.stats()
+    with pytest.raises(PoolTimeoutError):
+        pool.connect()
+    connection.close()
+    pool.connect().close()
+    returned = pool.stats()
+
+    assert held["checkouts"] == 1
+    assert held["checked_out"] == 1
+    assert held["waits"] == 0
+    assert returned["checkouts"] == 2
+    assert returned["checked_out"] == 0
+    assert returned["waits"] == 1
+    assert returned["timeouts"] == 1
+    assert returned["checkout_ms_max"] >= returned["checkout_ms_avg"] >= 0
+
+
+def test_recreated_pool_keeps_its_counters():
+    pool = InstrumentedQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=0)
+    pool.connect().close()
+
+    assert pool.recreate().stats()["checkouts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_endpoint_reports_request_checkouts(client, admin_headers):
+    before = await client.get(POOL_URL, headers=admin_headers)
+    listed = await client.get("/api/v1/products/")
+    after = await client.get(POOL_URL, headers=admin_headers)
+
+    assert before.status_code == 200, before.text
+    assert listed.status_code == 200
+    assert after.json()["primary"]["checkouts"] > before.json()["primary"]["checkouts"]
+    assert {"pool_size", "checked_out", "idle", "waits", "checkout_ms_p95"} <= set(after.json()["primary"])
+    assert "primary_sync" in after.json()
+
+
+@pytest.mark.asyncio
+async def test_endpoint_is_admin_only(client, create_user, auth_headers):
+    owner = create_user("owner@pool-metrics.local", UserRole.PET_OWNER, "Owner")
+    anonymous = await client.get(POOL_URL)
+    forbidden = await client.get(POOL_URL, headers=auth_headers(owner))
+
+    assert anonymous.status_code == 403
+    assert forbidden.status_code == 403
+    assert "checkouts" not in forbidden.text
@@ -0,0 +1,294 @@
+"""
+Query-plan regression suite for the list endpoints.
+
+Seeds a large synthetic dataset, calls every list endpoint through the ASGI
+app (the first page and, via its cursor, the second page), captures the
+SELECT statements the handlers actually execute and runs
+``EXPLAIN QUERY PLAN`` (SQLite) or ``EXPLAIN (FORMAT JSON)`` (PostgreSQL) on
+each of them. A case fails when a plan contains a full table scan on a table
+the case does not explicitly allow, or a temporary B-tree / Sort step.
+
+The dataset size can be changed with PLAN_TEST_SCALE (default 20000 rows for
+the larger tables).
+"""
+
+import json
+import os
+import random
+import re
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, insert, text
+
+from app.core.facets import facet_index
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.vocabulary import backfill_vocabulary, vocabulary_cache
+from app.database import Base, async_engine, engine
+from app.routers.auth import user_cache
+from app.models.appointment import Appointment, AppointmentStatus
+from app.models.blog import BlogPost, BlogCategory, BlogPostTag, BlogTag
+from app.models.pet import Pet, PetGender, PetHealthRecord
+from app.models.product import Product, ProductCategory
+from app.models.shelter import AdoptionRequest, AdoptionStatus, RequestStatus, ShelterPet
+from app.models.user import User, UserRole
+
+SCALE = int(os.environ.get("PLAN_TEST_SCALE", "20000"))
+
+SPECIES = ["dog", "cat", "bird", "rabbit", "hamster", "fish"]
+
+OWNER_ID = 1
+VET_ID = 2
+ADMIN_ID = 3
+
+# (case id, acting user, path, tables allowed to be scanned in full)
+# Full scans are only acceptable for unfiltered pages (LIMIT stops the scan
+# early) and for leading-wildcard text search, which no b-tree can serve.
+# SORT additionally allows sorting the matched rows, e.g. by search relevance
+# or a rare tag's posts by date, or grouping all shelter pets for the facet
+# index. VOCABULARY allows loading the (small) species and breed vocabulary
+# that species= and breed= are matched against.
+SORT = "sort"
+VOCABULARY = {"species", "breeds"}
+LIST_CASES = [
+    ("pets-unfiltered", ADMIN_ID, "/api/v1/pets/", {"pets"}),
+    ("pets-by-user", OWNER_ID, f"/api/v1/pets/?user_id={OWNER_ID}", set()),
+    ("pets-by-species", OWNER_ID, "/api/v1/pets/?species=dog", VOCABULARY),
+    ("appointments-owner", OWNER_ID, "/api/v1/appointments/", set()),
+    ("appointments-vet", VET_ID, "/api/v1/appointments/", set()),
+    ("appointments-vet-status", VET_ID, "/api/v1/appointments/?status=confirmed", set()),
+    ("appointments-admin", ADMIN_ID, "/api/v1/appointments/", {"appointments"}),
+    ("appointments-by-pet", ADMIN_ID, "/api/v1/appointments/?pet_id=10", set()),
+    ("shelter-pets-unfiltered", None, "/api/v1/shelters/pets", {"shelter_pets"}),
+    ("shelter-pets-by-status", None, "/api/v1/shelters/pets?adoption_status=available", set()),
+    ("shelter-pets-by-status-species", None, "/api/v1/shelters/pets?adoption_status=available&species=cat", VOCABULARY),
+    ("shelter-pets-by-species-breed", None, "/api/v1/shelters/pets?species=dog&breed=breed%207", VOCABULARY),
+    ("shelter-pets-by-status-total", None, "/api/v1/shelters/pets?adoption_status=available&include_total=true", set()),
+    ("shelter-pets-by-shelter", None, f"/api/v1/shelters/pets?shelter_id={ADMIN_ID}", set()),
+    ("shelter-pets-facets", None, "/api/v1/shelters/pets/facets?adoption_status=available&species=cat", {"shelter_pets", SORT, *VOCABULARY}),
+    ("adoption-requests-owner", OWNER_ID, "/api/v1/shelters/adoption-requests", set()),
+    ("adoption-requests-owner-status", OWNER_ID, "/api/v1/shelters/adoption-requests?status=pending", set()),
+    ("adoption-requests-admin", ADMIN_ID, "/api/v1/shelters/adoption-requests", set()),
+    ("products-unfiltered", None, "/api/v1/products/", {"products"}),
+    ("products-by-category", None, "/api/v1/products/?category=food", set()),
+    ("products-by-category-total", None, "/api/v1/products/?category=food&include_total=true", set()),
+    ("products-by-category-price", None, "/api/v1/products/?category=toys&min_price=5&max_price=20", set()),
+    ("products-by-price", None, "/api/v1/products/?min_price=5&max_price=20", set()),
+    ("products-search", None, "/api/v1/products/?search=chew", {"products_fts", SORT}),
+    ("products-search-category", None, "/api/v1/products/?search=chew&category=toys", {"products_fts", SORT}),
+    ("blog-published", None, "/api/v1/blog/", set()),
+    ("blog-published-category", None, "/api/v1/blog/?category=health", set()),
+    ("blog-search", None, "/api/v1/blog/?search=vaccine", {"blog_posts_fts", SORT}),
+    ("blog-by-rare-tag", None, "/api/v1/blog/?tag=puppies", {SORT}),
+    ("blog-by-popular-tag", None, "/api/v1/blog/?tag=dogs", set()),
+    ("blog-tag-counts", None, "/api/v1/blog/tags", {"blog_post_tags", SORT}),
+    ("users-unfiltered", ADMIN_ID, "/api/v1/users/", {"users"}),
+    ("users-by-role", ADMIN_ID, "/api/v1/users/?role=veterinarian", set()),
+    ("health-records", OWNER_ID, "/api/v1/pets/1/health-records", set()),
+]
+
+SQLITE_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)")
+SQLITE_SUBQUERY = re.compile(r"^(?:CO-ROUTINE|MATERIALIZE) (\w+)")
+SQLITE_TEMP_BTREE = "USE TEMP B-TREE"
+
+
+def seed_database():
+    """Fill every table with SCALE-proportional synthetic rows and ANALYZE."""
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    num_users = max(SCALE // 10, 10)
+    num_pets = SCALE
+    num_shelter_pets = SCALE
+
+    users = [
+        {"id": OWNER_ID, "name": "Owner", "email": "owner@plans.local", "role": UserRole.PET_OWNER},
+        {"id": VET_ID, "name": "Vet", "email": "vet@plans.local", "role": UserRole.VETERINARIAN},
+        {"id": ADMIN_ID, "name": "Admin", "email": "admin@plans.local", "role": UserRole.SHELTER_ADMIN},
+    ]
+    roles = list(UserRole)
+    for user_id in range(4, num_users + 1):
+        users.append({
+            "id": user_id,
+            "name": f"User {user_id}",
+            "email": f"user{user_id}@plans.local",
+            "role": rng.choice(roles),
+        })
+    for user in users:
+        user["hashed_password"] = "x"
+
+    pets = [{
+        "id": pet_id,
+        "user_id": OWNER_ID if pet_id <= 20 else rng.randint(4, num_users),
+        "name": f"Pet {pet_id}",
+        "species": rng.choice(SPECIES),
+        "age": rng.randint(0, 15),
+        "gender": rng.choice(list(PetGender)),
+    } for pet_id in range(1, num_pets + 1)]
+
+    vets = [user["id"] for user in users if user["role"] == UserRole.VETERINARIAN]
+    appointments = [{
+        "pet_id": rng.randint(1, num_pets),
+        "veterinarian_id": rng.choice(vets),
+        "appointment_date": now + timedelta(days=rng.randint(-365, 365)),
+        "appointment_time": "10:00",
+        "status": rng.choice(list(AppointmentStatus)),
+    } for _ in range(SCALE * 2)]
+
+    health_records = [{
+        "pet_id": rng.randint(1, num_pets),
+        "veterinarian_id": rng.choice(vets),
+        "visit_date": now - timedelta(days=rng.randint(0, 365)),
+    } for _ in range(SCALE)]
+
+    admins = [user["id"] for user in users if user["role"] == UserRole.SHELTER_ADMIN]
+    shelter_pets = [{
+        "id": pet_id,
+        "shelter_id": rng.choice(admins),
+        "name": f"Shelter pet {pet_id}",
+        "species": rng.choice(SPECIES),
+        "breed": f"Breed {rng.randint(1, 40)}",
+        "age": rng.randint(0, 15),
+        "gender": rng.choice(list(PetGender)),
+        "adoption_status": rng.choice(list(AdoptionStatus)),
+    } for pet_id in range(1, num_shelter_pets + 1)]
+
+    adoption_requests = [{
+        "shelter_pet_id": rng.randint(1, num_shelter_pets),
+        "requester_id": rng.randint(1, num_users),
+        "request_date": now - timedelta(days=rng.randint(0, 365)),
+        "status": rng.choice(list(RequestStatus)),
+    } for _ in range(SCALE)]
+
+    products = [{
+        "name": f"Product {i} {rng.choice(['chew toy', 'kibble', 'shampoo', 'collar'])}",
+        "description": "Synthetic product",
+        "price": round(rng.uniform(1, 100), 2),
+        "category": rng.choice(list(ProductCategory)),
+        "stock": rng.randint(0, 100),
+    } for i in range(SCALE)]
+
+    blog_posts = [{
+        "author_id": rng.choice(vets),
+        "title": f"Post {i}",
+        "content": "Synthetic blog content about vaccine schedules and training.",
+        "category": rng.choice(list(BlogCategory)),
+        "published": rng.choice(["0", "1"]),
+        "created_at": now - timedelta(minutes=i),
+    } for i in range(max(SCALE // 4, 10))]
+
+    blog_tags = [{"id": tag_id, "name": f"tag {tag_id}"} for tag_id in range(1, 201)]
+    blog_tags[0]["name"] = "puppies"
+    blog_tags[1]["name"] = "dogs"
+    blog_post_tags = [
+        {"post_id": post_id, "tag_id": tag_id}
+        for post_id in range(1, len(blog_posts) + 1)
+        for tag_id in {2, *rng.sample(range(3, 201), 3)}
+    ]
+
+    with engine.begin() as connection:
+        connection.execute(insert(User), users)
+        connection.execute(insert(Pet), pets)
+        connection.execute(insert(Appointment), appointments)
+        connection.execute(insert(PetHealthRecord), health_records)
+        connection.execute(insert(ShelterPet), shelter_pets)
+        connection.execute(insert(AdoptionRequest), adoption_requests)
+        connection.execute(insert(Product), products)
+        connection.execute(insert(BlogPost), blog_posts)
+        connection.execute(insert(BlogTag), blog_tags)
+        connection.execute(insert(BlogPostTag), blog_post_tags)
+        backfill_vocabulary(connection)
+        connection.execute(text("ANALYZE"))
+
+
+@pytest.fixture(scope="module")
+def captured_statements():
+    """Seed the database and record every SELECT the async engine executes."""
+    seed_database()
+    # Users cached by earlier tests may share ids with the seeded ones
+    user_cache.clear()
+    facet_index.clear()
+    vocabulary_cache.clear()
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    yield statements
+    event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+
+async def explain(statement, parameters):
+    """Return plan problems for one statement as a list of strings."""
+    async with async_engine.connect() as connection:
+        if connection.dialect.name == "postgresql":
+            result = await connection.exec_driver_sql(
+                "EXPLAIN (FORMAT JSON) " + statement, parameters
+            )
+            plan = result.scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return list(walk_postgres_plan(plan[0]["Plan"]))
+
+        result = await connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)
+        return [row[3] for row in result.fetchall()]
+
+
+def walk_postgres_plan(node):
+    """Yield SQLite-style detail strings for the PostgreSQL plan nodes we check."""
+    if node["Node Type"] == "Seq Scan":
+        yield f"SCAN {node['Relation Name']}"
+    elif node["Node Type"] in ("Sort", "Incremental Sort"):
+        yield f"{SQLITE_TEMP_BTREE} FOR ORDER BY ({node['Node Type']})"
+    for child in node.get("Plans", []):
+        yield from walk_postgres_plan(child)
+
+
+def find_regressions(plan_details, allowed_scans):
+    # Scanning a subquery's result (e.g. the LIMITed rows of a bounded COUNT)
+    # is not a table scan
+    subqueries = {
+        match.group(1) for match in map(SQLITE_SUBQUERY.match, plan_details) if match
+    }
+    problems = []
+    for detail in plan_details:
+        scan = SQLITE_SCAN.match(detail)
+        if scan and scan.group(1) not in allowed_scans | subqueries:
+            problems.append(detail)
+        elif SQLITE_TEMP_BTREE in detail and SORT not in allowed_scans:
+            problems.append(detail)
+    return problems
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "user_id,path,allowed_scans",
+    [case[1:] for case in LIST_CASES],
+    ids=[case[0] for case in LIST_CASES],
+)
+async def test_list_query_plan(client, auth_headers, captured_statements, user_id, path, allowed_scans):
+    headers = auth_headers(user_id) if user_id is not None else {}
+
+    captured_statements.clear()
+    response = await client.get(path, headers=headers)
+    assert response.status_code == 200, response.text
+    # The keyset seek for the next page must be served by an index too
+    cursor = response.headers.get(NEXT_CURSOR_HEADER)
+    if cursor:
+        separator = "&" if "?" in path else "?"
+        response = await client.get(f"{path}{separator}cursor={cursor}", headers=headers)
+        assert response.status_code == 200, response.text
+    assert captured_statements, "handler executed no SELECT statements"
+
+    failures = []
+    for statement, parameters in list(captured_statements):
+        plan = await explain(statement, parameters)
+        problems = find_regressions(plan, allowed_scans)
+        if problems:
+            failures.append(f"{statement}\n  plan: {plan}\n  problems: {problems}")
+
+    assert not failures, "query plan regressed:\n" + "\n\n".join(failures)
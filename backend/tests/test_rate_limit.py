@@ -0,0 +1,54 @@
+"""Token buckets in the shared store and the 429 path on /auth/login."""
+
+import pytest
+
+from app.core.config import settings
+from app.core.shared_store import SharedStore
+from app.database import Base, engine
+
+
+def test_bucket_refills_and_reports_retry_after(tmp_path):
+    store = SharedStore(str(tmp_path / "state.db"))
+    results = [store.take_token("k", capacity=3, refill_per_second=1.0) for _ in range(4)]
+
+    assert [allowed for allowed, _ in results] == [True, True, True, False]
+    assert 0 < results[-1][1] <= 1.0
+
+
+def test_buckets_are_shared_between_store_instances(tmp_path):
+    path = str(tmp_path / "state.db")
+    first, second = SharedStore(path), SharedStore(path)
+
+    assert first.take_token("k", capacity=1, refill_per_second=0.001)[0]
+    assert not second.take_token("k", capacity=1, refill_per_second=0.001)[0]
+
+
+@pytest.mark.asyncio
+async def test_login_is_limited_per_account(client, monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_RATE_LIMIT_ENABLED", True)
+    Base.metadata.create_all(bind=engine)
+    credentials = {"email": "stuffed@limits.local", "password": "wrong-password"}
+    codes = [
+        (await client.post("/api/v1/auth/login", json=credentials)).status_code
+        for _ in range(6)
+    ]
+    response = await client.post("/api/v1/auth/login", json=credentials)
+
+    assert codes[:5] == [401] * 5
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+@pytest.mark.asyncio
+async def test_zero_rate_disables_the_bucket(client, monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(settings, "AUTH_RATE_LIMIT_IP_PER_MINUTE", 0)
+    monkeypatch.setattr(settings, "AUTH_RATE_LIMIT_ACCOUNT_PER_MINUTE", 0)
+    Base.metadata.create_all(bind=engine)
+    credentials = {"email": "unlimited@limits.local", "password": "wrong-password"}
+    codes = [
+        (await client.post("/api/v1/auth/login", json=credentials)).status_code
+        for _ in range(7)
+    ]
+
+    assert codes == [401] * 7
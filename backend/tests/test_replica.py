@@ -0,0 +1,65 @@
+"""Read-replica routing and the read-your-writes markers shared between workers."""
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app import database
+from app.core.replica import RecentWriters
+from app.core.shared_store import SharedStore
+from app.database import async_engine
+
+
+def test_writes_are_seen_by_other_workers(tmp_path):
+    path = str(tmp_path / "state.db")
+    first_store, second_store = SharedStore(path), SharedStore(path)
+    writer = RecentWriters(5, lambda: first_store)
+    reader = RecentWriters(5, lambda: second_store)
+
+    assert not reader.wrote_recently(1)
+    writer.mark(1)
+    assert reader.wrote_recently(1)
+    assert not reader.wrote_recently(2)
+
+    first_store.connection.execute("UPDATE recent_writes SET written_at = written_at - 5")
+    assert not reader.wrote_recently(1)
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    """A second engine on the test database standing in for a replica; yields
+    a list of "primary"/"replica" for each statement run."""
+    engine = create_async_engine(async_engine.url)
+    monkeypatch.setattr(database, "read_async_engine", engine)
+    monkeypatch.setattr(database, "ReadSessionLocal", async_sessionmaker(
+        engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    ))
+    statements = []
+    listeners = [
+        (async_engine.sync_engine, lambda *args: statements.append("primary")),
+        (engine.sync_engine, lambda *args: statements.append("replica")),
+    ]
+    for target, listener in listeners:
+        event.listen(target, "before_cursor_execute", listener)
+    yield statements
+    for target, listener in listeners:
+        event.remove(target, "before_cursor_execute", listener)
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_the_primary_right_after_a_write(client, replica, create_user, auth_headers):
+    writer = create_user("writer@replica.local", name="Writer")
+    writer_headers = auth_headers(writer)
+    other_headers = auth_headers(create_user("reader@replica.local", name="Reader"))
+
+    updated = await client.put(f"/api/v1/users/{writer}", headers=writer_headers, json={"name": "Wrote"})
+    assert updated.status_code == 200, updated.text
+
+    routed = {}
+    for name, headers in [("writer", writer_headers), ("other user", other_headers), ("anonymous", {})]:
+        replica.clear()
+        response = await client.get("/api/v1/products/", headers=headers)
+        assert response.status_code == 200, response.text
+        routed[name] = set(replica)
+
+    assert routed == {"writer": {"primary"}, "other user": {"replica"}, "anonymous": {"replica"}}
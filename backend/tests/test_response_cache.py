@@ -0,0 +1,93 @@
+"""Catalog response cache: hits, write invalidation, shared tags and single-flight."""
+
+import asyncio
+
+import pytest
+from fastapi import Response
+from sqlalchemy import delete, event, insert
+
+from app.core.config import settings
+from app.core.response_cache import response_cache
+from app.core.shared_store import get_shared_store
+from app.database import Base, async_engine, engine
+from app.models.product import Product, ProductCategory
+
+URL = "/api/v1/products/?category=grooming"
+
+
+@pytest.fixture
+def brushes():
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(delete(Product))
+        connection.execute(insert(Product), [
+            {"name": f"Brush {i}", "price": 3.0, "category": ProductCategory.GROOMING, "stock": 1}
+            for i in range(5)
+        ])
+
+
+@pytest.fixture
+def queries():
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    yield statements
+    event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["memory", "shared"])
+async def test_hits_skip_the_database_until_a_write(client, brushes, admin_headers, queries, monkeypatch, backend):
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_BACKEND", backend)
+    first = await client.get(URL)
+    queried = len(queries)
+    second = await client.get(URL + "&limit=20")
+    assert len(queries) == queried
+    revalidated = await client.get(URL, headers={"If-None-Match": first.headers["etag"]})
+
+    product_id = first.json()[0]["id"]
+    updated = await client.put(f"/api/v1/products/{product_id}", headers=admin_headers, json={"stock": 9})
+    assert updated.status_code == 200, updated.text
+    third = await client.get(URL)
+
+    assert queried > 0
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+    assert revalidated.status_code == 304
+    assert third.json()[0]["stock"] == 9
+
+
+@pytest.mark.asyncio
+async def test_shared_tags_see_other_workers_writes(client, brushes, monkeypatch):
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_BACKEND", "shared")
+    await client.get(URL)
+    misses = response_cache.misses
+    await client.get(URL)
+    assert response_cache.misses == misses
+
+    # Another worker committed a write to products
+    get_shared_store().bump_tags(["products"])
+    await client.get(URL)
+
+    assert response_cache.misses == misses + 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_render_once(monkeypatch):
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_BACKEND", "memory")
+    renders = 0
+
+    async def render():
+        nonlocal renders
+        renders += 1
+        await asyncio.sleep(0.05)
+        return Response(content=b"[]", media_type="application/json")
+
+    results = await asyncio.gather(*[response_cache.fetch("single-flight", render) for _ in range(20)])
+
+    assert renders == 1
+    assert sum(1 for entry, response in results if response is not None) == 1
+    assert all(entry is not None for entry, response in results if response is None)
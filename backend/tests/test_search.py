@@ -0,0 +1,61 @@
+"""Full-text product search: index sync, ranking and filters."""
+
+import pytest
+from sqlalchemy import delete, insert, update
+
+from app.core.search import search_terms
+from app.database import Base, engine
+from app.models.product import Product, ProductCategory
+
+
+@pytest.fixture
+def products():
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(delete(Product))
+        ids = connection.execute(insert(Product).returning(Product.id), [
+            {"name": "Rope tug", "description": "Durable chew toy for strong chewers",
+             "price": 8.0, "category": ProductCategory.TOYS},
+            {"name": "Chew bone", "description": "Rubber bone", "price": 12.0, "category": ProductCategory.TOYS},
+            {"name": "Dental chews", "description": "Fresh breath treats", "price": 6.0, "category": ProductCategory.FOOD},
+            {"name": "Salmon kibble", "description": "Grain-free recipe", "price": 30.0, "category": ProductCategory.FOOD},
+        ]).scalars().all()
+    return dict(zip(["rope", "bone", "dental", "kibble"], ids))
+
+
+async def search(client, query):
+    return await client.get("/api/v1/products/", params=query)
+
+
+@pytest.mark.asyncio
+async def test_matches_are_ranked_and_filtered(client, products):
+    ranked = await search(client, {"search": "chew"})
+    toys = await search(client, {"search": "chew", "category": "toys", "max_price": 10})
+
+    # Prefix match on the last word; name matches rank above description matches
+    names = [item["name"] for item in ranked.json()]
+    assert set(names) == {"Rope tug", "Chew bone", "Dental chews"}
+    assert names[-1] == "Rope tug"
+    assert [item["name"] for item in toys.json()] == ["Rope tug"]
+
+
+@pytest.mark.asyncio
+async def test_index_follows_writes(client, products):
+    with engine.begin() as connection:
+        connection.execute(update(Product).where(Product.id == products["kibble"]).values(name="Salmon chew sticks"))
+        connection.execute(delete(Product).where(Product.id == products["bone"]))
+
+    names = {item["name"] for item in (await search(client, {"search": "chew"})).json()}
+
+    assert "Salmon chew sticks" in names
+    assert "Chew bone" not in names
+
+
+@pytest.mark.asyncio
+async def test_query_syntax_is_not_interpreted(client, products):
+    response = await search(client, {"search": 'chew" OR "* NEAR('})
+    cursor = await search(client, {"search": "chew", "cursor": "abc"})
+
+    assert response.status_code == 200
+    assert search_terms('chew" OR "* NEAR(') == ["chew", "or", "near"]
+    assert cursor.status_code == 400
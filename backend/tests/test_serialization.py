@@ -0,0 +1,59 @@
+"""Fast JSON path: direct row encoding matches pydantic's output."""
+
+import json
+from datetime import datetime
+
+from app.core.serialization import render, row_encoder, schema_adapter
+from app.models.appointment import Appointment, AppointmentStatus
+from app.models.blog import BlogCategory, BlogPost
+from app.models.product import Product, ProductCategory
+from app.schemas.appointment import Appointment as AppointmentSchema
+from app.schemas.blog import BlogPost as BlogPostSchema
+from app.schemas.product import Product as ProductSchema
+
+
+def validated(rows, schema):
+    adapter = schema_adapter(schema, many=True)
+    return json.loads(adapter.dump_json(adapter.validate_python(rows, from_attributes=True)))
+
+
+def test_direct_encoding_matches_validated_output():
+    now = datetime(2024, 5, 1, 9, 30, 15, 123456)
+    products = [Product(
+        id=1, name="Kibble", description=None, price=12.5, rating=4.0, image_urls=["a.jpg"],
+        category=ProductCategory.FOOD, stock=3, brand=None, weight=2.0, external_url=None,
+        created_at=now, updated_at=None,
+    )]
+    appointments = [Appointment(
+        id=7, pet_id=2, veterinarian_id=None, shelter_id=None, appointment_date=now,
+        appointment_time="10:00", status=AppointmentStatus.SCHEDULED, reason="Check-up",
+        notes=None, created_at=now, updated_at=now,
+    )]
+
+    for rows, schema in ((products, ProductSchema), (appointments, AppointmentSchema)):
+        assert row_encoder(schema, type(rows[0])) is not None
+        assert json.loads(render(rows, schema).body) == validated(rows, schema)
+
+
+def test_fields_needing_conversion_use_pydantic():
+    post = BlogPost(
+        id=1, author_id=1, title="Hello", content="Body", category=BlogCategory.GENERAL,
+        tags=None, image_url=None, published="1", likes_count=0, comments_count=0,
+        created_at=datetime(2024, 5, 1), updated_at=None,
+    )
+
+    # published is stored as "0"/"1" but typed bool
+    assert row_encoder(BlogPostSchema, BlogPost) is None
+    assert row_encoder(BlogPostSchema, BlogPost, frozenset({"id", "title"})) is not None
+    [item] = json.loads(render([post], BlogPostSchema).body)
+    assert item["published"] is True
+
+
+def test_headers_are_carried_over():
+    from fastapi import Response
+
+    response = Response()
+    response.headers["X-Next-Cursor"] = "abc"
+    rendered = render([], ProductSchema, response=response)
+    assert rendered.body == b"[]"
+    assert rendered.headers["X-Next-Cursor"] == "abc"
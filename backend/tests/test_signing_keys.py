@@ -0,0 +1,62 @@
+"""ES256 signing with kid headers, key rotation and the JWKS document."""
+
+import pytest
+from jose import jwk, jwt
+
+from app import auth
+from app.core import signing_keys
+from app.core.config import settings
+
+
+@pytest.fixture
+def es256_keys(tmp_path, monkeypatch):
+    ring = signing_keys.KeyRing(str(tmp_path))
+    monkeypatch.setattr(settings, "ALGORITHM", "ES256")
+    monkeypatch.setattr(auth, "key_ring", ring)
+    monkeypatch.setattr(signing_keys, "key_ring", ring)
+    monkeypatch.setattr("app.main.key_ring", ring)
+    auth.token_cache.clear()
+    yield ring
+    auth.token_cache.clear()
+
+
+def add_key(ring, kid):
+    signing_keys.generate_key(ring.directory, kid)
+    ring.load()
+
+
+def test_tokens_carry_kid_and_survive_rotation(es256_keys):
+    add_key(es256_keys, "2024a")
+    old_token = auth.create_access_token({"sub": "7"})
+    assert jwt.get_unverified_header(old_token) == {"alg": "ES256", "typ": "JWT", "kid": "2024a"}
+
+    add_key(es256_keys, "2024b")
+    new_token = auth.create_access_token({"sub": "7"})
+    assert jwt.get_unverified_header(new_token)["kid"] == "2024b"
+
+    assert auth.get_user_id_from_token(old_token) == 7
+    assert auth.get_user_id_from_token(new_token) == 7
+
+
+def test_hs256_tokens_rejected_after_switch(es256_keys, monkeypatch):
+    add_key(es256_keys, "2024a")
+    legacy = jwt.encode({"sub": "7", "type": "access", "exp": 4102444800}, settings.SECRET_KEY, algorithm="HS256")
+    with pytest.raises(auth.HTTPException):
+        auth.verify_token(legacy)
+
+    monkeypatch.setattr(settings, "JWT_ACCEPT_HS256", True)
+    assert auth.verify_token(legacy)["sub"] == "7"
+
+
+@pytest.mark.asyncio
+async def test_jwks_verifies_issued_tokens(client, es256_keys):
+    add_key(es256_keys, "2024a")
+    token = auth.create_access_token({"sub": "7"})
+
+    response = await client.get("/.well-known/jwks.json")
+    assert response.status_code == 200
+    [public] = response.json()["keys"]
+    assert public["kid"] == "2024a" and "d" not in public
+
+    claims = jwt.decode(token, jwk.construct(public), algorithms=["ES256"])
+    assert claims["sub"] == "7"
@@ -0,0 +1,63 @@
+"""Single-use refresh tokens, logout and the revocation Bloom filter."""
+
+import pytest
+
+from app.auth import create_refresh_token
+from app.core.bloom import BloomFilter
+from app.core.revocation import revocations
+from app.models.user import UserRole
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    members = [f"jti-{i}" for i in range(1000)]
+    for member in members:
+        bloom.add(member)
+
+    assert all(member in bloom for member in members)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+@pytest.fixture
+def refresh_token(create_user):
+    user_id = create_user("revoke@tokens.local", UserRole.PET_OWNER, "Revoke")
+    return create_refresh_token({"sub": str(user_id)})
+
+
+@pytest.mark.asyncio
+async def test_refresh_token_is_single_use(client, refresh_token):
+    headers = {"Authorization": f"Bearer {refresh_token}"}
+    first = await client.post("/api/v1/auth/refresh", headers=headers)
+    replay = await client.post("/api/v1/auth/refresh", headers=headers)
+    rotated = await client.post(
+        "/api/v1/auth/refresh",
+        headers={"Authorization": f"Bearer {first.json()['refresh_token']}"},
+    )
+
+    assert first.status_code == 200
+    assert replay.status_code == 401
+    assert rotated.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_refresh_token(client, refresh_token):
+    logout = await client.post("/api/v1/auth/logout", json={"refresh_token": refresh_token})
+    refresh = await client.post(
+        "/api/v1/auth/refresh", headers={"Authorization": f"Bearer {refresh_token}"}
+    )
+
+    assert logout.status_code == 200
+    assert refresh.status_code == 401
+    assert refresh.json()["detail"] == "Refresh token has been revoked"
+
+
+@pytest.mark.asyncio
+async def test_unrevoked_tokens_skip_the_database(client, refresh_token):
+    db_checks = revocations.db_checks
+    response = await client.post(
+        "/api/v1/auth/refresh", headers={"Authorization": f"Bearer {refresh_token}"}
+    )
+
+    assert response.status_code == 200
+    assert revocations.db_checks == db_checks
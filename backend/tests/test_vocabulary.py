@@ -0,0 +1,106 @@
+"""Species/breed vocabulary: write-time canonicalization, fuzzy filters and backfill."""
+
+import pytest
+from sqlalchemy import delete, insert, select, update
+
+from app.core.vocabulary import Vocabulary, backfill_vocabulary, vocabulary_cache
+from app.database import engine
+from app.models.pet import Breed, Pet, PetGender, Species
+from app.models.shelter import AdoptionRequest, ShelterPet
+from app.models.user import User, UserRole
+
+
+@pytest.fixture
+def owner(create_user, auth_headers):
+    owner_id = create_user("owner@vocabulary.local", UserRole.PET_OWNER, "Owner")
+    vocabulary_cache.clear()
+    with engine.begin() as connection:
+        connection.execute(delete(AdoptionRequest))
+        connection.execute(delete(ShelterPet))
+        connection.execute(delete(Pet))
+        connection.execute(delete(Breed))
+        connection.execute(delete(Species))
+    return owner_id, auth_headers(owner_id)
+
+
+def test_fuzzy_matching():
+    vocabulary = Vocabulary(
+        [(1, "dog"), (2, "cat"), (3, "guinea pig")],
+        [(10, 1, "labrador retriever"), (11, 1, "golden retriever"), (12, 2, "siamese"), (13, 1, "siamese")],
+    )
+
+    assert vocabulary.species_ids(" DOG ") == [1]
+    assert vocabulary.species_ids("dogs") == [1]
+    assert vocabulary.species_ids("pig") == []
+    assert vocabulary.breed_ids("labrador retreiver") == [10]
+    assert vocabulary.breed_ids("poodle") == []
+    assert vocabulary.breed_ids("siamese") == [12, 13]
+    assert vocabulary.match("cat", "siamese") == ([2], [12])
+
+
+@pytest.mark.asyncio
+async def test_spellings_share_an_entry_and_filters_use_it(client, owner):
+    _, headers = owner
+    for species, breed in [("Dog", "Beagle"), ("dogs ", "beagles"), ("cat", None)]:
+        response = await client.post("/api/v1/pets/", headers=headers, json={
+            "name": "Pet", "species": species, "breed": breed, "gender": "male",
+        })
+        assert response.status_code == 200, response.text
+
+    dogs = (await client.get("/api/v1/pets/", headers=headers, params={"species": "doggs"})).json()
+    birds = (await client.get("/api/v1/pets/", headers=headers, params={"species": "bird"})).json()
+
+    assert [pet["species"] for pet in dogs] == ["Dog", "dogs "]
+    assert birds == []
+    with engine.connect() as connection:
+        assert connection.execute(select(Species.name).order_by(Species.name)).scalars().all() == ["cat", "dog"]
+        assert connection.execute(select(Breed.name)).scalars().all() == ["beagle"]
+
+
+def test_backfill_prefers_the_common_spelling(owner):
+    owner_id, _ = owner
+    rows = [("Cats", "Siamese"), ("cat", "siamese"), ("cat", None), ("Rabbit", "Rex")]
+    with engine.begin() as connection:
+        connection.execute(insert(Pet), [
+            {"user_id": owner_id, "name": "Pet", "species": species, "breed": breed, "gender": PetGender.FEMALE}
+            for species, breed in rows
+        ])
+        assert backfill_vocabulary(connection) == 4
+        assert backfill_vocabulary(connection) == 0
+        pets = connection.execute(
+            select(Species.name, Breed.name)
+            .select_from(Pet)
+            .join(Species, Species.id == Pet.species_id)
+            .outerjoin(Breed, Breed.id == Pet.breed_id)
+            .order_by(Pet.id)
+        ).all()
+    assert [tuple(pet) for pet in pets] == [("cat", "siamese"), ("cat", "siamese"), ("cat", None), ("rabbit", "rex")]
+
+
+@pytest.mark.asyncio
+async def test_vocabulary_filters_with_total(client, owner):
+    owner_id, headers = owner
+    with engine.begin() as connection:
+        connection.execute(update(User).where(User.id == owner_id).values(role=UserRole.SHELTER_ADMIN))
+        connection.execute(insert(Pet), [
+            {"user_id": owner_id, "name": "Pet", "species": "dog", "breed": "Labrador", "gender": PetGender.MALE},
+            {"user_id": owner_id, "name": "Pet", "species": "cat", "breed": None, "gender": PetGender.MALE},
+        ])
+        connection.execute(insert(ShelterPet), [
+            {"shelter_id": owner_id, "name": "Rex", "species": "dog", "breed": "Labrador", "age": 1},
+            {"shelter_id": owner_id, "name": "Max", "species": "Dogs", "breed": "Beagle", "age": 1},
+        ])
+        backfill_vocabulary(connection)
+
+    pets = await client.get("/api/v1/pets/", headers=headers, params={"species": "dog", "include_total": "true"})
+    by_species = await client.get("/api/v1/shelters/pets", params={"species": "dog", "include_total": "true"})
+    by_breed = await client.get("/api/v1/shelters/pets", params={"breed": "labradr", "include_total": "true"})
+    unknown = await client.get("/api/v1/shelters/pets", params={"species": "parrot", "include_total": "true"})
+
+    assert pets.status_code == 200, pets.text
+    assert pets.headers["X-Total-Count"] == "1"
+    assert by_species.headers["X-Total-Count"] == "2"
+    assert by_breed.status_code == 200, by_breed.text
+    assert [pet["name"] for pet in by_breed.json()] == ["Rex"]
+    assert by_breed.headers["X-Total-Count"] == "1"
+    assert unknown.headers["X-Total-Count"] == "0"